@@ -14,12 +14,23 @@ module GenomeSearchUtil {
 
     /*
         structured_query - Optional query in object form that uses MongoDB style key-value
-            matching and $and, $not, and $or keywords.
+            matching and $and, $not, and $or keywords. Field value can also be
+            an object of operators $gt, $gte, $lt, $lte, $in, $nin, $ne and
+            $prefix, e.g. {"length": {"$gt": 3000}}; numeric fields (start,
+            length) are compared as numbers.
         num_found - optional field which when set informs that there
             is no need to perform full scan in order to count this
             value because it was already done before; please don't
             set this value with 0 or any guessed number if you didn't 
             get right value previously.
+        cursor - optional opaque cursor returned with previous page;
+            when set, next page is returned starting right after the
+            last item of previous page (start and num_found are taken from
+            cursor). Cursor can be used only with the same query and
+            sorting as ones of previous page.
+        fields - optional list of FeatureData fields which should be
+            returned for every feature (all fields by default), other
+            fields are not decoded.
     */
     typedef structure {
         string ref;
@@ -29,6 +40,8 @@ module GenomeSearchUtil {
         int start;
         int limit;
         int num_found;
+        string cursor;
+        list<string> fields;
     } SearchOptions;
 
     typedef structure {
@@ -64,12 +77,14 @@ module GenomeSearchUtil {
     /*
         num_found - number of all items found in query search (with 
             only part of it returned in "features" list).
+        cursor - opaque cursor of next page (null for the last page).
     */
     typedef structure {
         string query;
         int start;
         list<FeatureData> features;
         int num_found;
+        string cursor;
     } SearchResult;
 
     funcdef search(SearchOptions params) returns (SearchResult result) authentication optional;
@@ -80,6 +95,14 @@ module GenomeSearchUtil {
             value because it was already done before; please don't
             set this value with 0 or any guessed number if you didn't 
             get right value previously.
+        cursor - optional opaque cursor returned with previous page;
+            when set, next page is returned starting right after the
+            last item of previous page (page_start and num_found are taken from
+            cursor). Cursor can be used only with the same query and
+            sorting as ones of previous page.
+        fields - optional list of FeatureData fields which should be
+            returned for every feature (all fields by default), other
+            fields are not decoded.
     */
     typedef structure {
         string ref;
@@ -89,11 +112,14 @@ module GenomeSearchUtil {
         int page_start;
         int page_limit;
         int num_found;
+        string cursor;
+        list<string> fields;
     } SearchRegionOptions;
 
     /*
         num_found - number of all items found in query search (with 
             only part of it returned in "features" list).
+        cursor - opaque cursor of next page (null for the last page).
     */
     typedef structure {
         string query_contig_id;
@@ -102,6 +128,7 @@ module GenomeSearchUtil {
         int page_start;
         list<FeatureData> features;
         int num_found;
+        string cursor;
     } SearchRegionResult;
 
     funcdef search_region(SearchRegionOptions params) returns (SearchRegionResult result) authentication optional;
@@ -112,6 +139,11 @@ module GenomeSearchUtil {
             value because it was already done before; please don't
             set this value with 0 or any guessed number if you didn't 
             get right value previously.
+        cursor - optional opaque cursor returned with previous page;
+            when set, next page is returned starting right after the
+            last item of previous page (start and num_found are taken from
+            cursor). Cursor can be used only with the same query and
+            sorting as ones of previous page.
     */
     typedef structure {
         string ref;
@@ -120,6 +152,7 @@ module GenomeSearchUtil {
         int start;
         int limit;
         int num_found;
+        string cursor;
     } SearchContigsOptions;
 
     /*
@@ -137,15 +170,103 @@ module GenomeSearchUtil {
     /*
         num_found - number of all items found in query search (with 
             only part of it returned in "features" list).
+        cursor - opaque cursor of next page (null for the last page).
     */
     typedef structure {
         string query;
         int start;
         list<ContigData> contigs;
         int num_found;
+        string cursor;
     } SearchContigsResult;
 
     funcdef search_contigs(SearchContigsOptions params) 
         returns (SearchContigsResult result) authentication optional;
 
+    /*
+        refs - list of genome refs (up to 1000) searched with the same
+            query, structured_query and sorting as in search method,
+        merge - optional flag which when set informs that one page of
+            features of all genomes merged in sort_by order should be
+            returned (items equal by sort keys are kept in order of refs)
+            instead of separate page for every genome,
+        fields - optional list of FeatureData fields which should be
+            returned for every feature (all fields by default), other
+            fields are not decoded.
+    */
+    typedef structure {
+        list<string> refs;
+        string query;
+        UnspecifiedObject structured_query;
+        list<column_sorting> sort_by;
+        int start;
+        int limit;
+        boolean merge;
+        list<string> fields;
+    } SearchMultiOptions;
+
+    /*
+        error - error message in case search in this genome failed (other
+            fields are not set then),
+        features - page of features of this genome (not set in merge mode),
+        cursor - opaque cursor of next page of this genome which can be
+            passed to search method (not set in merge mode).
+    */
+    typedef structure {
+        string ref;
+        string error;
+        list<FeatureData> features;
+        int num_found;
+        string cursor;
+    } GenomeSearchResult;
+
+    typedef structure {
+        string ref;
+        FeatureData feature;
+    } GenomeFeature;
+
+    /*
+        results - results for every genome in order of refs,
+        features - merged page of features of all genomes (only in merge
+            mode),
+        num_found - number of all items found in all genomes (only in
+            merge mode).
+    */
+    typedef structure {
+        string query;
+        int start;
+        list<GenomeSearchResult> results;
+        list<GenomeFeature> features;
+        int num_found;
+    } SearchMultiResult;
+
+    funcdef search_multi(SearchMultiOptions params)
+        returns (SearchMultiResult result) authentication optional;
+
+    /*
+        feature_ids - list of feature ids or aliases (up to 10000) looked
+            up in genome without scanning its features,
+        fields - optional list of FeatureData fields which should be
+            returned for every feature (all fields by default), other
+            fields are not decoded.
+    */
+    typedef structure {
+        string ref;
+        list<string> feature_ids;
+        list<string> fields;
+    } GetFeaturesOptions;
+
+    /*
+        features - mapping from requested id to features having this id
+            or alias (in order of features in genome),
+        not_found - requested ids which no feature has.
+    */
+    typedef structure {
+        mapping<string, list<FeatureData>> features;
+        list<string> not_found;
+    } GetFeaturesResult;
+
+    funcdef get_features(GetFeaturesOptions params)
+        returns (GetFeaturesResult result) authentication optional;
+
 };
@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+import json
+import mmap
+import os
+import struct
+import sys
+import tempfile
+from array import array
+
+# Simple binary container for named integer arrays which are stored next to
+# genome index files. Layout is: magic line, 8-byte header length, JSON header
+# (user metadata plus offset/typecode/length of every array) and then raw array
+# data where each array starts at 8-byte aligned position. Files are opened as
+# read-only memory maps so arrays are returned as memoryviews over page cache
+# (shared by all server processes) without copying.
+MAGIC = b"GSUARR1\n"
+ALIGNMENT = 8
+# Estimated bytes of Python objects per byte of parsed JSON header (meta may
+# be large, like grams of token index, and it's kept in heap of process)
+HEADER_HEAP_FACTOR = 10
+
+
+def write_array_bundle(path, arrays, meta=None):
+    """Save named arrays (name -> array.array) and JSON-able meta into path
+    (file is written under temporary name first and then renamed)."""
+    entries = {}
+    offset = 0
+    for name in arrays:
+        data = arrays[name]
+        size = len(data) * data.itemsize
+        entries[name] = [offset, data.typecode, len(data)]
+        offset += size + (-size % ALIGNMENT)
+    header = json.dumps({"byteorder": sys.byteorder, "meta": meta,
+                         "arrays": entries}).encode("utf-8")
+    header += b" " * (-(len(MAGIC) + 8 + len(header)) % ALIGNMENT)
+    outfile = tempfile.NamedTemporaryFile(dir=os.path.dirname(path),
+            prefix=os.path.basename(path) + "_", delete=False, mode='wb')
+    with outfile:
+        outfile.write(MAGIC)
+        outfile.write(struct.pack("<Q", len(header)))
+        outfile.write(header)
+        for name in arrays:
+            data = arrays[name]
+            size = len(data) * data.itemsize
+            data.tofile(outfile)
+            outfile.write(b"\0" * (-size % ALIGNMENT))
+    os.rename(outfile.name, path)
+
+
+class ArrayBundle:
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as f:
+            self.data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self.data[:len(MAGIC)] != MAGIC:
+            raise ValueError("Unsupported array bundle format: " + path)
+        header_len = struct.unpack("<Q", self.data[len(MAGIC):len(MAGIC) + 8])[0]
+        self.data_offset = len(MAGIC) + 8 + header_len
+        self.header_size = header_len
+        header = json.loads(self.data[len(MAGIC) + 8:self.data_offset].decode("utf-8"))
+        if header["byteorder"] != sys.byteorder:
+            raise ValueError("Array bundle was saved with different byte order: " + path)
+        self.meta = header["meta"]
+        self.entries = header["arrays"]
+
+    def get_heap_size(self):
+        """Returns estimated size of Python objects of parsed header (arrays
+        are not counted since they stay in memory map)."""
+        return self.header_size * HEADER_HEAP_FACTOR
+
+    def __contains__(self, name):
+        return name in self.entries
+
+    def get(self, name):
+        """Returns named array as read-only memoryview."""
+        return self.get_range(name, 0, self.entries[name][2])
+
+    def get_range(self, name, start, end):
+        """Returns items [start, end) of named array as read-only memoryview."""
+        offset, typecode, length = self.entries[name]
+        begin = self.data_offset + offset
+        view = memoryview(self.data)[begin:begin + length * array(typecode).itemsize]
+        return view.cast(typecode)[start:end]
@@ -0,0 +1,148 @@
+# -*- coding: utf-8 -*-
+import json
+import os
+import socket
+import threading
+import time
+
+# Single-flight building of index files shared by server processes. Every
+# artifact (key like "<inner_chsum>_ftr_sort") is built by only one thread of
+# one process: threads of the same process are serialized by in-process lock
+# and processes by lock file created with O_EXCL in index directory (lock file
+# keeps pid, host and time of builder). Others wait until artifact is built.
+# Lock file is treated as stale (left by crashed builder) when its pid doesn't
+# exist anymore on this host or when it's older than stale timeout.
+
+
+class _KeyLock:
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.users = 0
+
+
+class BuildCoordinator:
+
+    def __init__(self, lock_dir, stale_timeout=3600, poll_interval=0.2, debug=False):
+        self.lock_dir = lock_dir
+        self.stale_timeout = stale_timeout
+        self.poll_interval = poll_interval
+        self.debug = debug
+        self.host = socket.gethostname()
+        self.lock = threading.Lock()
+        self.key_locks = {}
+
+    def build(self, key, is_built, build_func):
+        """Calls build_func() unless is_built() returns True (checked again
+        after locks are taken). Returns True if build_func was called."""
+        if is_built():
+            return False
+        key_lock = self._acquire_key_lock(key)
+        try:
+            with key_lock.lock:
+                if is_built():
+                    return False
+                lock_file = os.path.join(self.lock_dir, key + ".lock")
+                waiting = False
+                while not self._try_lock_file(lock_file):
+                    if is_built():
+                        return False
+                    if self._is_stale(lock_file):
+                        self._remove_stale(lock_file)
+                        continue
+                    if self.debug and not waiting:
+                        print("    Waiting for " + key + " built by other process...")
+                    waiting = True
+                    time.sleep(self.poll_interval)
+                try:
+                    if is_built():
+                        return False
+                    build_func()
+                    return True
+                finally:
+                    try:
+                        os.remove(lock_file)
+                    except FileNotFoundError:
+                        pass
+        finally:
+            self._release_key_lock(key, key_lock)
+
+    def _acquire_key_lock(self, key):
+        with self.lock:
+            key_lock = self.key_locks.get(key)
+            if key_lock is None:
+                key_lock = _KeyLock()
+                self.key_locks[key] = key_lock
+            key_lock.users += 1
+            return key_lock
+
+    def _release_key_lock(self, key, key_lock):
+        with self.lock:
+            key_lock.users -= 1
+            if key_lock.users == 0:
+                del self.key_locks[key]
+
+    def _try_lock_file(self, lock_file):
+        try:
+            fd = os.open(lock_file, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o644)
+        except FileExistsError:
+            return False
+        with os.fdopen(fd, "w") as f:
+            json.dump({"pid": os.getpid(), "host": self.host, "time": time.time()}, f)
+        return True
+
+    def _read_lock_info(self, lock_file):
+        # Returns (lock info or None if it can't be parsed, modification time)
+        # or None if lock file doesn't exist anymore
+        try:
+            mtime = os.path.getmtime(lock_file)
+            with open(lock_file) as f:
+                text = f.read()
+        except FileNotFoundError:
+            return None
+        try:
+            return json.loads(text), mtime
+        except ValueError:
+            return None, mtime
+
+    def _is_pid_alive(self, pid):
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return False
+        except PermissionError:
+            pass
+        return True
+
+    def _is_stale(self, lock_file, lock_info=None):
+        if lock_info is None:
+            lock_info = self._read_lock_info(lock_file)
+            if lock_info is None:
+                return False
+        info, mtime = lock_info
+        if time.time() - mtime > self.stale_timeout:
+            return True
+        return isinstance(info, dict) and info.get("host") == self.host and \
+            isinstance(info.get("pid"), int) and not self._is_pid_alive(info["pid"])
+
+    def _remove_stale(self, lock_file):
+        # Lock file is moved aside first (only one process can do it) and then
+        # checked once more, it's returned back in case it was replaced by new
+        # lock of other process in the meantime.
+        stale_file = lock_file + ".stale." + str(os.getpid()) + "." + \
+            str(threading.get_ident())
+        try:
+            os.rename(lock_file, stale_file)
+        except FileNotFoundError:
+            return
+        try:
+            lock_info = self._read_lock_info(stale_file)
+            if lock_info is not None and not self._is_stale(stale_file, lock_info):
+                try:
+                    os.link(stale_file, lock_file)
+                except FileExistsError:
+                    pass
+            elif self.debug:
+                print("    Removed stale lock " + lock_file)
+        finally:
+            os.remove(stale_file)
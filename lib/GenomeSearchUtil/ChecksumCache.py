@@ -0,0 +1,148 @@
+# -*- coding: utf-8 -*-
+import hashlib
+import re
+import threading
+import time
+from collections import OrderedDict
+
+# Cache of resolved object checksums (ref -> inner checksum used in names of
+# index files). Entries are kept per auth identity (hash of token) so that one
+# user can't reuse object access checked for another one. Fully versioned
+# numeric refs (ws/obj/ver) point to immutable objects, but access to them may
+# be revoked, so they expire after long immutable TTL, other refs (names, refs
+# without version) expire after TTL. Concurrent lookups of the same key are
+# coalesced into one load call.
+IMMUTABLE_REF_PATTERN = re.compile(r"^\d+/\d+/\d+$")
+
+
+def get_identity_hash(token):
+    return hashlib.sha256((token or "").encode("utf-8")).hexdigest()
+
+
+class _PendingLoad:
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class ChecksumCache:
+
+    def __init__(self, ttl, max_size=10000, clock=time.time, immutable_ttl=3600):
+        self.ttl = ttl
+        self.immutable_ttl = immutable_ttl
+        self.max_size = max_size
+        self.clock = clock
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()  # key -> (checksum, expiration time)
+        self.pending = {}  # key -> _PendingLoad
+        self.hits = 0
+        self.misses = 0
+
+    def is_immutable(self, ref):
+        return IMMUTABLE_REF_PATTERN.match(ref) is not None
+
+    def get(self, ref, token, load_func):
+        """Returns checksum for ref, calls load_func(ref, token) in case it's
+        not cached (or expired) and no other thread loads it at the moment."""
+        key = (ref, get_identity_hash(token))
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                if entry[1] > self.clock():
+                    self.entries.move_to_end(key)
+                    self.hits += 1
+                    return entry[0]
+                del self.entries[key]
+            self.misses += 1
+            load = self.pending.get(key)
+            leader = load is None
+            if leader:
+                load = _PendingLoad()
+                self.pending[key] = load
+        if not leader:
+            load.done.wait()
+            if load.error is not None:
+                raise load.error
+            return load.value
+        try:
+            load.value = load_func(ref, token)
+        except BaseException as e:
+            load.error = e
+            raise
+        finally:
+            with self.lock:
+                del self.pending[key]
+                if load.error is None:
+                    self._store(key, ref, load.value)
+            load.done.set()
+        return load.value
+
+    def get_many(self, refs, token, load_many_func):
+        """Returns list of checksums for refs (None for refs which can't be
+        resolved), not cached refs are loaded by one load_many_func(refs,
+        token) call returning list of checksums (or None) in order of refs.
+        Refs being loaded by other threads are waited for."""
+        identity = get_identity_hash(token)
+        ret = {}
+        own = OrderedDict()  # ref -> _PendingLoad
+        waiting = {}
+        with self.lock:
+            for ref in refs:
+                key = (ref, identity)
+                if ref in ret or ref in own or ref in waiting:
+                    continue
+                entry = self.entries.get(key)
+                if entry is not None:
+                    if entry[1] > self.clock():
+                        self.entries.move_to_end(key)
+                        self.hits += 1
+                        ret[ref] = entry[0]
+                        continue
+                    del self.entries[key]
+                self.misses += 1
+                load = self.pending.get(key)
+                if load is None:
+                    load = _PendingLoad()
+                    self.pending[key] = load
+                    own[ref] = load
+                else:
+                    waiting[ref] = load
+        if own:
+            error = None
+            try:
+                values = load_many_func(list(own.keys()), token)
+                for ref, value in zip(own.keys(), values):
+                    own[ref].value = value
+            except BaseException as e:
+                error = e
+            finally:
+                with self.lock:
+                    for ref, load in own.items():
+                        load.error = error
+                        del self.pending[(ref, identity)]
+                        if error is None and load.value is not None:
+                            self._store((ref, identity), ref, load.value)
+                for load in own.values():
+                    load.done.set()
+            if error is not None:
+                raise error
+            for ref, load in own.items():
+                ret[ref] = load.value
+        for ref, load in waiting.items():
+            load.done.wait()
+            # Errors of single loads are reported as not resolved refs
+            ret[ref] = load.value if load.error is None else None
+        return [ret[ref] for ref in refs]
+
+    def _store(self, key, ref, value):
+        # Should be called under self.lock
+        ttl = self.immutable_ttl if self.is_immutable(ref) else self.ttl
+        if ttl <= 0:
+            return
+        expiration = self.clock() + ttl
+        self.entries[key] = (value, expiration)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
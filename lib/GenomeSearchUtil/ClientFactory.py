@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+import json
+import os
+import random
+import sys
+import threading
+from collections import OrderedDict
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from GenomeSearchUtil.ChecksumCache import get_identity_hash
+
+# Factory of clients of other services (Workspace, WsLargeDataIO) keeping
+# HTTP connections alive between calls. Generated clients post every call by
+# new connection, so class of base client of every created client is replaced
+# by subclass of it (see SessionCallMixin) posting through requests sessions
+# of the factory. Base client itself (with constructor options and job
+# polling of its own baseclient module) is kept as is. Sessions aren't
+# thread-safe, so every thread has its own session, but all of them share one
+# connection pool (HTTPAdapter) of the factory. Pool is created again in forked
+# process (uwsgi workers may be forked after application is loaded) so that
+# sockets are never shared between processes. Clients are kept per token hash
+# in bounded LRU cache.
+
+
+class SessionCallMixin:
+
+    def _call(self, url, method, params, context=None):
+        # The same as in BaseClient except that session of factory is used
+        # (errors are the ones of baseclient module of client)
+        baseclient = self.baseclient_module
+        arg_hash = {'method': method,
+                    'params': params,
+                    'version': '1.1',
+                    'id': str(random.random())[2:]
+                    }
+        if context:
+            if type(context) is not dict:
+                raise ValueError('context is not type dict as required.')
+            arg_hash['context'] = context
+
+        body = json.dumps(arg_hash, cls=baseclient._JSONObjectEncoder)
+        ret = self.client_factory.get_session().post(
+            url, data=body, headers=self._headers, timeout=self.timeout,
+            verify=not self.trust_all_ssl_certificates)
+        ret.encoding = 'utf-8'
+        if ret.status_code == 500:
+            if ret.headers.get(baseclient._CT) == baseclient._AJ:
+                err = ret.json()
+                if 'error' in err:
+                    raise baseclient.ServerError(**err['error'])
+                else:
+                    raise baseclient.ServerError('Unknown', 0, ret.text)
+            else:
+                raise baseclient.ServerError('Unknown', 0, ret.text)
+        if not ret.ok:
+            ret.raise_for_status()
+        resp = ret.json()
+        if 'result' not in resp:
+            raise baseclient.ServerError('Unknown', 0, 'An unknown server error occurred')
+        if not resp['result']:
+            return
+        if len(resp['result']) == 1:
+            return resp['result'][0]
+        return resp['result']
+
+
+class ClientFactory:
+
+    def __init__(self, pool_connections=10, pool_maxsize=10, max_clients=1000):
+        # pool_connections is number of hosts having pools of connections,
+        # pool_maxsize is number of connections kept alive per host
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.max_clients = max_clients
+        self.lock = threading.Lock()
+        self.clients = OrderedDict()  # (client class, url, token hash, options) -> client
+        self.session_classes = {}  # base client class -> its session subclass
+        self.pid = None
+        self.adapter = None
+        self.local = None
+
+    def get_session(self):
+        """Returns requests session of current thread."""
+        with self.lock:
+            if self.pid != os.getpid():
+                self.pid = os.getpid()
+                self.adapter = HTTPAdapter(pool_connections=self.pool_connections,
+                                           pool_maxsize=self.pool_maxsize)
+                self.local = threading.local()
+            adapter = self.adapter
+            local = self.local
+        session = getattr(local, "session", None)
+        if session is None:
+            session = requests.Session()
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            local.session = session
+        return session
+
+    def get_session_class(self, base_class):
+        """Returns subclass of base client class posting calls through
+        sessions of factory."""
+        with self.lock:
+            session_class = self.session_classes.get(base_class)
+            if session_class is None:
+                session_class = type(base_class.__name__, (SessionCallMixin, base_class),
+                                     {"baseclient_module": sys.modules[base_class.__module__]})
+                self.session_classes[base_class] = session_class
+            return session_class
+
+    def get_client(self, client_class, url, token=None, **options):
+        """Returns client (like Workspace or WsLargeDataIO generated client
+        class) of service at url authenticated by token (other options are
+        passed to constructor of client)."""
+        key = (client_class, url, get_identity_hash(token), tuple(sorted(options.items())))
+        with self.lock:
+            client = self.clients.get(key)
+            if client is not None:
+                self.clients.move_to_end(key)
+                return client
+        client = client_class(url, token=token, **options)
+        base_client = client._client
+        base_client.__class__ = self.get_session_class(type(base_client))
+        base_client.client_factory = self
+        with self.lock:
+            self.clients[key] = client
+            while len(self.clients) > self.max_clients:
+                self.clients.popitem(last=False)
+        return client
@@ -0,0 +1,296 @@
+# -*- coding: utf-8 -*-
+import sys
+from array import array
+from bisect import bisect_left, bisect_right
+
+from GenomeSearchUtil.ArrayBundle import ArrayBundle, write_array_bundle
+
+# Columnar (memory-mapped) form of TSV index file. Every column listed in
+# column properties map is kept as separate array: numeric columns as 64-bit
+# integers (INT_NULL for empty value) and text columns as codes into sorted
+# dictionary of distinct values. Whole lines are kept too (offsets + UTF-8
+# data) so that any row can be read directly by row id (row id is position of
+# line in TSV file). For every column there is also permutation of row ids
+# ordered by column value (by integer or by dictionary code, ties by row id)
+# which allows to find rows with values in given range by binary search.
+INT_NULL = -(1 << 63)
+# Estimated size of decoded dictionary value (str object without its data)
+STR_HEAP_SIZE = sys.getsizeof("")
+
+
+def _pack_strings(values):
+    offsets = array('Q', [0])
+    data = bytearray()
+    for value in values:
+        data += value.encode("utf-8")
+        offsets.append(len(data))
+    return offsets, array('B', data)
+
+
+class _ColumnBuilder:
+    # Values of one column collected in one pass over lines: integers while
+    # all values are integers (numeric columns only), otherwise codes of
+    # distinct values in order of their first appearance
+
+    def __init__(self, numeric):
+        self.int_values = array('q') if numeric else None
+        self.codes = {}
+        self.code_values = array('I')
+
+    def add(self, value):
+        if self.int_values is not None:
+            if not value:
+                self.int_values.append(INT_NULL)
+                return
+            try:
+                int_value = int(value)
+                if str(int_value) == value:
+                    self.int_values.append(int_value)
+                    return
+            except ValueError:
+                pass
+            # Not an integer column, values added so far become text ones
+            for int_value in self.int_values:
+                self._add_code("" if int_value == INT_NULL else str(int_value))
+            self.int_values = None
+        self._add_code(value)
+
+    def _add_code(self, value):
+        code = self.codes.get(value)
+        if code is None:
+            code = len(self.codes)
+            self.codes[value] = code
+        self.code_values.append(code)
+
+
+class ColumnarIndexBuilder:
+    # Lines are added one by one (so that other indexes could be built in the
+    # same pass over TSV file), only line data and values of indexed columns
+    # (as integers or codes) are kept
+
+    def __init__(self, column_props_map):
+        self.builders = [(col_name, column_props_map[col_name]["col"] - 1,
+                          _ColumnBuilder(column_props_map[col_name]["type"] == "n"))
+                         for col_name in column_props_map]
+        self.line_offsets = array('Q', [0])
+        self.line_data = bytearray()
+        self.row_count = 0
+
+    def add_line(self, line):
+        line = line.rstrip('\n')
+        self.line_data += line.encode("utf-8")
+        self.line_offsets.append(len(self.line_data))
+        items = line.split('\t')
+        for _, col_pos, builder in self.builders:
+            builder.add(items[col_pos] if col_pos < len(items) else "")
+        self.row_count += 1
+
+    def save(self, index_file):
+        row_count = self.row_count
+        arrays = {"line_offsets": self.line_offsets,
+                  "line_data": array('B', self.line_data)}
+        self.line_data = None
+        columns = {}
+        for col_name, col_pos, builder in self.builders:
+            if builder.int_values is not None:
+                int_values = builder.int_values
+                arrays["int_" + col_name] = int_values
+                arrays["rows_" + col_name] = array('I', sorted(range(row_count),
+                                                               key=int_values.__getitem__))
+                columns[col_name] = {"pos": col_pos, "kind": "int"}
+            else:
+                # Codes are renumbered in order of sorted dictionary
+                dictionary = sorted(builder.codes)
+                new_codes = array('I', bytes(4 * len(dictionary)))
+                for code, value in enumerate(dictionary):
+                    new_codes[builder.codes[value]] = code
+                code_values = builder.code_values
+                for row_id in range(row_count):
+                    code_values[row_id] = new_codes[code_values[row_id]]
+                arrays["codes_" + col_name] = code_values
+                arrays["rows_" + col_name] = array('I', sorted(range(row_count),
+                                                               key=code_values.__getitem__))
+                arrays["dict_offsets_" + col_name], arrays["dict_data_" + col_name] = \
+                    _pack_strings(dictionary)
+                columns[col_name] = {"pos": col_pos, "kind": "dict"}
+        write_array_bundle(index_file, arrays, {"row_count": row_count,
+                                                "columns": columns})
+
+
+def build_columnar_index(lines, column_props_map, index_file):
+    """Build columnar index from iterable of TSV lines and save it to
+    index_file. Lines are read in one pass."""
+    builder = ColumnarIndexBuilder(column_props_map)
+    for line in lines:
+        builder.add_line(line)
+    builder.save(index_file)
+
+
+class _SortedValues:
+    # Sequence view of column values in order of sorted rows (used for binary
+    # search)
+
+    def __init__(self, values, sorted_rows):
+        self.values = values
+        self.sorted_rows = sorted_rows
+
+    def __len__(self):
+        return len(self.sorted_rows)
+
+    def __getitem__(self, i):
+        return self.values[self.sorted_rows[i]]
+
+
+class IntColumn:
+
+    def __init__(self, values, sorted_rows):
+        self.values = values
+        self.sorted_rows = sorted_rows
+
+    def get(self, row_id):
+        value = self.values[row_id]
+        return "" if value == INT_NULL else str(value)
+
+    def find_rows(self, low=None, low_inclusive=True, high=None, high_inclusive=True):
+        """Returns row ids (sorted by value) of non-empty values in range
+        between low and high (None means no bound)."""
+        keys = _SortedValues(self.values, self.sorted_rows)
+        begin = bisect_right(keys, INT_NULL)
+        if low is not None:
+            begin = max(begin, bisect_left(keys, low) if low_inclusive else
+                        bisect_right(keys, low))
+        end = len(keys)
+        if high is not None:
+            end = bisect_right(keys, high) if high_inclusive else bisect_left(keys, high)
+        return self.sorted_rows[begin:max(begin, end)]
+
+
+class DictColumn:
+
+    def __init__(self, codes, dict_offsets, dict_data, sorted_rows):
+        self.codes = codes
+        self.sorted_rows = sorted_rows
+        self.dict_offsets = dict_offsets
+        self.dict_data = dict_data
+        self.dictionary = [None] * (len(dict_offsets) - 1)
+
+    def get_dict_value(self, code):
+        value = self.dictionary[code]
+        if value is None:
+            value = str(self.dict_data[self.dict_offsets[code]:self.dict_offsets[code + 1]],
+                        "utf-8")
+            self.dictionary[code] = value
+        return value
+
+    def get(self, row_id):
+        return self.get_dict_value(self.codes[row_id])
+
+    def find_code(self, value):
+        """Returns code of value or None if there is no such value in column."""
+        dict_keys = _DictKeys(self)
+        code = bisect_left(dict_keys, value)
+        if code < len(dict_keys) and dict_keys[code] == value:
+            return code
+        return None
+
+    def find_code_range(self, low=None, low_inclusive=True, high=None,
+                        high_inclusive=True):
+        """Returns range of codes of values between low and high (None means
+        no bound), dictionary is sorted so codes follow order of values."""
+        dict_keys = _DictKeys(self)
+        begin = 0
+        if low is not None:
+            begin = bisect_left(dict_keys, low) if low_inclusive else \
+                bisect_right(dict_keys, low)
+        end = len(dict_keys)
+        if high is not None:
+            end = bisect_right(dict_keys, high) if high_inclusive else \
+                bisect_left(dict_keys, high)
+        return range(begin, max(begin, end))
+
+    def find_rows(self, code_range):
+        """Returns row ids (sorted by value) having codes in given range."""
+        keys = _SortedValues(self.codes, self.sorted_rows)
+        begin = bisect_left(keys, code_range.start)
+        end = bisect_left(keys, code_range.stop)
+        return self.sorted_rows[begin:max(begin, end)]
+
+
+class _DictKeys:
+    # Sequence view of column dictionary (used for binary search)
+
+    def __init__(self, column):
+        self.column = column
+
+    def __len__(self):
+        return len(self.column.dictionary)
+
+    def __getitem__(self, code):
+        return self.column.get_dict_value(code)
+
+
+class ColumnarRowView:
+    # Sequence-like view of one row where item i is value of TSV column
+    # (i + first_col), only columns which are accessed are read.
+
+    def __init__(self, index, row_id, first_col=0):
+        self.index = index
+        self.row_id = row_id
+        self.first_col = first_col
+
+    def __getitem__(self, pos):
+        return self.index.get_value(self.row_id, pos + self.first_col)
+
+
+class ColumnarIndex:
+
+    def __init__(self, index_file):
+        self.bundle = ArrayBundle(index_file)
+        self.row_count = self.bundle.meta["row_count"]
+        self.line_offsets = self.bundle.get("line_offsets")
+        self.line_data = self.bundle.get("line_data")
+        self.column_meta = self.bundle.meta["columns"]
+        self.column_names = {self.column_meta[col_name]["pos"]: col_name
+                             for col_name in self.column_meta}
+        self.columns = {}
+
+    def get_heap_size(self):
+        """Returns estimated size of Python objects kept by index including
+        dictionaries of columns decoded completely (they're decoded lazily)."""
+        size = self.bundle.get_heap_size()
+        for col_name in self.column_meta:
+            if self.column_meta[col_name]["kind"] != "int":
+                value_count = self.bundle.entries["dict_offsets_" + col_name][2] - 1
+                size += (sys.getsizeof([None] * value_count) + value_count * STR_HEAP_SIZE +
+                         self.bundle.entries["dict_data_" + col_name][2])
+        return size
+
+    def get_line(self, row_id):
+        """Returns TSV line (without line end) by row id."""
+        return str(self.line_data[self.line_offsets[row_id]:self.line_offsets[row_id + 1]],
+                   "utf-8")
+
+    def get_column(self, col_name):
+        column = self.columns.get(col_name)
+        if column is None:
+            if self.column_meta[col_name]["kind"] == "int":
+                column = IntColumn(self.bundle.get("int_" + col_name),
+                                   self.bundle.get("rows_" + col_name))
+            else:
+                column = DictColumn(self.bundle.get("codes_" + col_name),
+                                    self.bundle.get("dict_offsets_" + col_name),
+                                    self.bundle.get("dict_data_" + col_name),
+                                    self.bundle.get("rows_" + col_name))
+            self.columns[col_name] = column
+        return column
+
+    def get_value(self, row_id, col_pos):
+        """Returns value of TSV column (0-based position) in given row."""
+        col_name = self.column_names.get(col_pos)
+        if col_name is None:
+            items = self.get_line(row_id).split('\t')
+            return items[col_pos] if col_pos < len(items) else ""
+        return self.get_column(col_name).get(row_id)
+
+    def get_row_view(self, row_id, first_col=0):
+        return ColumnarRowView(self, row_id, first_col)
@@ -1,53 +1,31 @@
 # -*- coding: utf-8 -*-
-import gzip
-import io
+from GenomeSearchUtil.TsvCodec import (LEGACY_SUFFIX, TsvBlockReader, has_blocks, open_tsv,
+                                       read_codec)
 
-# This class helps iterate over lines in .gz files or over lines in subprocess 
-# output depending on source type.
+# This class helps iterate over lines of index files in TSV format compressed
+# by any codec (source is path of TSV file without codec extension, path of
+# legacy .gz file is accepted as well). Blocks of files in block format are
+# decompressed by given number of threads.
 class CombinedLineIterator:
 
-    def __init__(self, source):
-        if isinstance(source, str):
-            self.index_file = io.TextIOWrapper(io.BufferedReader(gzip.open(source)),
-                                               encoding="utf-8")
-            self.process = None
+    def __init__(self, source, workers=1):
+        if source.endswith(LEGACY_SUFFIX) and read_codec(source) is None:
+            source = source[:-len(LEGACY_SUFFIX)]
+        if has_blocks(source):
+            self.index_file = TsvBlockReader(source, workers)
         else:
-            self.process = source
-            self.index_file = None
-        pass
+            self.index_file = open_tsv(source)
 
     def close(self):
-        if self.index_file:
-            self.index_file.close()
-        else:
-            if self.process.poll() is None:
-                self.process.kill()
+        self.index_file.close()
 
     # iterator implementation
     def __iter__(self):
-        if self.index_file:
-            return self.index_file.__iter__()
-        return self
-
-    def __next__(self):
-        if self.index_file:
-            raise ValueError("Unsupported operation (call __iter__ first)")
-        else:
-            line = None
-            while True:
-                line = self.process.stdout.readline().decode('utf-8')
-                if line == '' and self.process.poll() is not None:
-                    raise StopIteration
-                if line:
-                    break
-            return line
+        return self.index_file.__iter__()
 
     # context management (inside "with" block)
     def __enter__(self):
-        if self.index_file:
-            return self.index_file.__enter__()
-        else:
-            return self
+        return self
 
     def __exit__(self, *exc_info):
         self.close()
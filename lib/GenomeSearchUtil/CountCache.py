@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+import json
+import threading
+from collections import OrderedDict
+
+# Bounded LRU cache of numbers of items found by search queries (num_found)
+# shared by all requests of server process. Key consists of inner checksum of
+# indexed genome, type of items, normalized query words (lower case, sorted,
+# without duplicates since all words should be present in a line anyway) and
+# canonical JSON of structured query, so that later pages and repeated queries
+# don't need full scan counting all matches even if client didn't pass
+# num_found back.
+
+
+def get_count_key(inner_chsum, item_type, query_words, structured_query=None):
+    return (inner_chsum, item_type, tuple(sorted(set(query_words))),
+            json.dumps(structured_query or None, sort_keys=True))
+
+
+class CountCache:
+
+    def __init__(self, max_size=10000):
+        self.max_size = max_size
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()  # key -> num_found
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        """Returns cached count for key or None."""
+        with self.lock:
+            count = self.entries.get(key)
+            if count is None:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return count
+
+    def put(self, key, count):
+        with self.lock:
+            self.entries[key] = count
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+
+    def get_stats(self):
+        with self.lock:
+            return {"entries": len(self.entries), "max_size": self.max_size,
+                    "hits": self.hits, "misses": self.misses}
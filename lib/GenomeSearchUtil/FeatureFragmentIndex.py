@@ -0,0 +1,39 @@
+# -*- coding: utf-8 -*-
+import json
+from array import array
+
+from GenomeSearchUtil.ArrayBundle import ArrayBundle, write_array_bundle
+from GenomeSearchUtil.JsonSerializer import JsonFragment
+
+# FeatureData of every row of feature TSV file serialized to compact JSON
+# (UTF-8) when index is built. Index is immutable per genome checksum (the
+# same way as TSV file it's built from), so page of results may be assembled
+# from fragments of its rows (see JsonFragment) without unpacking lines and
+# encoding features again. Fragments are stored as offsets + data arrays.
+
+
+def build_fragment_index(features, index_file):
+    """Build index from iterable of FeatureData (in order of rows) and save it
+    into index_file."""
+    offsets = array('Q', [0])
+    data = bytearray()
+    for feature in features:
+        data += json.dumps(feature, ensure_ascii=False,
+                           separators=(',', ':')).encode("utf-8")
+        offsets.append(len(data))
+    write_array_bundle(index_file, {"offsets": offsets, "data": array('B', data)},
+                       {"row_count": len(offsets) - 1})
+
+
+class FeatureFragmentIndex:
+
+    def __init__(self, index_file):
+        self.bundle = ArrayBundle(index_file)
+        self.row_count = self.bundle.meta["row_count"]
+        self.offsets = self.bundle.get("offsets")
+        self.data = self.bundle.get("data")
+
+    def get_fragment(self, row_id):
+        """Returns JsonFragment of FeatureData of row."""
+        return JsonFragment(bytes(self.data[self.offsets[row_id]:
+                                            self.offsets[row_id + 1]]))
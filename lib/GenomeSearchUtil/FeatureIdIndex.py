@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+import zlib
+from array import array
+
+from GenomeSearchUtil.ArrayBundle import ArrayBundle, write_array_bundle
+
+# Persistent hash index from feature ids and aliases to row ids of feature
+# TSV file. Keys are stored as offsets + UTF-8 data, rows of every key as
+# ranges of one postings array. Hash table is open addressing one (linear
+# probing) with at least twice more slots than keys, every slot keeps key
+# number + 1 (0 means empty slot). Hash is CRC32 of UTF-8 key which (unlike
+# built-in hash of strings) is the same in all processes, so lookup of key
+# doesn't depend on genome size.
+
+
+def _get_slot_count(key_count):
+    slot_count = 8
+    while slot_count < 2 * key_count:
+        slot_count *= 2
+    return slot_count
+
+
+def get_feature_keys(line):
+    """Returns set of keys (feature id and aliases) of feature TSV line."""
+    items = line.rstrip('\n').split('\t')
+    keys = set(alias for alias in items[7].split(',') if alias) if len(items) > 7 else set()
+    if len(items) > 1 and items[1]:
+        keys.add(items[1])
+    return keys
+
+
+def build_id_index(lines, index_file):
+    """Build index from iterable of feature TSV lines and save it into
+    index_file."""
+    postings = {}
+    row_count = 0
+    for row_id, line in enumerate(lines):
+        for key in get_feature_keys(line):
+            row_ids = postings.get(key)
+            if row_ids is None:
+                row_ids = array('I')
+                postings[key] = row_ids
+            row_ids.append(row_id)
+        row_count += 1
+    key_offsets = array('Q', [0])
+    key_data = bytearray()
+    row_offsets = array('Q', [0])
+    rows = array('I')
+    slots = array('I', [0]) * _get_slot_count(len(postings))
+    mask = len(slots) - 1
+    for key_num, key in enumerate(postings):
+        key_bytes = key.encode("utf-8")
+        key_data += key_bytes
+        key_offsets.append(len(key_data))
+        rows.extend(postings[key])
+        row_offsets.append(len(rows))
+        slot = zlib.crc32(key_bytes) & mask
+        while slots[slot]:
+            slot = (slot + 1) & mask
+        slots[slot] = key_num + 1
+    write_array_bundle(index_file, {"slots": slots, "key_offsets": key_offsets,
+                                    "key_data": array('B', key_data),
+                                    "row_offsets": row_offsets, "rows": rows},
+                       {"row_count": row_count, "key_count": len(postings)})
+
+
+class FeatureIdIndex:
+
+    def __init__(self, index_file):
+        self.bundle = ArrayBundle(index_file)
+        self.row_count = self.bundle.meta["row_count"]
+        self.slots = self.bundle.get("slots")
+        self.mask = len(self.slots) - 1
+        self.key_offsets = self.bundle.get("key_offsets")
+        self.key_data = self.bundle.get("key_data")
+        self.row_offsets = self.bundle.get("row_offsets")
+
+    def get_rows(self, key):
+        """Returns row ids (in order of rows) of features having given id or
+        alias."""
+        key_bytes = key.encode("utf-8")
+        slot = zlib.crc32(key_bytes) & self.mask
+        while True:
+            key_num = self.slots[slot] - 1
+            if key_num < 0:
+                return array('I')
+            if self.key_data[self.key_offsets[key_num]:
+                             self.key_offsets[key_num + 1]] == key_bytes:
+                return self.bundle.get_range("rows", self.row_offsets[key_num],
+                                             self.row_offsets[key_num + 1])
+            slot = (slot + 1) & self.mask
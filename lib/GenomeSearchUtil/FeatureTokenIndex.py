@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+import sys
+from array import array
+
+from GenomeSearchUtil.ArrayBundle import ArrayBundle, write_array_bundle
+
+# Inverted index over lowercased n-grams of feature rows. Query words are
+# matched as substrings of the row, so every query word of GRAM_SIZE or more
+# characters can only be found in rows having all n-grams of this word. The
+# result is a superset of matching rows which still has to be verified against
+# row text (it's done by regular line filtering).
+GRAM_SIZE = 3
+# Query words never contain these characters (see query parsing in the
+# indexer) so n-grams with them are not indexed.
+_SEPARATORS = frozenset(" \t\r\n,")
+
+
+def iter_grams(text):
+    grams = set()
+    for pos in range(len(text) - GRAM_SIZE + 1):
+        gram = text[pos:pos + GRAM_SIZE]
+        if not _SEPARATORS.intersection(gram):
+            grams.add(gram)
+    return grams
+
+
+def build_token_index(rows, index_file):
+    """Build index from iterable of row texts (row id is position in iterable)
+    and save it into index_file."""
+    postings = {}
+    row_count = 0
+    for row_id, text in enumerate(rows):
+        for gram in iter_grams(text.lower()):
+            row_ids = postings.get(gram)
+            if row_ids is None:
+                row_ids = array('I')
+                postings[gram] = row_ids
+            row_ids.append(row_id)
+        row_count += 1
+    grams = sorted(postings)
+    offsets = array('Q', [0])
+    all_postings = array('I')
+    for gram in grams:
+        all_postings.extend(postings[gram])
+        offsets.append(len(all_postings))
+    write_array_bundle(index_file, {"offsets": offsets, "postings": all_postings},
+                       {"gram_size": GRAM_SIZE, "row_count": row_count,
+                        "grams": grams})
+
+
+class FeatureTokenIndex:
+
+    def __init__(self, index_file):
+        self.bundle = ArrayBundle(index_file)
+        self.row_count = self.bundle.meta["row_count"]
+        self.gram_pos = {gram: pos for pos, gram in
+                         enumerate(self.bundle.meta["grams"])}
+        self.offsets = None
+
+    def get_heap_size(self):
+        """Returns estimated size of Python objects kept by index."""
+        return self.bundle.get_heap_size() + sys.getsizeof(self.gram_pos)
+
+    def get_postings(self, gram):
+        pos = self.gram_pos.get(gram)
+        if pos is None:
+            return array('I')
+        if self.offsets is None:
+            self.offsets = self.bundle.get("offsets")
+        return self.bundle.get_range("postings", self.offsets[pos],
+                                     self.offsets[pos + 1])
+
+    def get_candidates(self, query_words):
+        """Returns set of row ids which may contain all (lowercased) query
+        words or None in case none of the words is long enough to use the
+        index."""
+        grams = set()
+        for word in query_words:
+            grams.update(iter_grams(word))
+        if not grams:
+            return None
+        posting_lists = sorted((self.get_postings(gram) for gram in grams), key=len)
+        ret = set(posting_lists[0])
+        for row_ids in posting_lists[1:]:
+            if not ret:
+                break
+            ret.intersection_update(row_ids)
+        return ret
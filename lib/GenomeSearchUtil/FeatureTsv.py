@@ -0,0 +1,181 @@
+# -*- coding: utf-8 -*-
+import json
+import multiprocessing
+import os
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from GenomeSearchUtil.TsvCodec import compress_blocks
+
+# Arrays of features in Genome object with default feature types
+FEATURE_ARRAYS = (('features', 'gene'), ('mrnas', 'mRNA'), ('cdss', 'CDS'),
+                  ('non_coding_features', 'gene'))
+UNICODE_COMMA = "\uFF0C"
+
+
+def to_text(mapping, key):
+    if key not in mapping or mapping[key] is None:
+        return ""
+    value = mapping[key]
+    if isinstance(value, list):
+        return ",".join(str(x[1]) if isinstance(x, list) else str(x)
+                        for x in value)
+    return str(value)
+
+
+def format_feature_line(feature, src_arr, default_type, index, ontologies_present=None):
+    """Returns TSV line of feature index (ontologies_present is the map from
+    new genome type, None for old genomes)."""
+    obj = {"p": index, 'arr': src_arr}
+    ft_id = to_text(feature, "id")
+    ft_type = to_text(feature, "type") if 'type' in feature else default_type
+    contig_id = ""
+    ft_strand = ""
+    ft_start = ""
+    ft_length = ""
+    if "location" in feature:
+        locations = feature["location"]
+        if len(locations)>0:
+            contig_id = locations[0][0]
+            ft_strand = locations[0][2]
+            ft_start = None
+            ft_length = None
+            if len(locations) == 1:
+                ft_start = str(locations[0][1])
+                ft_length = str(locations[0][3])
+            else:
+                ft_fwd = ft_strand == '+'
+                ft_min = None
+                ft_max = None
+                loc_to_save = []
+                for loc in locations:
+                    if loc[0] == contig_id and loc[2] == ft_strand:
+                        loc_min = loc[1] if ft_fwd else (loc[1] - loc[3] + 1)
+                        loc_max = loc[1] if not ft_fwd else (loc[1] + loc[3] - 1)
+                        if ft_min is None or ft_min > loc_min:
+                            ft_min = loc_min
+                        if ft_max is None or ft_max < loc_max:
+                            ft_max = loc_max
+                        loc_to_save.append([loc[1], loc[3]])
+                    else:
+                        loc_to_save.append(loc)
+                ft_start = str(ft_min if ft_fwd else ft_max)
+                ft_length = str(ft_max + 1 - ft_min)
+                obj["l"] = loc_to_save
+    obj_json = json.dumps(obj)
+    ft_aliases = to_text(feature, "aliases")
+    ft_function = to_text(feature, "function").replace("\t", " ")
+    if 'functions' in feature:
+        ft_function = to_text(feature, "functions").replace("\t", " ")
+    ontology_terms = []
+    if "ontology_terms" in feature:
+        for ont_type in feature["ontology_terms"]:
+            ont_map = feature["ontology_terms"][ont_type]
+            for term_id in ont_map:
+                # new genome type
+                if ontologies_present is not None:
+                    term_name = ontologies_present.get(ont_type, {}).get(term_id, "")
+                else:
+                    term_name = ont_map[term_id].get("term_name", "")
+                ontology_terms.append(term_id.replace(",", UNICODE_COMMA))
+                ontology_terms.append(term_name.replace(",", UNICODE_COMMA))
+    ft_ontology = ",".join(x for x in ontology_terms if x)
+    return "\t".join(x for x in
+                     [obj_json, ft_id, ft_type, contig_id,
+                      ft_start, ft_strand, ft_length, ft_aliases,
+                      ft_function, ft_ontology]) + "\n"
+
+
+# Rows of large genomes are formatted in chunks by pool of worker processes,
+# every chunk is split into blocks of TSV block format and compressed by the
+# worker, so that both formatting and compression run in parallel and main
+# process only writes compressed blocks in order. Workers are spawned (not
+# forked) since server process may have other threads running, they are run
+# by Python interpreter found explicitly (under uwsgi sys.executable is uwsgi
+# binary). Worker dying for any reason breaks the pool (BrokenProcessPool is
+# raised instead of waiting for its results forever). Pool with spawn context
+# needs Python 3.7+, rows are built in server process by older versions.
+# Ontologies of genome (the same for all chunks) are passed to every worker
+# once when it starts rather than pickled with every chunk.
+CHUNK_SIZE = 5000
+PROCESS_POOL_SUPPORTED = sys.version_info >= (3, 7)
+_worker_ontologies_present = None
+
+
+def get_python_executable():
+    """Returns path to Python interpreter running worker processes."""
+    if os.path.basename(sys.executable or "").startswith("python"):
+        return sys.executable
+    for name in ["python%d.%d" % sys.version_info[:2], "python3", "python"]:
+        path = os.path.join(sys.exec_prefix, "bin", name)
+        if os.path.isfile(path) and os.access(path, os.X_OK):
+            return path
+    raise ValueError("Python interpreter for index build workers is not found in " +
+                     os.path.join(sys.exec_prefix, "bin"))
+
+
+def init_worker(ontologies_present):
+    global _worker_ontologies_present
+    _worker_ontologies_present = ontologies_present
+
+
+def format_feature_chunk(codec, src_arr, default_type, first_index, features):
+    """Returns list of (row count, compressed data) of blocks of TSV lines of
+    features of one chunk (run in worker process)."""
+    text = "".join(format_feature_line(feature, src_arr, default_type, first_index + i,
+                                       _worker_ontologies_present)
+                   for i, feature in enumerate(features))
+    return compress_blocks(codec, text)
+
+
+class FeatureTsvPool:
+
+    def __init__(self, workers, codec, ontologies_present=None):
+        context = multiprocessing.get_context("spawn")
+        context.set_executable(get_python_executable())
+        self.executor = ProcessPoolExecutor(workers, mp_context=context,
+                                            initializer=init_worker,
+                                            initargs=(ontologies_present,))
+        self.codec = codec
+        # At most two chunks per worker are waiting in pool at a time
+        self.max_pending = 2 * workers
+
+    def write_features(self, outfile, src_arr, default_type, features, chunk_size=None):
+        """Writes blocks of rows of features (any iterable, it's consumed
+        chunk by chunk) into TsvBlockWriter keeping the order of rows."""
+        if chunk_size is None:
+            chunk_size = CHUNK_SIZE
+        pending = deque()
+        chunk = []
+        first_index = 0
+        for feature in features:
+            chunk.append(feature)
+            if len(chunk) == chunk_size:
+                pending.append(self.executor.submit(
+                    format_feature_chunk, self.codec, src_arr, default_type, first_index,
+                    chunk))
+                first_index += len(chunk)
+                chunk = []
+                if len(pending) >= self.max_pending:
+                    self._write_blocks(outfile, pending.popleft().result())
+        if chunk:
+            pending.append(self.executor.submit(
+                format_feature_chunk, self.codec, src_arr, default_type, first_index, chunk))
+        while pending:
+            self._write_blocks(outfile, pending.popleft().result())
+
+    def _write_blocks(self, outfile, blocks):
+        for row_count, data in blocks:
+            outfile.write_block(row_count, data)
+
+    def close(self):
+        # Chunks still waiting in pool (after error) are at most max_pending
+        self.executor.shutdown(wait=True)
+
+    # context management (inside "with" block)
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -129,6 +129,8 @@ SearchOptions is a reference to a hash where the following keys are defined:
 	start has a value which is an int
 	limit has a value which is an int
 	num_found has a value which is an int
+	cursor has a value which is a string
+	fields has a value which is a reference to a list where each element is a string
 column_sorting is a reference to a list containing 2 items:
 	0: (column) a string
 	1: (ascending) a GenomeSearchUtil.boolean
@@ -138,6 +140,7 @@ SearchResult is a reference to a hash where the following keys are defined:
 	start has a value which is an int
 	features has a value which is a reference to a list where each element is a GenomeSearchUtil.FeatureData
 	num_found has a value which is an int
+	cursor has a value which is a string
 FeatureData is a reference to a hash where the following keys are defined:
 	feature_id has a value which is a string
 	aliases has a value which is a reference to a hash where the key is a string and the value is a reference to a list where each element is a string
@@ -170,6 +173,8 @@ SearchOptions is a reference to a hash where the following keys are defined:
 	start has a value which is an int
 	limit has a value which is an int
 	num_found has a value which is an int
+	cursor has a value which is a string
+	fields has a value which is a reference to a list where each element is a string
 column_sorting is a reference to a list containing 2 items:
 	0: (column) a string
 	1: (ascending) a GenomeSearchUtil.boolean
@@ -179,6 +184,7 @@ SearchResult is a reference to a hash where the following keys are defined:
 	start has a value which is an int
 	features has a value which is a reference to a list where each element is a GenomeSearchUtil.FeatureData
 	num_found has a value which is an int
+	cursor has a value which is a string
 FeatureData is a reference to a hash where the following keys are defined:
 	feature_id has a value which is a string
 	aliases has a value which is a reference to a hash where the key is a string and the value is a reference to a list where each element is a string
@@ -275,6 +281,8 @@ SearchRegionOptions is a reference to a hash where the following keys are define
 	page_start has a value which is an int
 	page_limit has a value which is an int
 	num_found has a value which is an int
+	cursor has a value which is a string
+	fields has a value which is a reference to a list where each element is a string
 SearchRegionResult is a reference to a hash where the following keys are defined:
 	query_contig_id has a value which is a string
 	query_region_start has a value which is an int
@@ -282,6 +290,7 @@ SearchRegionResult is a reference to a hash where the following keys are defined
 	page_start has a value which is an int
 	features has a value which is a reference to a list where each element is a GenomeSearchUtil.FeatureData
 	num_found has a value which is an int
+	cursor has a value which is a string
 FeatureData is a reference to a hash where the following keys are defined:
 	feature_id has a value which is a string
 	aliases has a value which is a reference to a hash where the key is a string and the value is a reference to a list where each element is a string
@@ -314,6 +323,8 @@ SearchRegionOptions is a reference to a hash where the following keys are define
 	page_start has a value which is an int
 	page_limit has a value which is an int
 	num_found has a value which is an int
+	cursor has a value which is a string
+	fields has a value which is a reference to a list where each element is a string
 SearchRegionResult is a reference to a hash where the following keys are defined:
 	query_contig_id has a value which is a string
 	query_region_start has a value which is an int
@@ -321,6 +332,7 @@ SearchRegionResult is a reference to a hash where the following keys are defined
 	page_start has a value which is an int
 	features has a value which is a reference to a list where each element is a GenomeSearchUtil.FeatureData
 	num_found has a value which is an int
+	cursor has a value which is a string
 FeatureData is a reference to a hash where the following keys are defined:
 	feature_id has a value which is a string
 	aliases has a value which is a reference to a hash where the key is a string and the value is a reference to a list where each element is a string
@@ -416,6 +428,7 @@ SearchContigsOptions is a reference to a hash where the following keys are defin
 	start has a value which is an int
 	limit has a value which is an int
 	num_found has a value which is an int
+	cursor has a value which is a string
 column_sorting is a reference to a list containing 2 items:
 	0: (column) a string
 	1: (ascending) a GenomeSearchUtil.boolean
@@ -425,6 +438,7 @@ SearchContigsResult is a reference to a hash where the following keys are define
 	start has a value which is an int
 	contigs has a value which is a reference to a list where each element is a GenomeSearchUtil.ContigData
 	num_found has a value which is an int
+	cursor has a value which is a string
 ContigData is a reference to a hash where the following keys are defined:
 	contig_id has a value which is a string
 	length has a value which is an int
@@ -445,6 +459,7 @@ SearchContigsOptions is a reference to a hash where the following keys are defin
 	start has a value which is an int
 	limit has a value which is an int
 	num_found has a value which is an int
+	cursor has a value which is a string
 column_sorting is a reference to a list containing 2 items:
 	0: (column) a string
 	1: (ascending) a GenomeSearchUtil.boolean
@@ -454,6 +469,7 @@ SearchContigsResult is a reference to a hash where the following keys are define
 	start has a value which is an int
 	contigs has a value which is a reference to a list where each element is a GenomeSearchUtil.ContigData
 	num_found has a value which is an int
+	cursor has a value which is a string
 ContigData is a reference to a hash where the following keys are defined:
 	contig_id has a value which is a string
 	length has a value which is an int
@@ -516,6 +532,300 @@ ContigData is a reference to a hash where the following keys are defined:
     }
 }
  
+
+
+=head2 search_multi
+
+  $result = $obj->search_multi($params)
+
+=over 4
+
+=item Parameter and return types
+
+=begin html
+
+<pre>
+$params is a GenomeSearchUtil.SearchMultiOptions
+$result is a GenomeSearchUtil.SearchMultiResult
+SearchMultiOptions is a reference to a hash where the following keys are defined:
+	refs has a value which is a reference to a list where each element is a string
+	query has a value which is a string
+	structured_query has a value which is an UnspecifiedObject, which can hold any non-null object
+	sort_by has a value which is a reference to a list where each element is a GenomeSearchUtil.column_sorting
+	start has a value which is an int
+	limit has a value which is an int
+	merge has a value which is a GenomeSearchUtil.boolean
+	fields has a value which is a reference to a list where each element is a string
+column_sorting is a reference to a list containing 2 items:
+	0: (column) a string
+	1: (ascending) a GenomeSearchUtil.boolean
+boolean is an int
+SearchMultiResult is a reference to a hash where the following keys are defined:
+	query has a value which is a string
+	start has a value which is an int
+	results has a value which is a reference to a list where each element is a GenomeSearchUtil.GenomeSearchResult
+	features has a value which is a reference to a list where each element is a GenomeSearchUtil.GenomeFeature
+	num_found has a value which is an int
+GenomeSearchResult is a reference to a hash where the following keys are defined:
+	ref has a value which is a string
+	error has a value which is a string
+	features has a value which is a reference to a list where each element is a GenomeSearchUtil.FeatureData
+	num_found has a value which is an int
+	cursor has a value which is a string
+FeatureData is a reference to a hash where the following keys are defined:
+	feature_id has a value which is a string
+	aliases has a value which is a reference to a hash where the key is a string and the value is a reference to a list where each element is a string
+	function has a value which is a string
+	location has a value which is a reference to a list where each element is a GenomeSearchUtil.Location
+	feature_type has a value which is a string
+	global_location has a value which is a GenomeSearchUtil.Location
+	feature_array has a value which is a string
+	feature_idx has a value which is an int
+	ontology_terms has a value which is a reference to a hash where the key is a string and the value is a string
+Location is a reference to a hash where the following keys are defined:
+	contig_id has a value which is a string
+	start has a value which is an int
+	strand has a value which is a string
+	length has a value which is an int
+GenomeFeature is a reference to a hash where the following keys are defined:
+	ref has a value which is a string
+	feature has a value which is a GenomeSearchUtil.FeatureData
+
+</pre>
+
+=end html
+
+=begin text
+
+$params is a GenomeSearchUtil.SearchMultiOptions
+$result is a GenomeSearchUtil.SearchMultiResult
+SearchMultiOptions is a reference to a hash where the following keys are defined:
+	refs has a value which is a reference to a list where each element is a string
+	query has a value which is a string
+	structured_query has a value which is an UnspecifiedObject, which can hold any non-null object
+	sort_by has a value which is a reference to a list where each element is a GenomeSearchUtil.column_sorting
+	start has a value which is an int
+	limit has a value which is an int
+	merge has a value which is a GenomeSearchUtil.boolean
+	fields has a value which is a reference to a list where each element is a string
+column_sorting is a reference to a list containing 2 items:
+	0: (column) a string
+	1: (ascending) a GenomeSearchUtil.boolean
+boolean is an int
+SearchMultiResult is a reference to a hash where the following keys are defined:
+	query has a value which is a string
+	start has a value which is an int
+	results has a value which is a reference to a list where each element is a GenomeSearchUtil.GenomeSearchResult
+	features has a value which is a reference to a list where each element is a GenomeSearchUtil.GenomeFeature
+	num_found has a value which is an int
+GenomeSearchResult is a reference to a hash where the following keys are defined:
+	ref has a value which is a string
+	error has a value which is a string
+	features has a value which is a reference to a list where each element is a GenomeSearchUtil.FeatureData
+	num_found has a value which is an int
+	cursor has a value which is a string
+FeatureData is a reference to a hash where the following keys are defined:
+	feature_id has a value which is a string
+	aliases has a value which is a reference to a hash where the key is a string and the value is a reference to a list where each element is a string
+	function has a value which is a string
+	location has a value which is a reference to a list where each element is a GenomeSearchUtil.Location
+	feature_type has a value which is a string
+	global_location has a value which is a GenomeSearchUtil.Location
+	feature_array has a value which is a string
+	feature_idx has a value which is an int
+	ontology_terms has a value which is a reference to a hash where the key is a string and the value is a string
+Location is a reference to a hash where the following keys are defined:
+	contig_id has a value which is a string
+	start has a value which is an int
+	strand has a value which is a string
+	length has a value which is an int
+GenomeFeature is a reference to a hash where the following keys are defined:
+	ref has a value which is a string
+	feature has a value which is a GenomeSearchUtil.FeatureData
+
+
+=end text
+
+=item Description
+
+
+
+=back
+
+=cut
+
+ sub search_multi
+{
+    my($self, @args) = @_;
+
+# Authentication: optional
+
+    if ((my $n = @args) != 1)
+    {
+	Bio::KBase::Exceptions::ArgumentValidationError->throw(error =>
+							       "Invalid argument count for function search_multi (received $n, expecting 1)");
+    }
+    {
+	my($params) = @args;
+
+	my @_bad_arguments;
+        (ref($params) eq 'HASH') or push(@_bad_arguments, "Invalid type for argument 1 \"params\" (value was \"$params\")");
+        if (@_bad_arguments) {
+	    my $msg = "Invalid arguments passed to search_multi:\n" . join("", map { "\t$_\n" } @_bad_arguments);
+	    Bio::KBase::Exceptions::ArgumentValidationError->throw(error => $msg,
+								   method_name => 'search_multi');
+	}
+    }
+
+    my $url = $self->{url};
+    my $result = $self->{client}->call($url, $self->{headers}, {
+	    method => "GenomeSearchUtil.search_multi",
+	    params => \@args,
+    });
+    if ($result) {
+	if ($result->is_error) {
+	    Bio::KBase::Exceptions::JSONRPC->throw(error => $result->error_message,
+					       code => $result->content->{error}->{code},
+					       method_name => 'search_multi',
+					       data => $result->content->{error}->{error} # JSON::RPC::ReturnObject only supports JSONRPC 1.1 or 1.O
+					      );
+	} else {
+	    return wantarray ? @{$result->result} : $result->result->[0];
+	}
+    } else {
+        Bio::KBase::Exceptions::HTTP->throw(error => "Error invoking method search_multi",
+					    status_line => $self->{client}->status_line,
+					    method_name => 'search_multi',
+				       );
+    }
+}
+ 
+
+
+=head2 get_features
+
+  $result = $obj->get_features($params)
+
+=over 4
+
+=item Parameter and return types
+
+=begin html
+
+<pre>
+$params is a GenomeSearchUtil.GetFeaturesOptions
+$result is a GenomeSearchUtil.GetFeaturesResult
+GetFeaturesOptions is a reference to a hash where the following keys are defined:
+	ref has a value which is a string
+	feature_ids has a value which is a reference to a list where each element is a string
+	fields has a value which is a reference to a list where each element is a string
+GetFeaturesResult is a reference to a hash where the following keys are defined:
+	features has a value which is a reference to a hash where the key is a string and the value is a reference to a list where each element is a GenomeSearchUtil.FeatureData
+	not_found has a value which is a reference to a list where each element is a string
+FeatureData is a reference to a hash where the following keys are defined:
+	feature_id has a value which is a string
+	aliases has a value which is a reference to a hash where the key is a string and the value is a reference to a list where each element is a string
+	function has a value which is a string
+	location has a value which is a reference to a list where each element is a GenomeSearchUtil.Location
+	feature_type has a value which is a string
+	global_location has a value which is a GenomeSearchUtil.Location
+	feature_array has a value which is a string
+	feature_idx has a value which is an int
+	ontology_terms has a value which is a reference to a hash where the key is a string and the value is a string
+Location is a reference to a hash where the following keys are defined:
+	contig_id has a value which is a string
+	start has a value which is an int
+	strand has a value which is a string
+	length has a value which is an int
+
+</pre>
+
+=end html
+
+=begin text
+
+$params is a GenomeSearchUtil.GetFeaturesOptions
+$result is a GenomeSearchUtil.GetFeaturesResult
+GetFeaturesOptions is a reference to a hash where the following keys are defined:
+	ref has a value which is a string
+	feature_ids has a value which is a reference to a list where each element is a string
+	fields has a value which is a reference to a list where each element is a string
+GetFeaturesResult is a reference to a hash where the following keys are defined:
+	features has a value which is a reference to a hash where the key is a string and the value is a reference to a list where each element is a GenomeSearchUtil.FeatureData
+	not_found has a value which is a reference to a list where each element is a string
+FeatureData is a reference to a hash where the following keys are defined:
+	feature_id has a value which is a string
+	aliases has a value which is a reference to a hash where the key is a string and the value is a reference to a list where each element is a string
+	function has a value which is a string
+	location has a value which is a reference to a list where each element is a GenomeSearchUtil.Location
+	feature_type has a value which is a string
+	global_location has a value which is a GenomeSearchUtil.Location
+	feature_array has a value which is a string
+	feature_idx has a value which is an int
+	ontology_terms has a value which is a reference to a hash where the key is a string and the value is a string
+Location is a reference to a hash where the following keys are defined:
+	contig_id has a value which is a string
+	start has a value which is an int
+	strand has a value which is a string
+	length has a value which is an int
+
+
+=end text
+
+=item Description
+
+
+
+=back
+
+=cut
+
+ sub get_features
+{
+    my($self, @args) = @_;
+
+# Authentication: optional
+
+    if ((my $n = @args) != 1)
+    {
+	Bio::KBase::Exceptions::ArgumentValidationError->throw(error =>
+							       "Invalid argument count for function get_features (received $n, expecting 1)");
+    }
+    {
+	my($params) = @args;
+
+	my @_bad_arguments;
+        (ref($params) eq 'HASH') or push(@_bad_arguments, "Invalid type for argument 1 \"params\" (value was \"$params\")");
+        if (@_bad_arguments) {
+	    my $msg = "Invalid arguments passed to get_features:\n" . join("", map { "\t$_\n" } @_bad_arguments);
+	    Bio::KBase::Exceptions::ArgumentValidationError->throw(error => $msg,
+								   method_name => 'get_features');
+	}
+    }
+
+    my $url = $self->{url};
+    my $result = $self->{client}->call($url, $self->{headers}, {
+	    method => "GenomeSearchUtil.get_features",
+	    params => \@args,
+    });
+    if ($result) {
+	if ($result->is_error) {
+	    Bio::KBase::Exceptions::JSONRPC->throw(error => $result->error_message,
+					       code => $result->content->{error}->{code},
+					       method_name => 'get_features',
+					       data => $result->content->{error}->{error} # JSON::RPC::ReturnObject only supports JSONRPC 1.1 or 1.O
+					      );
+	} else {
+	    return wantarray ? @{$result->result} : $result->result->[0];
+	}
+    } else {
+        Bio::KBase::Exceptions::HTTP->throw(error => "Error invoking method get_features",
+					    status_line => $self->{client}->status_line,
+					    method_name => 'get_features',
+				       );
+    }
+}
+ 
   
 sub status
 {
@@ -678,12 +988,23 @@ a reference to a list containing 2 items:
 =item Description
 
 structured_query - Optional query in object form that uses MongoDB style key-value
-    matching and $and, $not, and $or keywords.
+    matching and $and, $not, and $or keywords. Field value can also be
+    an object of operators $gt, $gte, $lt, $lte, $in, $nin, $ne and
+    $prefix, e.g. {"length": {"$gt": 3000}}; numeric fields (start,
+    length) are compared as numbers.
 num_found - optional field which when set informs that there
     is no need to perform full scan in order to count this
     value because it was already done before; please don't
     set this value with 0 or any guessed number if you didn't 
     get right value previously.
+cursor - optional opaque cursor returned with previous page;
+    when set, next page is returned starting right after the
+    last item of previous page (start and num_found are taken from
+    cursor). Cursor can be used only with the same query and
+    sorting as ones of previous page.
+fields - optional list of FeatureData fields which should be
+    returned for every feature (all fields by default), other
+    fields are not decoded.
 
 
 =item Definition
@@ -699,6 +1020,8 @@ sort_by has a value which is a reference to a list where each element is a Genom
 start has a value which is an int
 limit has a value which is an int
 num_found has a value which is an int
+cursor has a value which is a string
+fields has a value which is a reference to a list where each element is a string
 
 </pre>
 
@@ -714,6 +1037,8 @@ sort_by has a value which is a reference to a list where each element is a Genom
 start has a value which is an int
 limit has a value which is an int
 num_found has a value which is an int
+cursor has a value which is a string
+fields has a value which is a reference to a list where each element is a string
 
 
 =end text
@@ -827,6 +1152,7 @@ ontology_terms has a value which is a reference to a hash where the key is a str
 
 num_found - number of all items found in query search (with 
     only part of it returned in "features" list).
+cursor - opaque cursor of next page (null for the last page).
 
 
 =item Definition
@@ -839,6 +1165,7 @@ query has a value which is a string
 start has a value which is an int
 features has a value which is a reference to a list where each element is a GenomeSearchUtil.FeatureData
 num_found has a value which is an int
+cursor has a value which is a string
 
 </pre>
 
@@ -851,6 +1178,7 @@ query has a value which is a string
 start has a value which is an int
 features has a value which is a reference to a list where each element is a GenomeSearchUtil.FeatureData
 num_found has a value which is an int
+cursor has a value which is a string
 
 
 =end text
@@ -872,6 +1200,14 @@ num_found - optional field which when set informs that there
     value because it was already done before; please don't
     set this value with 0 or any guessed number if you didn't 
     get right value previously.
+cursor - optional opaque cursor returned with previous page;
+    when set, next page is returned starting right after the
+    last item of previous page (page_start and num_found are taken from
+    cursor). Cursor can be used only with the same query and
+    sorting as ones of previous page.
+fields - optional list of FeatureData fields which should be
+    returned for every feature (all fields by default), other
+    fields are not decoded.
 
 
 =item Definition
@@ -887,6 +1223,8 @@ query_region_length has a value which is an int
 page_start has a value which is an int
 page_limit has a value which is an int
 num_found has a value which is an int
+cursor has a value which is a string
+fields has a value which is a reference to a list where each element is a string
 
 </pre>
 
@@ -902,6 +1240,8 @@ query_region_length has a value which is an int
 page_start has a value which is an int
 page_limit has a value which is an int
 num_found has a value which is an int
+cursor has a value which is a string
+fields has a value which is a reference to a list where each element is a string
 
 
 =end text
@@ -920,6 +1260,7 @@ num_found has a value which is an int
 
 num_found - number of all items found in query search (with 
     only part of it returned in "features" list).
+cursor - opaque cursor of next page (null for the last page).
 
 
 =item Definition
@@ -934,6 +1275,7 @@ query_region_length has a value which is an int
 page_start has a value which is an int
 features has a value which is a reference to a list where each element is a GenomeSearchUtil.FeatureData
 num_found has a value which is an int
+cursor has a value which is a string
 
 </pre>
 
@@ -948,6 +1290,7 @@ query_region_length has a value which is an int
 page_start has a value which is an int
 features has a value which is a reference to a list where each element is a GenomeSearchUtil.FeatureData
 num_found has a value which is an int
+cursor has a value which is a string
 
 
 =end text
@@ -969,6 +1312,11 @@ num_found - optional field which when set informs that there
     value because it was already done before; please don't
     set this value with 0 or any guessed number if you didn't 
     get right value previously.
+cursor - optional opaque cursor returned with previous page;
+    when set, next page is returned starting right after the
+    last item of previous page (start and num_found are taken from
+    cursor). Cursor can be used only with the same query and
+    sorting as ones of previous page.
 
 
 =item Definition
@@ -983,6 +1331,7 @@ sort_by has a value which is a reference to a list where each element is a Genom
 start has a value which is an int
 limit has a value which is an int
 num_found has a value which is an int
+cursor has a value which is a string
 
 </pre>
 
@@ -997,6 +1346,7 @@ sort_by has a value which is a reference to a list where each element is a Genom
 start has a value which is an int
 limit has a value which is an int
 num_found has a value which is an int
+cursor has a value which is a string
 
 
 =end text
@@ -1057,6 +1407,7 @@ feature_count has a value which is an int
 
 num_found - number of all items found in query search (with 
     only part of it returned in "features" list).
+cursor - opaque cursor of next page (null for the last page).
 
 
 =item Definition
@@ -1069,6 +1420,7 @@ query has a value which is a string
 start has a value which is an int
 contigs has a value which is a reference to a list where each element is a GenomeSearchUtil.ContigData
 num_found has a value which is an int
+cursor has a value which is a string
 
 </pre>
 
@@ -1081,6 +1433,272 @@ query has a value which is a string
 start has a value which is an int
 contigs has a value which is a reference to a list where each element is a GenomeSearchUtil.ContigData
 num_found has a value which is an int
+cursor has a value which is a string
+
+
+=end text
+
+=back
+
+
+
+=head2 SearchMultiOptions
+
+=over 4
+
+
+
+=item Description
+
+refs - list of genome refs (up to 1000) searched with the same
+    query, structured_query and sorting as in search method,
+merge - optional flag which when set informs that one page of
+    features of all genomes merged in sort_by order should be
+    returned (items equal by sort keys are kept in order of refs)
+    instead of separate page for every genome,
+fields - optional list of FeatureData fields which should be
+    returned for every feature (all fields by default), other
+    fields are not decoded.
+
+
+=item Definition
+
+=begin html
+
+<pre>
+a reference to a hash where the following keys are defined:
+refs has a value which is a reference to a list where each element is a string
+query has a value which is a string
+structured_query has a value which is an UnspecifiedObject, which can hold any non-null object
+sort_by has a value which is a reference to a list where each element is a GenomeSearchUtil.column_sorting
+start has a value which is an int
+limit has a value which is an int
+merge has a value which is a GenomeSearchUtil.boolean
+fields has a value which is a reference to a list where each element is a string
+
+</pre>
+
+=end html
+
+=begin text
+
+a reference to a hash where the following keys are defined:
+refs has a value which is a reference to a list where each element is a string
+query has a value which is a string
+structured_query has a value which is an UnspecifiedObject, which can hold any non-null object
+sort_by has a value which is a reference to a list where each element is a GenomeSearchUtil.column_sorting
+start has a value which is an int
+limit has a value which is an int
+merge has a value which is a GenomeSearchUtil.boolean
+fields has a value which is a reference to a list where each element is a string
+
+
+=end text
+
+=back
+
+
+
+=head2 GenomeSearchResult
+
+=over 4
+
+
+
+=item Description
+
+error - error message in case search in this genome failed (other
+    fields are not set then),
+features - page of features of this genome (not set in merge mode),
+cursor - opaque cursor of next page of this genome which can be
+    passed to search method (not set in merge mode).
+
+
+=item Definition
+
+=begin html
+
+<pre>
+a reference to a hash where the following keys are defined:
+ref has a value which is a string
+error has a value which is a string
+features has a value which is a reference to a list where each element is a GenomeSearchUtil.FeatureData
+num_found has a value which is an int
+cursor has a value which is a string
+
+</pre>
+
+=end html
+
+=begin text
+
+a reference to a hash where the following keys are defined:
+ref has a value which is a string
+error has a value which is a string
+features has a value which is a reference to a list where each element is a GenomeSearchUtil.FeatureData
+num_found has a value which is an int
+cursor has a value which is a string
+
+
+=end text
+
+=back
+
+
+
+=head2 GenomeFeature
+
+=over 4
+
+
+
+=item Definition
+
+=begin html
+
+<pre>
+a reference to a hash where the following keys are defined:
+ref has a value which is a string
+feature has a value which is a GenomeSearchUtil.FeatureData
+
+</pre>
+
+=end html
+
+=begin text
+
+a reference to a hash where the following keys are defined:
+ref has a value which is a string
+feature has a value which is a GenomeSearchUtil.FeatureData
+
+
+=end text
+
+=back
+
+
+
+=head2 SearchMultiResult
+
+=over 4
+
+
+
+=item Description
+
+results - results for every genome in order of refs,
+features - merged page of features of all genomes (only in merge
+    mode),
+num_found - number of all items found in all genomes (only in
+    merge mode).
+
+
+=item Definition
+
+=begin html
+
+<pre>
+a reference to a hash where the following keys are defined:
+query has a value which is a string
+start has a value which is an int
+results has a value which is a reference to a list where each element is a GenomeSearchUtil.GenomeSearchResult
+features has a value which is a reference to a list where each element is a GenomeSearchUtil.GenomeFeature
+num_found has a value which is an int
+
+</pre>
+
+=end html
+
+=begin text
+
+a reference to a hash where the following keys are defined:
+query has a value which is a string
+start has a value which is an int
+results has a value which is a reference to a list where each element is a GenomeSearchUtil.GenomeSearchResult
+features has a value which is a reference to a list where each element is a GenomeSearchUtil.GenomeFeature
+num_found has a value which is an int
+
+
+=end text
+
+=back
+
+
+
+=head2 GetFeaturesOptions
+
+=over 4
+
+
+
+=item Description
+
+feature_ids - list of feature ids or aliases (up to 10000) looked
+    up in genome without scanning its features,
+fields - optional list of FeatureData fields which should be
+    returned for every feature (all fields by default), other
+    fields are not decoded.
+
+
+=item Definition
+
+=begin html
+
+<pre>
+a reference to a hash where the following keys are defined:
+ref has a value which is a string
+feature_ids has a value which is a reference to a list where each element is a string
+fields has a value which is a reference to a list where each element is a string
+
+</pre>
+
+=end html
+
+=begin text
+
+a reference to a hash where the following keys are defined:
+ref has a value which is a string
+feature_ids has a value which is a reference to a list where each element is a string
+fields has a value which is a reference to a list where each element is a string
+
+
+=end text
+
+=back
+
+
+
+=head2 GetFeaturesResult
+
+=over 4
+
+
+
+=item Description
+
+features - mapping from requested id to features having this id
+    or alias (in order of features in genome),
+not_found - requested ids which no feature has.
+
+
+=item Definition
+
+=begin html
+
+<pre>
+a reference to a hash where the following keys are defined:
+features has a value which is a reference to a hash where the key is a string and the value is a reference to a list where each element is a GenomeSearchUtil.FeatureData
+not_found has a value which is a reference to a list where each element is a string
+
+</pre>
+
+=end html
+
+=begin text
+
+a reference to a hash where the following keys are defined:
+features has a value which is a reference to a hash where the key is a string and the value is a reference to a list where each element is a GenomeSearchUtil.FeatureData
+not_found has a value which is a reference to a list where each element is a string
 
 
 =end text
@@ -37,21 +37,32 @@ class GenomeSearchUtil(object):
         """
         :param params: instance of type "SearchOptions" (structured_query -
            Optional query in object form that uses MongoDB style key-value
-           matching and $and, $not, and $or keywords. num_found - optional
-           field which when set informs that there is no need to perform full
-           scan in order to count this value because it was already done
-           before; please don't set this value with 0 or any guessed number
-           if you didn't get right value previously.) -> structure: parameter
-           "ref" of String, parameter "query" of String, parameter
-           "structured_query" of unspecified object, parameter "sort_by" of
-           list of type "column_sorting" -> tuple of size 2: parameter
-           "column" of String, parameter "ascending" of type "boolean"
-           (Indicates true or false values, false = 0, true = 1 @range
-           [0,1]), parameter "start" of Long, parameter "limit" of Long,
-           parameter "num_found" of Long
+           matching and $and, $not, and $or keywords. Field value can also be
+           an object of operators $gt, $gte, $lt, $lte, $in, $nin, $ne and
+           $prefix, e.g. {"length": {"$gt": 3000}}; numeric fields (start,
+           length) are compared as numbers. num_found - optional field which
+           when set informs that there is no need to perform full scan in
+           order to count this value because it was already done before;
+           please don't set this value with 0 or any guessed number if you
+           didn't get right value previously. cursor - optional opaque cursor
+           returned with previous page; when set, next page is returned
+           starting right after the last item of previous page (start and
+           num_found are taken from cursor). Cursor can be used only with the
+           same query and sorting as ones of previous page. fields - optional
+           list of FeatureData fields which should be returned for every
+           feature (all fields by default), other fields are not decoded.) ->
+           structure: parameter "ref" of String, parameter "query" of String,
+           parameter "structured_query" of unspecified object, parameter
+           "sort_by" of list of type "column_sorting" -> tuple of size 2:
+           parameter "column" of String, parameter "ascending" of type
+           "boolean" (Indicates true or false values, false = 0, true = 1
+           @range [0,1]), parameter "start" of Long, parameter "limit" of
+           Long, parameter "num_found" of Long, parameter "cursor" of String,
+           parameter "fields" of list of String
         :returns: instance of type "SearchResult" (num_found - number of all
            items found in query search (with only part of it returned in
-           "features" list).) -> structure: parameter "query" of String,
+           "features" list). cursor - opaque cursor of next page (null for
+           the last page).) -> structure: parameter "query" of String,
            parameter "start" of Long, parameter "features" of list of type
            "FeatureData" (aliases - mapping from alias name (key) to set of
            alias sources (value), global_location - this is location-related
@@ -71,7 +82,7 @@ class GenomeSearchUtil(object):
            parameter "strand" of String, parameter "length" of Long,
            parameter "feature_array" of String, parameter "feature_idx" of
            Long, parameter "ontology_terms" of mapping from String to String,
-           parameter "num_found" of Long
+           parameter "num_found" of Long, parameter "cursor" of String
         """
         return self._client.call_method(
             'GenomeSearchUtil.search',
@@ -83,14 +94,23 @@ class GenomeSearchUtil(object):
            optional field which when set informs that there is no need to
            perform full scan in order to count this value because it was
            already done before; please don't set this value with 0 or any
-           guessed number if you didn't get right value previously.) ->
-           structure: parameter "ref" of String, parameter "query_contig_id"
-           of String, parameter "query_region_start" of Long, parameter
-           "query_region_length" of Long, parameter "page_start" of Long,
-           parameter "page_limit" of Long, parameter "num_found" of Long
+           guessed number if you didn't get right value previously. cursor -
+           optional opaque cursor returned with previous page; when set, next
+           page is returned starting right after the last item of previous
+           page (page_start and num_found are taken from cursor). Cursor can
+           be used only with the same query and sorting as ones of previous
+           page. fields - optional list of FeatureData fields which should be
+           returned for every feature (all fields by default), other fields
+           are not decoded.) -> structure: parameter "ref" of String,
+           parameter "query_contig_id" of String, parameter
+           "query_region_start" of Long, parameter "query_region_length" of
+           Long, parameter "page_start" of Long, parameter "page_limit" of
+           Long, parameter "num_found" of Long, parameter "cursor" of String,
+           parameter "fields" of list of String
         :returns: instance of type "SearchRegionResult" (num_found - number
            of all items found in query search (with only part of it returned
-           in "features" list).) -> structure: parameter "query_contig_id" of
+           in "features" list). cursor - opaque cursor of next page (null for
+           the last page).) -> structure: parameter "query_contig_id" of
            String, parameter "query_region_start" of Long, parameter
            "query_region_length" of Long, parameter "page_start" of Long,
            parameter "features" of list of type "FeatureData" (aliases -
@@ -112,7 +132,7 @@ class GenomeSearchUtil(object):
            "strand" of String, parameter "length" of Long, parameter
            "feature_array" of String, parameter "feature_idx" of Long,
            parameter "ontology_terms" of mapping from String to String,
-           parameter "num_found" of Long
+           parameter "num_found" of Long, parameter "cursor" of String
         """
         return self._client.call_method(
             'GenomeSearchUtil.search_region',
@@ -124,28 +144,149 @@ class GenomeSearchUtil(object):
            optional field which when set informs that there is no need to
            perform full scan in order to count this value because it was
            already done before; please don't set this value with 0 or any
-           guessed number if you didn't get right value previously.) ->
-           structure: parameter "ref" of String, parameter "query" of String,
-           parameter "sort_by" of list of type "column_sorting" -> tuple of
-           size 2: parameter "column" of String, parameter "ascending" of
-           type "boolean" (Indicates true or false values, false = 0, true =
-           1 @range [0,1]), parameter "start" of Long, parameter "limit" of
-           Long, parameter "num_found" of Long
+           guessed number if you didn't get right value previously. cursor -
+           optional opaque cursor returned with previous page; when set, next
+           page is returned starting right after the last item of previous
+           page (start and num_found are taken from cursor). Cursor can be
+           used only with the same query and sorting as ones of previous
+           page.) -> structure: parameter "ref" of String, parameter "query"
+           of String, parameter "sort_by" of list of type "column_sorting" ->
+           tuple of size 2: parameter "column" of String, parameter
+           "ascending" of type "boolean" (Indicates true or false values,
+           false = 0, true = 1 @range [0,1]), parameter "start" of Long,
+           parameter "limit" of Long, parameter "num_found" of Long,
+           parameter "cursor" of String
         :returns: instance of type "SearchContigsResult" (num_found - number
            of all items found in query search (with only part of it returned
-           in "features" list).) -> structure: parameter "query" of String,
+           in "features" list). cursor - opaque cursor of next page (null for
+           the last page).) -> structure: parameter "query" of String,
            parameter "start" of Long, parameter "contigs" of list of type
            "ContigData" (global_location - this is location-related
            properties that are under sorting whereas items in "location"
            array are not feature_idx - legacy field keeping the position of
            feature in feature array in legacy Genome object.) -> structure:
            parameter "contig_id" of String, parameter "length" of Long,
-           parameter "feature_count" of Long, parameter "num_found" of Long
+           parameter "feature_count" of Long, parameter "num_found" of Long,
+           parameter "cursor" of String
         """
         return self._client.call_method(
             'GenomeSearchUtil.search_contigs',
             [params], self._service_ver, context)
 
+    def search_multi(self, params, context=None):
+        """
+        :param params: instance of type "SearchMultiOptions" (refs - list of
+           genome refs (up to 1000) searched with the same query,
+           structured_query and sorting as in search method, merge - optional
+           flag which when set informs that one page of features of all
+           genomes merged in sort_by order should be returned (items equal by
+           sort keys are kept in order of refs) instead of separate page for
+           every genome, fields - optional list of FeatureData fields which
+           should be returned for every feature (all fields by default),
+           other fields are not decoded.) -> structure: parameter "refs" of
+           list of String, parameter "query" of String, parameter
+           "structured_query" of unspecified object, parameter "sort_by" of
+           list of type "column_sorting" -> tuple of size 2: parameter
+           "column" of String, parameter "ascending" of type "boolean"
+           (Indicates true or false values, false = 0, true = 1 @range
+           [0,1]), parameter "start" of Long, parameter "limit" of Long,
+           parameter "merge" of type "boolean" (Indicates true or false
+           values, false = 0, true = 1 @range [0,1]), parameter "fields" of
+           list of String
+        :returns: instance of type "SearchMultiResult" (results - results for
+           every genome in order of refs, features - merged page of features
+           of all genomes (only in merge mode), num_found - number of all
+           items found in all genomes (only in merge mode).) -> structure:
+           parameter "query" of String, parameter "start" of Long, parameter
+           "results" of list of type "GenomeSearchResult" (error - error
+           message in case search in this genome failed (other fields are not
+           set then), features - page of features of this genome (not set in
+           merge mode), cursor - opaque cursor of next page of this genome
+           which can be passed to search method (not set in merge mode).) ->
+           structure: parameter "ref" of String, parameter "error" of String,
+           parameter "features" of list of type "FeatureData" (aliases -
+           mapping from alias name (key) to set of alias sources (value),
+           global_location - this is location-related properties that are
+           under sorting whereas items in "location" array are not,
+           feature_array - field recording which array a feature is located
+           in (features, mrnas, cdss, non_coding_features) feature_idx -
+           field keeping the position of feature in its array in a Genome
+           object, ontology_terms - mapping from term ID (key) to term name
+           (value).) -> structure: parameter "feature_id" of String,
+           parameter "aliases" of mapping from String to list of String,
+           parameter "function" of String, parameter "location" of list of
+           type "Location" -> structure: parameter "contig_id" of String,
+           parameter "start" of Long, parameter "strand" of String, parameter
+           "length" of Long, parameter "feature_type" of String, parameter
+           "global_location" of type "Location" -> structure: parameter
+           "contig_id" of String, parameter "start" of Long, parameter
+           "strand" of String, parameter "length" of Long, parameter
+           "feature_array" of String, parameter "feature_idx" of Long,
+           parameter "ontology_terms" of mapping from String to String,
+           parameter "num_found" of Long, parameter "cursor" of String,
+           parameter "features" of list of type "GenomeFeature" -> structure:
+           parameter "ref" of String, parameter "feature" of type
+           "FeatureData" (aliases - mapping from alias name (key) to set of
+           alias sources (value), global_location - this is location-related
+           properties that are under sorting whereas items in "location"
+           array are not, feature_array - field recording which array a
+           feature is located in (features, mrnas, cdss, non_coding_features)
+           feature_idx - field keeping the position of feature in its array
+           in a Genome object, ontology_terms - mapping from term ID (key) to
+           term name (value).) -> structure: parameter "feature_id" of
+           String, parameter "aliases" of mapping from String to list of
+           String, parameter "function" of String, parameter "location" of
+           list of type "Location" -> structure: parameter "contig_id" of
+           String, parameter "start" of Long, parameter "strand" of String,
+           parameter "length" of Long, parameter "feature_type" of String,
+           parameter "global_location" of type "Location" -> structure:
+           parameter "contig_id" of String, parameter "start" of Long,
+           parameter "strand" of String, parameter "length" of Long,
+           parameter "feature_array" of String, parameter "feature_idx" of
+           Long, parameter "ontology_terms" of mapping from String to String,
+           parameter "num_found" of Long
+        """
+        return self._client.call_method(
+            'GenomeSearchUtil.search_multi',
+            [params], self._service_ver, context)
+
+    def get_features(self, params, context=None):
+        """
+        :param params: instance of type "GetFeaturesOptions" (feature_ids -
+           list of feature ids or aliases (up to 10000) looked up in genome
+           without scanning its features, fields - optional list of
+           FeatureData fields which should be returned for every feature (all
+           fields by default), other fields are not decoded.) -> structure:
+           parameter "ref" of String, parameter "feature_ids" of list of
+           String, parameter "fields" of list of String
+        :returns: instance of type "GetFeaturesResult" (features - mapping
+           from requested id to features having this id or alias (in order of
+           features in genome), not_found - requested ids which no feature
+           has.) -> structure: parameter "features" of mapping from String to
+           list of type "FeatureData" (aliases - mapping from alias name
+           (key) to set of alias sources (value), global_location - this is
+           location-related properties that are under sorting whereas items
+           in "location" array are not, feature_array - field recording which
+           array a feature is located in (features, mrnas, cdss,
+           non_coding_features) feature_idx - field keeping the position of
+           feature in its array in a Genome object, ontology_terms - mapping
+           from term ID (key) to term name (value).) -> structure: parameter
+           "feature_id" of String, parameter "aliases" of mapping from String
+           to list of String, parameter "function" of String, parameter
+           "location" of list of type "Location" -> structure: parameter
+           "contig_id" of String, parameter "start" of Long, parameter
+           "strand" of String, parameter "length" of Long, parameter
+           "feature_type" of String, parameter "global_location" of type
+           "Location" -> structure: parameter "contig_id" of String,
+           parameter "start" of Long, parameter "strand" of String, parameter
+           "length" of Long, parameter "feature_array" of String, parameter
+           "feature_idx" of Long, parameter "ontology_terms" of mapping from
+           String to String, parameter "not_found" of list of String
+        """
+        return self._client.call_method(
+            'GenomeSearchUtil.get_features',
+            [params], self._service_ver, context)
+
     def status(self, context=None):
         return self._client.call_method('GenomeSearchUtil.status',
                                         [], self._service_ver, context)
@@ -1,44 +1,58 @@
 # -*- coding: utf-8 -*-
 import json
 import os
-import subprocess
 import tempfile
 import time
 import traceback
+from concurrent.futures import ThreadPoolExecutor
 from itertools import product
 
+from GenomeSearchUtil.BuildCoordinator import BuildCoordinator
+from GenomeSearchUtil.ChecksumCache import ChecksumCache
+from GenomeSearchUtil.ClientFactory import ClientFactory
+from GenomeSearchUtil.ColumnarIndex import ColumnarIndex, ColumnarIndexBuilder
 from GenomeSearchUtil.CombinedLineIterator import CombinedLineIterator
+from GenomeSearchUtil.CountCache import CountCache, get_count_key
+from GenomeSearchUtil.FeatureTsv import (FEATURE_ARRAYS, PROCESS_POOL_SUPPORTED,
+                                         UNICODE_COMMA, FeatureTsvPool,
+                                         format_feature_line)
+from GenomeSearchUtil.FeatureFragmentIndex import FeatureFragmentIndex, build_fragment_index
+from GenomeSearchUtil.FeatureIdIndex import FeatureIdIndex, build_id_index
+from GenomeSearchUtil.FeatureTokenIndex import FeatureTokenIndex, build_token_index
+from GenomeSearchUtil.IndexCache import IndexCache
+from GenomeSearchUtil.JsonStreamReader import JsonStreamReader
+from GenomeSearchUtil.PageCursor import decode_cursor, encode_cursor, get_query_hash
+from GenomeSearchUtil.RegionIndex import RegionIndex, build_region_index
+from GenomeSearchUtil.SortIndex import SortIndex, SortIndexBuilder, get_sort_key_func
+from GenomeSearchUtil.StructuredQuery import compile_structured_query, find_candidate_rows
+from GenomeSearchUtil.TsvCodec import (TsvBlockWriter, get_codec, get_data_file, read_codec,
+                                       write_codec)
 from Workspace.WorkspaceClient import Workspace
 from WsLargeDataIO.WsLargeDataIOClient import WsLargeDataIO
 
 
 def _eval_structured_query(split_line, structured_query, prop_dict):
-    if not isinstance(structured_query, dict):
-        raise ValueError('structured_query should be a dictionary object: {}'.format(
-            structured_query))
-    conditions = []
-    for key, val in list(structured_query.items()):
-        if key == "$not":
-            conditions.append(not _eval_structured_query(split_line, val, prop_dict))
-        elif key == "$or":
-            if not isinstance(val, list):
-                raise ValueError("Value of $or should be a list: {}". format(val))
-            conditions.append(any(_eval_structured_query(split_line, x, prop_dict) for x in val))
-        elif key == "$and":
-            if not isinstance(val, list):
-                raise ValueError("Value of $and should be a list: {}".format(val))
-            conditions.append(all(_eval_structured_query(split_line, x, prop_dict) for x in val))
-        elif key in prop_dict:
-            # if val is a list, treat the values as OR
-            if isinstance(val, list) or isinstance(val, set):
-                conditions.append(split_line[prop_dict[key]['col']-2] in val)
-            else:
-                # have to adjust to account for the clipped line
-                conditions.append(split_line[prop_dict[key]['col']-2] == val)
-        else:
-            raise ValueError("Unrecognised field in query {}. Should be one of {} or $and, $or "
-                             "or $not".format(key, ", ".join(list(prop_dict.keys()))))
-    return all(conditions)
+    return compile_structured_query(structured_query, prop_dict)(split_line)
+
+
+# Maximum number of genomes searched by one search_multi call
+SEARCH_MULTI_MAX_REFS = 1000
+# Maximum number of feature ids looked up by one get_features call
+GET_FEATURES_MAX_IDS = 10000
+# Feature rows are built by process pool (when index-build-workers > 1) only
+# for genomes having at least this number of features, number of features
+# in genome JSON file is estimated by its size
+PARALLEL_BUILD_MIN_FEATURES = 20000
+JSON_BYTES_PER_FEATURE = 400
+# Number of build workers when index-build-workers is 0 (CPU count of host is
+# seen in containers, and every server process may build its own genome)
+MAX_AUTO_BUILD_WORKERS = 4
+# Fields of FeatureData which may be selected by "fields" parameter of search
+# methods (in order of keys of unpacked feature)
+FEATURE_FIELDS = ("location", "feature_id", "feature_type", "global_location", "aliases",
+                  "function", "feature_idx", "feature_array", "ontology_terms")
+# Fields which need JSON of the first TSV column to be decoded
+FEATURE_JSON_FIELDS = frozenset(["location", "feature_idx", "feature_array"])
 
 
 class GenomeSearchUtilIndexer:
@@ -58,31 +72,57 @@ class GenomeSearchUtilIndexer:
             "length": {"col": 2, "type": "n"}, 
             "feature_count": {"col": 3, "type": "n"}
         }
+        # Order of features in results of search_region
+        self.region_sort_by = [["contig_id", True], ["start", True]]
         self.ws_url = config["workspace-url"]
         self.genome_index_dir = config["genome-index-dir"]
         if not os.path.isdir(self.genome_index_dir):
             os.makedirs(self.genome_index_dir)
         self.debug = "debug" in config and config["debug"] == "1"
-        self.max_sort_mem_size = 250000
-        self.unicode_comma = "\uFF0C"
+        self.build_coordinator = BuildCoordinator(
+            self.genome_index_dir, int(config.get("build-lock-timeout", "3600")),
+            debug=self.debug)
+        self.checksum_cache = ChecksumCache(
+            int(config.get("checksum-cache-ttl", "60")),
+            immutable_ttl=int(config.get("checksum-cache-immutable-ttl", "3600")))
+        self.index_cache = IndexCache(int(config.get("index-cache-mb", "1024")) * 1024 * 1024)
+        self.count_cache = CountCache(int(config.get("count-cache-size", "10000")))
+        self.search_multi_threads = int(config.get("search-multi-threads", "8"))
+        # Clients of other services reusing HTTP connections
+        self.client_factory = ClientFactory(int(config.get("http-pool-connections", "10")),
+                                            int(config.get("http-pool-maxsize", "10")))
+        # Number of processes building feature rows of large genomes (0 means
+        # number of CPUs up to MAX_AUTO_BUILD_WORKERS, 1 means building in
+        # server process)
+        self.index_build_workers = int(config.get("index-build-workers", "1"))
+        if self.index_build_workers <= 0:
+            self.index_build_workers = min(os.cpu_count() or 1, MAX_AUTO_BUILD_WORKERS)
+        # Codec of new TSV files (existing ones are read with their own codecs)
+        self.codec = get_codec(config.get("index-codec", "gzip"))
+        self.unicode_comma = UNICODE_COMMA
 
     def get_one_genome(self, params, token=None):
         """Fetch a genome using WSLargeDataIO and return it as a python dict"""
 
-        callback_url = os.environ.get('SDK_CALLBACK_URL')
-        if callback_url:
-            print('fetching genome object using WsLargeDataIO')
-            ws_large_data = WsLargeDataIO(callback_url)
-            res = ws_large_data.get_objects(params)['data'][0]
-            data = json.load(open(res['data_json_file']))
+        if os.environ.get('SDK_CALLBACK_URL'):
+            with open(self.get_one_genome_json_file(params)) as f:
+                data = json.load(f)
         else:
             print('fetching genome object using Workspace')
-            ws_client = Workspace(self.ws_url, token=token)
+            ws_client = self.client_factory.get_client(Workspace, self.ws_url, token)
             data = ws_client.get_objects2(params)["data"][0]["data"]
 
         return data
 
-    def search(self, token, ref, query, structured_query, sort_by, start, limit, num_found):
+    def get_one_genome_json_file(self, params):
+        """Fetch a genome using WSLargeDataIO and return path to JSON file"""
+        print('fetching genome object using WsLargeDataIO')
+        ws_large_data = self.client_factory.get_client(WsLargeDataIO,
+                                                       os.environ['SDK_CALLBACK_URL'])
+        return ws_large_data.get_objects(params)['data'][0]['data_json_file']
+
+    def search(self, token, ref, query, structured_query, sort_by, start, limit, num_found,
+               cursor=None, fields=None, fragments=False):
         if query is None:
             query = ""
         if start is None:
@@ -94,125 +134,459 @@ class GenomeSearchUtilIndexer:
                   "limit={}".format(ref, query, structured_query, self.get_sorting_code(
                         self.feature_column_props_map, sort_by), start, limit)))
         t1 = time.time()
+        fields = self.check_feature_fields(fields)
+        predicate = None
+        if structured_query:
+            predicate = compile_structured_query(structured_query,
+                                                 self.feature_column_props_map)
         inner_chsum = self.check_feature_cache(ref, token)
-        index_iter = self.get_feature_sorted_iterator(inner_chsum, sort_by)
-        ret = self.filter_feature_query(index_iter, query, structured_query, start, limit,
-                                        num_found)
+        ret, _ = self.search_features(inner_chsum, query, structured_query, predicate, sort_by,
+                                      start, limit, num_found, cursor, fields, fragments)
+        if self.debug:
+            print(("    (overall-time=" + str(time.time() - t1) + ")"))
+        return ret
+
+    def search_features(self, inner_chsum, query, structured_query, predicate, sort_by,
+                        start, limit, num_found, cursor=None, fields=None, fragments=False,
+                        read_features=True):
+        # Returns result and row ids of the page (features of the page aren't
+        # read when read_features is False)
+        rows = self.get_feature_candidates(inner_chsum, query, structured_query)
+        table = self.get_feature_table(inner_chsum)
+        cursor_params = [inner_chsum, self.get_sorting_code(self.feature_column_props_map,
+                                                            sort_by),
+                         get_query_hash(query, structured_query)]
+        count_key = get_count_key(inner_chsum, "ftr", self.parse_query_words(query),
+                                  structured_query)
+        if num_found is None and not cursor:
+            # Number of matches counted by previous requests
+            num_found = self.count_cache.get(count_key)
+        if cursor:
+            # Next page starts right after last row of previous page
+            sort_key, start, num_found = decode_cursor(cursor, *cursor_params)
+            order = self.get_feature_rows_after(inner_chsum, sort_by, sort_key, rows)
+            ret, page = self.filter_feature_query(table, order, query, predicate, 0, limit,
+                                                  num_found)
+            ret["start"] = start
+            ret["num_found"] = num_found
+        elif sort_by and num_found is None and (predicate or self.parse_query_words(query)):
+            # Filtering first and then selecting only rows of the page (when
+            # num_found is known, ordered scan stops right after the page)
+            ret, page = self.filter_sorted_feature_query(inner_chsum, table, sort_by, rows,
+                                                         query, predicate, start, limit)
+        else:
+            order = self.get_feature_sorted_rows(inner_chsum, sort_by, rows)
+            ret, page = self.filter_feature_query(table, order, query, predicate, start, limit,
+                                                  num_found)
+        if num_found is None:
+            # All matches were counted
+            self.count_cache.put(count_key, ret["num_found"])
+        if read_features:
+            read_feature = self.get_feature_reader(inner_chsum, fields, fragments)
+            ret["features"] = [read_feature(row_id) for row_id in page]
+        ret["cursor"] = self.get_next_cursor(
+            self.get_index(inner_chsum, "ftr_sort.bin", SortIndex), sort_by, page,
+            ret["start"], ret["num_found"], cursor_params)
+        return ret, page
+
+    def search_multi(self, token, refs, query, structured_query, sort_by, start, limit,
+                     merge, fields=None, fragments=False):
+        if not isinstance(refs, list) or len(refs) == 0:
+            raise ValueError("Parameter 'refs' should be non-empty list of genome refs")
+        if len(refs) > SEARCH_MULTI_MAX_REFS:
+            raise ValueError("Too many genome refs: " + str(len(refs)) + ", maximum is " +
+                             str(SEARCH_MULTI_MAX_REFS))
+        if query is None:
+            query = ""
+        if start is None:
+            start = 0
+        if limit is None:
+            limit = 50
+        if self.debug:
+            print(("Search multi: genomes={}, query=[{}], structured_query=[{}] sort-by=[{}], "
+                   "start={}, limit={}, merge={}".format(
+                       len(refs), query, structured_query, self.get_sorting_code(
+                           self.feature_column_props_map, sort_by), start, limit, merge)))
+        t1 = time.time()
+        # Query errors are reported for whole call, other ones per genome
+        fields = self.check_feature_fields(fields)
+        predicate = None
+        if structured_query:
+            predicate = compile_structured_query(structured_query,
+                                                 self.feature_column_props_map)
+        if sort_by:
+            self.check_sort_by(self.feature_column_props_map, sort_by)
+        inner_chsums = self.checksum_cache.get_many(refs, token, self.load_inner_chsums)
+
+        def search_genome(ref, inner_chsum):
+            if inner_chsum is None:
+                raise ValueError("Object " + ref + " is not found or not accessible")
+            self.check_feature_cache(ref, token, inner_chsum)
+            if not merge:
+                return self.search_features(inner_chsum, query, structured_query, predicate,
+                                            sort_by, start, limit, None, fields=fields,
+                                            fragments=fragments)
+            # Every genome may contribute to any part of merged page, so only
+            # rows (not features) of first start + limit matches are selected
+            return self.search_features(inner_chsum, query, structured_query, predicate,
+                                        sort_by, 0, start + limit, None,
+                                        read_features=False)
+        with ThreadPoolExecutor(max_workers=min(self.search_multi_threads,
+                                                len(refs))) as executor:
+            futures = [executor.submit(search_genome, ref, inner_chsum)
+                       for ref, inner_chsum in zip(refs, inner_chsums)]
+        results = []
+        merged = []
+        for genome_pos, (ref, inner_chsum, future) in enumerate(zip(refs, inner_chsums,
+                                                                   futures)):
+            try:
+                ret, page = future.result()
+            except Exception as e:
+                results.append({"ref": ref, "error": str(e)})
+                continue
+            result = {"ref": ref, "num_found": ret["num_found"]}
+            if merge:
+                table = self.get_feature_table(inner_chsum)
+                merged.extend({"genome": genome_pos, "row_id": row_id, "sort_values": [
+                    table.get_value(row_id, self.feature_column_props_map[col_name]["col"] - 1)
+                    for col_name, _ in sort_by or []]}
+                    for row_id in page)
+            else:
+                result["features"] = ret["features"]
+                result["cursor"] = ret["cursor"]
+            results.append(result)
+        ret = {"query": query, "start": start, "results": results}
+        if merge:
+            ret["num_found"] = sum(x.get("num_found", 0) for x in results)
+            # Features are read only for rows of merged page
+            readers = {}
+            ret["features"] = []
+            for item in self.merge_sorted_features(merged, sort_by)[
+                    max(start, 0):start + limit]:
+                genome_pos = item["genome"]
+                if genome_pos not in readers:
+                    readers[genome_pos] = self.get_feature_reader(inner_chsums[genome_pos],
+                                                                  fields, fragments)
+                ret["features"].append({"ref": refs[genome_pos],
+                                        "feature": readers[genome_pos](item["row_id"])})
         if self.debug:
             print(("    (overall-time=" + str(time.time() - t1) + ")"))
         return ret
 
-    def to_text(self, mapping, key):
-        if key not in mapping or mapping[key] is None:
-            return ""
-        value = mapping[key]
-        if isinstance(value, list):
-            return ",".join(str(x[1]) if isinstance(x, list) else str(x)
-                            for x in value)
-        return str(value)
+    def merge_sorted_features(self, merged, sort_by):
+        # Items are in order of genomes and in sort_by order inside genome,
+        # stable sorts by sort columns (less significant first) keep this
+        # order for items with equal sort keys
+        for col_pos in reversed(range(len(sort_by or []))):
+            col_name, ascending = sort_by[col_pos]
+            key_func = get_sort_key_func(self.feature_column_props_map[col_name], ascending)
+            merged.sort(key=lambda item: key_func(item["sort_values"][col_pos]),
+                        reverse=not ascending)
+        for item in merged:
+            del item["sort_values"]
+        return merged
+
+    def get_features(self, token, ref, feature_ids, fields=None, fragments=False):
+        if not isinstance(feature_ids, list):
+            raise ValueError("Parameter 'feature_ids' should be list of feature ids")
+        if len(feature_ids) > GET_FEATURES_MAX_IDS:
+            raise ValueError("Too many feature ids: " + str(len(feature_ids)) +
+                             ", maximum is " + str(GET_FEATURES_MAX_IDS))
+        if self.debug:
+            print("Get features: genome=" + str(ref) + ", ids=" + str(len(feature_ids)))
+        t1 = time.time()
+        fields = self.check_feature_fields(fields)
+        inner_chsum = self.check_feature_cache(ref, token)
+        read_feature = self.get_feature_reader(inner_chsum, fields, fragments)
+        id_index = self.get_index(inner_chsum, "ftr_ids.bin", FeatureIdIndex)
+        # Features of every distinct id (feature id or alias) in order of rows
+        features = {}
+        not_found = []
+        done_ids = set()
+        for feature_id in map(str, feature_ids):
+            if feature_id in done_ids:
+                continue
+            done_ids.add(feature_id)
+            rows = id_index.get_rows(feature_id)
+            if len(rows) == 0:
+                not_found.append(feature_id)
+                continue
+            features[feature_id] = [read_feature(row_id) for row_id in rows]
+        if self.debug:
+            print(("    (overall-time=" + str(time.time() - t1) + ")"))
+        return {"features": features, "not_found": not_found}
 
     def save_feature_tsv(self, genome, inner_chsum):
-        features = []
-        for feat_array in (('features', 'gene'), ('mrnas', 'mRNA'),
-                           ('cdss', 'CDS'), ('non_coding_features', 'gene')):
-            for i, feat in enumerate(genome.get(feat_array[0], [])):
-                if 'type' not in feat:
-                    feat['type'] = feat_array[1]
-                feat['src_arr'] = feat_array[0]
-                feat['index'] = i
-                features.append(feat)
-        outfile = tempfile.NamedTemporaryFile(dir=self.genome_index_dir,
-                prefix=inner_chsum + "_ftr_", suffix=".tsv", delete=False, mode='w')
-        with outfile:
-            pos = 0
-            for feature in features:
-                obj = {"p": feature['index'], 'arr': feature['src_arr']}
-                pos += 1
-                ft_id = self.to_text(feature, "id")
-                ft_type = self.to_text(feature, "type")
-                contig_id = ""
-                ft_strand = ""
-                ft_start = ""
-                ft_length = ""
-                if "location" in feature:
-                    locations = feature["location"]
-                    if len(locations)>0:
-                        contig_id = locations[0][0]
-                        ft_strand = locations[0][2]
-                        ft_start = None
-                        ft_length = None
-                        if len(locations) == 1:
-                            ft_start = str(locations[0][1])
-                            ft_length = str(locations[0][3])
+        ontologies_present = genome.get('ontologies_present')
+        feature_count = sum(len(genome.get(src_arr) or []) for src_arr, _ in FEATURE_ARRAYS)
+        if self.is_parallel_build(feature_count):
+            with FeatureTsvPool(self.index_build_workers, self.codec,
+                                ontologies_present) as pool:
+                def write_blocks(outfile):
+                    for src_arr, default_type in FEATURE_ARRAYS:
+                        pool.write_features(outfile, src_arr, default_type,
+                                            genome.get(src_arr, []))
+                self.save_tsv(inner_chsum, "ftr", write_blocks)
+            return
+
+        def write_rows(outfile):
+            for src_arr, default_type in FEATURE_ARRAYS:
+                for i, feature in enumerate(genome.get(src_arr, [])):
+                    outfile.write(format_feature_line(feature, src_arr, default_type, i,
+                                                      ontologies_present))
+        self.save_tsv(inner_chsum, "ftr", write_rows)
+
+    def save_feature_tsv_from_json_file(self, json_file, inner_chsum):
+        # Genome JSON is streamed so that only one feature is kept in memory.
+        # First pass is looking for ontologies_present (it's needed for rows),
+        # features skipped in it are parsed but not built.
+        ontologies_present = None
+        with open(json_file, encoding="utf-8") as f:
+            reader = JsonStreamReader(f)
+            for key in reader.iter_object():
+                if key == 'ontologies_present':
+                    ontologies_present = reader.read_value()
+                    break
+                reader.skip_value()
+        # Arrays may come in any order in JSON file, so blocks of rows of every
+        # array are written to separate file and then combined in order of
+        # FEATURE_ARRAYS (without recompression).
+        pool = None
+        if self.is_parallel_build(os.path.getsize(json_file) // JSON_BYTES_PER_FEATURE):
+            pool = FeatureTsvPool(self.index_build_workers, self.codec, ontologies_present)
+        array_files = {}
+        block_tables = {}
+        try:
+            with open(json_file, encoding="utf-8") as f:
+                reader = JsonStreamReader(f)
+                for key in reader.iter_object():
+                    default_type = dict(FEATURE_ARRAYS).get(key)
+                    if default_type is None or reader.peek() != "[":
+                        reader.skip_value()
+                        continue
+                    array_file = tempfile.NamedTemporaryFile(dir=self.genome_index_dir,
+                            prefix=inner_chsum + "_ftr_" + key + "_",
+                            suffix=".tsv" + self.codec.extension, delete=False)
+                    array_files[key] = array_file.name
+                    with array_file, TsvBlockWriter(array_file, self.codec) as block_writer:
+                        if pool is not None:
+                            pool.write_features(block_writer, key, default_type,
+                                                reader.iter_array())
                         else:
-                            ft_fwd = ft_strand == '+'
-                            ft_min = None
-                            ft_max = None
-                            loc_to_save = []
-                            for loc in locations:
-                                if loc[0] == contig_id and loc[2] == ft_strand:
-                                    loc_min = loc[1] if ft_fwd else (loc[1] - loc[3] + 1)
-                                    loc_max = loc[1] if not ft_fwd else (loc[1] + loc[3] - 1)
-                                    if ft_min is None or ft_min > loc_min:
-                                        ft_min = loc_min
-                                    if ft_max is None or ft_max < loc_max:
-                                        ft_max = loc_max
-                                    loc_to_save.append([loc[1], loc[3]])
-                                else:
-                                    loc_to_save.append(loc)
-                            ft_start = str(ft_min if ft_fwd else ft_max)
-                            ft_length = str(ft_max + 1 - ft_min)
-                            obj["l"] = loc_to_save
-                obj_json = json.dumps(obj)
-                ft_aliases = self.to_text(feature, "aliases")
-                ft_function = self.to_text(feature, "function").replace("\t", " ")
-                if 'functions' in feature:
-                    ft_function = self.to_text(feature, "functions"
-                                               ).replace("\t", " ")
-                ontology_terms = []
-                if "ontology_terms" in feature:
-                    for ont_type in feature["ontology_terms"]:
-                        ont_map = feature["ontology_terms"][ont_type]
-                        for term_id in ont_map:
-                            # new genome type
-                            if 'ontologies_present' in genome:
-                                term_name = genome['ontologies_present'].get(
-                                    ont_type, {}).get(term_id, "")
-                            else:
-                                term_name = ont_map[term_id].get("term_name", "")
-                            ontology_terms.append(term_id.replace(",", self.unicode_comma))
-                            ontology_terms.append(term_name.replace(",", self.unicode_comma))
-                ft_ontology = ",".join(x for x in ontology_terms if x)
-                line = "\t".join(x for x in 
-                                  [obj_json, ft_id, ft_type, contig_id,
-                                   ft_start, ft_strand, ft_length, ft_aliases, 
-                                   ft_function, ft_ontology]) + "\n"
-                outfile.write(line)
-        subprocess.Popen(["gzip", outfile.name],
-                         stdout=subprocess.PIPE, stderr=subprocess.PIPE).wait()
-        os.rename(outfile.name + ".gz", os.path.join(self.genome_index_dir, 
-                                                     inner_chsum + "_ftr.tsv.gz"))
-
-    def check_feature_cache(self, ref, token):
-        ws_client = Workspace(self.ws_url, token=token)
+                            for i, feature in enumerate(reader.iter_array()):
+                                block_writer.write(format_feature_line(
+                                    feature, key, default_type, i, ontologies_present))
+                    block_tables[key] = block_writer.get_block_table()
+
+            def write_blocks(outfile):
+                for src_arr, _ in FEATURE_ARRAYS:
+                    if src_arr in array_files:
+                        with open(array_files[src_arr], 'rb') as array_file:
+                            outfile.copy_blocks(array_file, block_tables[src_arr])
+            self.save_tsv(inner_chsum, "ftr", write_blocks)
+        finally:
+            if pool is not None:
+                pool.close()
+            for array_file in array_files.values():
+                os.remove(array_file)
+
+    def is_parallel_build(self, feature_count):
+        return (PROCESS_POOL_SUPPORTED and self.index_build_workers > 1 and
+                feature_count >= PARALLEL_BUILD_MIN_FEATURES)
+
+    def save_tsv(self, inner_chsum, item_type, write_rows):
+        # Rows are written to TsvBlockWriter (as text lines or as compressed
+        # blocks) and compressed in process by codec
+        tsv_file = self.get_tsv_file(inner_chsum, item_type)
+        outfile = tempfile.NamedTemporaryFile(dir=self.genome_index_dir,
+                prefix=inner_chsum + "_" + item_type + "_",
+                suffix=".tsv" + self.codec.extension, delete=False)
+        with outfile, TsvBlockWriter(outfile, self.codec) as block_writer:
+            write_rows(block_writer)
+        os.rename(outfile.name, get_data_file(tsv_file, self.codec))
+        write_codec(tsv_file, self.codec, block_writer.get_block_table())
+
+    def get_tsv_file(self, inner_chsum, item_type):
+        # Path of TSV file without codec extension
+        return self.get_index_file(inner_chsum, item_type + ".tsv")
+
+    def build_tsv_once(self, inner_chsum, item_type, build_func):
+        tsv_file = self.get_tsv_file(inner_chsum, item_type)
+        self.build_once(inner_chsum, item_type + ".tsv", build_func,
+                        lambda: read_codec(tsv_file) is not None)
+
+    def get_inner_chsum(self, ref, token):
+        return self.checksum_cache.get(ref, token, self.load_inner_chsum)
+
+    def load_inner_chsum(self, ref, token):
+        ws_client = self.client_factory.get_client(Workspace, self.ws_url, token)
         info = ws_client.get_object_info_new({"objects": [{"ref": ref}]})[0]
-        inner_chsum = info[8]
-        index_file = os.path.join(self.genome_index_dir, inner_chsum + "_ftr.tsv.gz")
-        if not os.path.isfile(index_file):
+        return info[8]
+
+    def load_inner_chsums(self, refs, token):
+        # One call for all refs, None is returned for inaccessible objects
+        ws_client = self.client_factory.get_client(Workspace, self.ws_url, token)
+        infos = ws_client.get_object_info_new({"objects": [{"ref": ref} for ref in refs],
+                                               "ignoreErrors": 1})
+        return [None if info is None else info[8] for info in infos]
+
+    def check_feature_cache(self, ref, token, inner_chsum=None):
+        if inner_chsum is None:
+            inner_chsum = self.get_inner_chsum(ref, token)
+        self.build_tsv_once(inner_chsum, "ftr",
+                            lambda: self.build_feature_tsv(ref, token, inner_chsum))
+        self.check_table_indexes(inner_chsum, "ftr", self.feature_column_props_map)
+        self.check_derived_index(inner_chsum, "ftr", "tok", lambda lines, index_file:
+                                 build_token_index((line[line.index('\t') + 1:]
+                                                    for line in lines), index_file))
+        self.check_derived_index(inner_chsum, "ftr", "ids", build_id_index)
+        self.check_region_index(inner_chsum)
+        return inner_chsum
+
+    def build_feature_tsv(self, ref, token, inner_chsum):
+        if self.debug:
+            print("    Loading WS object...")
+        t1 = time.time()
+        incl = [x+y for x, y in product(
+            ['features/[*]/', 'cdss/[*]/', 'mrnas/[*]/',
+             'non_coding_features/[*]/'],
+            ["id", "type", "function", "functions", "aliases", "location",
+             "ontology_terms"])] + ['ontologies_present']
+        params = {"objects": [{"ref": ref, "included": incl}]}
+        if os.environ.get('SDK_CALLBACK_URL'):
+            # Large genomes are not loaded into memory as a whole
+            self.save_feature_tsv_from_json_file(
+                self.get_one_genome_json_file(params), inner_chsum)
+        else:
+            self.save_feature_tsv(self.get_one_genome(params, token), inner_chsum)
+        if self.debug:
+            print(("    (time=" + str(time.time() - t1) + ")"))
+
+    def get_index_file(self, inner_chsum, name):
+        return os.path.join(self.genome_index_dir, inner_chsum + "_" + name)
+
+    def build_once(self, inner_chsum, name, build_func, is_built=None):
+        # Index file is built by one thread of one server process, others
+        # wait for it (or skip it if it's already there)
+        if is_built is None:
+            index_file = self.get_index_file(inner_chsum, name)
+            is_built = lambda: os.path.isfile(index_file)
+        self.build_coordinator.build(inner_chsum + "_" + name.split(".")[0],
+                                     is_built, build_func)
+
+    def get_index(self, inner_chsum, name, index_class):
+        # Opened indexes are kept in LRU cache shared across requests, size
+        # of entry is size of mapped file plus estimated heap of index objects
+        def load_index():
+            index_file = self.get_index_file(inner_chsum, name)
+            index = index_class(index_file)
+            heap_size = (index.get_heap_size() if hasattr(index, "get_heap_size")
+                         else index.bundle.get_heap_size())
+            return index, os.path.getsize(index_file) + heap_size
+        return self.index_cache.get((inner_chsum, name), load_index)
+
+    def get_index_cache_stats(self):
+        return self.index_cache.get_stats()
+
+    def get_count_cache_stats(self):
+        return self.count_cache.get_stats()
+
+    def check_derived_index(self, inner_chsum, item_type, kind, build_func):
+        # Binary indexes are built from saved TSV file so that they could be
+        # added to files indexed before as well
+        name = item_type + "_" + kind + ".bin"
+        index_file = self.get_index_file(inner_chsum, name)
+
+        def build_index():
             if self.debug:
-                print("    Loading WS object...")
+                print("    Building " + kind + " index...")
             t1 = time.time()
-            incl = [x+y for x, y in product(
-                ['features/[*]/', 'cdss/[*]/', 'mrnas/[*]/',
-                 'non_coding_features/[*]/'],
-                ["id", "type", "function", "functions", "aliases", "location",
-                 "ontology_terms"])] + ['ontologies_present']
-            genome = self.get_one_genome({"objects": [{"ref": ref,
-                                                       "included": incl}]}, token)
-            self.save_feature_tsv(genome, inner_chsum)
+            with CombinedLineIterator(self.get_tsv_file(inner_chsum, item_type),
+                                      self.index_build_workers) as index_iter:
+                build_func(index_iter, index_file)
             if self.debug:
                 print(("    (time=" + str(time.time() - t1) + ")"))
-        return inner_chsum
+        self.build_once(inner_chsum, name, build_index)
+
+    def check_table_indexes(self, inner_chsum, item_type, column_props_map):
+        # Columnar and sort indexes are built in one pass over TSV file (only
+        # the ones missing, e.g. for files indexed before one of them existed)
+        builder_classes = {"col": ColumnarIndexBuilder, "sort": SortIndexBuilder}
+        index_files = {kind: self.get_index_file(inner_chsum, item_type + "_" + kind + ".bin")
+                       for kind in builder_classes}
+
+        def build_indexes():
+            kinds = [kind for kind in sorted(builder_classes)
+                     if not os.path.isfile(index_files[kind])]
+            if self.debug:
+                print("    Building " + " and ".join(kinds) + " indexes...")
+            t1 = time.time()
+            builders = [builder_classes[kind](column_props_map) for kind in kinds]
+            with CombinedLineIterator(self.get_tsv_file(inner_chsum, item_type),
+                                      self.index_build_workers) as index_iter:
+                for line in index_iter:
+                    for builder in builders:
+                        builder.add_line(line)
+            for kind, builder in zip(kinds, builders):
+                builder.save(index_files[kind])
+            if self.debug:
+                print(("    (time=" + str(time.time() - t1) + ")"))
+        self.build_once(inner_chsum, item_type + "_table", build_indexes,
+                        lambda: all(os.path.isfile(index_file)
+                                    for index_file in index_files.values()))
+
+    def check_region_index(self, inner_chsum):
+        # Region index is built from columnar and sort indexes of features
+        index_file = self.get_index_file(inner_chsum, "ftr_reg.bin")
+
+        def build_index():
+            if self.debug:
+                print("    Building reg index...")
+            t1 = time.time()
+            table = self.get_feature_table(inner_chsum)
+            order = self.get_feature_sorted_rows(inner_chsum, self.region_sort_by)
+            contig_ids = table.get_column("contig_id")
+            build_region_index(self.iter_feature_regions(table, order),
+                               len(contig_ids.dictionary), index_file)
+            if self.debug:
+                print(("    (time=" + str(time.time() - t1) + ")"))
+        self.build_once(inner_chsum, "ftr_reg.bin", build_index)
+
+    def iter_feature_regions(self, table, order):
+        # Yields (contig code, region min, region max, row id) for features
+        # having location in given order of rows
+        contig_ids = table.get_column("contig_id")
+        starts = table.get_column("start")
+        strands = table.get_column("strand")
+        lengths = table.get_column("length")
+        for row_id in order:
+            contig_id = contig_ids.get(row_id)
+            start = starts.get(row_id)
+            strand = strands.get(row_id)
+            length = lengths.get(row_id)
+            if contig_id and strand and start and length:
+                region = self.get_region(int(start), strand, int(length))
+                if region[0] <= region[1]:
+                    yield contig_ids.codes[row_id], region[0], region[1], row_id
+
+    def get_feature_region_index(self, inner_chsum):
+        return self.get_index(inner_chsum, "ftr_reg.bin", RegionIndex)
+
+    def get_feature_candidates(self, inner_chsum, query, structured_query=None):
+        # Returns set of feature row ids which may match all query words and
+        # (validated) structured query or None when indexes can't narrow down
+        # the search
+        rows = None
+        query_words = self.parse_query_words(query)
+        if query_words:
+            token_index = self.get_index(inner_chsum, "ftr_tok.bin", FeatureTokenIndex)
+            rows = token_index.get_candidates(query_words)
+        if structured_query:
+            query_rows = find_candidate_rows(structured_query, self.feature_column_props_map,
+                                             self.get_feature_table(inner_chsum))
+            if query_rows is not None:
+                rows = query_rows if rows is None else rows & query_rows
+        return rows
 
     def get_column_props(self, column_props_map, col_name):
         if col_name not in column_props_map:
@@ -232,133 +606,221 @@ class GenomeSearchUtilIndexer:
             ret += col_pos + ('a' if ascending_order else 'd')
         return ret
 
-    def get_feature_sorted_iterator(self, inner_chsum, sort_by):
-        return self.get_sorted_iterator(inner_chsum, sort_by, "ftr", 
-                                        self.feature_column_props_map)
+    def get_feature_table(self, inner_chsum):
+        return self.get_index(inner_chsum, "ftr_col.bin", ColumnarIndex)
+
+    def get_feature_sorted_rows(self, inner_chsum, sort_by, rows=None):
+        return self.get_sorted_rows(inner_chsum, sort_by, "ftr",
+                                    self.feature_column_props_map, rows)
+
+    def get_feature_rows_after(self, inner_chsum, sort_by, sort_key, rows=None):
+        return self.get_rows_after(inner_chsum, sort_by, sort_key, "ftr",
+                                   self.feature_column_props_map, rows)
 
-    def get_sorted_iterator(self, inner_chsum, sort_by, item_type, 
-                            column_props_map):
-        input_file = os.path.join(self.genome_index_dir, inner_chsum + "_" + 
-                                  item_type + ".tsv.gz")
-        if not os.path.isfile(input_file):
-            raise ValueError("File not found: " + input_file)
+    def get_rows_after(self, inner_chsum, sort_by, sort_key, item_type, column_props_map,
+                       rows=None):
+        # Returns row ids (optionally only ones from rows set) following row
+        # with sort_key in sort_by order
+        sort_index = self.get_index(inner_chsum, item_type + "_sort.bin", SortIndex)
+        if sort_by:
+            self.check_sort_by(column_props_map, sort_by)
+        if self.debug:
+            print("    Seeking cursor position...")
+        t1 = time.time()
+        try:
+            order = sort_index.get_rows_after(sort_by, sort_key, rows)
+        except IndexError:
+            raise ValueError("Invalid cursor: position is out of range")
+        if self.debug:
+            print(("    (time=" + str(time.time() - t1) + ")"))
+        return order
+
+    def get_next_cursor(self, sort_index, sort_by, page, start, num_found, cursor_params):
+        # Cursor of next page or None if there are no more rows
+        if not page or start + len(page) >= num_found:
+            return None
+        return encode_cursor(cursor_params[0], cursor_params[1], cursor_params[2],
+                             sort_index.get_sort_key(sort_by, page[-1]),
+                             start + len(page), num_found)
+
+    def get_sorted_rows(self, inner_chsum, sort_by, item_type, column_props_map,
+                        rows=None):
+        # Returns row ids (optionally only ones from rows set) in sort_by order
+        sort_index = self.get_index(inner_chsum, item_type + "_sort.bin", SortIndex)
         if sort_by is None or len(sort_by) == 0:
-            return CombinedLineIterator(input_file)
-        cmd = "gunzip -c \"" + input_file + "\" | sort -f -t\\\t"
+            if rows is None:
+                return range(sort_index.row_count)
+            return sorted(rows)
+        self.check_sort_by(column_props_map, sort_by)
+        if self.debug:
+            print("    Sorting...")
+        t1 = time.time()
+        order = sort_index.get_order(sort_by, rows)
+        if self.debug:
+            print(("    (time=" + str(time.time() - t1) + ")"))
+        return order
+
+    def check_sort_by(self, column_props_map, sort_by):
         for column_sorting in sort_by:
-            col_name = column_sorting[0]
-            col_props = self.get_column_props(column_props_map, col_name)
-            col_pos = str(col_props["col"])
-            ascending_order = column_sorting[1]
-            sort_arg = "-k" + col_pos + "," + col_pos + col_props["type"]
-            if not ascending_order:
-                sort_arg += "r"
-            cmd += " " + sort_arg
-        fname = (inner_chsum + "_" + item_type + "_" +
-                 self.get_sorting_code(column_props_map, sort_by))
-        final_output_file = os.path.join(self.genome_index_dir, fname + ".tsv.gz")
-        if not os.path.isfile(final_output_file):
-            if self.debug:
-                print("    Sorting...")
-            t1 = time.time()
-            need_to_save = os.path.getsize(input_file) > self.max_sort_mem_size
-            if need_to_save:
-                outfile = tempfile.NamedTemporaryFile(dir = self.genome_index_dir,
-                        prefix = fname + "_", suffix = ".tsv.gz", delete=False, mode='w')
-                outfile.close()
-                output_file = outfile.name
-                cmd += " | gzip -c > \"" + output_file + "\""
-            p = subprocess.Popen(cmd, shell=True, stdout=subprocess.PIPE, 
-                                 stderr=subprocess.PIPE)
-            if not need_to_save:
-                if self.debug:
-                    print(("    (time=" + str(time.time() - t1) + ")"))
-                return CombinedLineIterator(p)
-            else:
-                p.wait()
-                os.rename(output_file, final_output_file)
-                if self.debug:
-                    print(("    (time=" + str(time.time() - t1) + ")"))
-        return CombinedLineIterator(final_output_file)
-
-    def filter_feature_query(self, index_iter, query, structured_query, start, limit, num_found):
-        query_words = str(query).lower().translate(
+            self.get_column_props(column_props_map, column_sorting[0])
+
+    def parse_query_words(self, query):
+        return str(query).lower().translate(
                 str.maketrans("\r\n\t,", "    ")).split()
+
+    def filter_feature_query(self, table, order, query, predicate, start, limit,
+                             num_found):
+        # Returns result (without features) and row ids of the page
+        query_words = self.parse_query_words(query)
         if self.debug:
                 print("    Filtering...")
         t1 = time.time()
         fcount = 0
-        features = []
-        with index_iter:
-            for line in index_iter:
-                line2 = line[line.index('\t') + 1:]
-                if self._eval_line(line2, query_words, structured_query):
-                    if start <= fcount < start + limit:
-                        features.append(self.unpack_feature(line.rstrip('\n')))
-                    fcount += 1
-                    if num_found is not None and fcount >= start + limit:
-                        # Having shortcut when real num_found was already known
-                        fcount = num_found
-                        break
+        page = []
+        for row_id in order:
+            if self._eval_row(table, row_id, query_words, predicate):
+                if start <= fcount < start + limit:
+                    page.append(row_id)
+                fcount += 1
+                if num_found is not None and fcount >= start + limit:
+                    # Having shortcut when real num_found was already known
+                    fcount = num_found
+                    break
         if self.debug:
                 print(("    (time=" + str(time.time() - t1) + ")"))
-        return {"num_found": fcount, "start": start, "features": features,
-                "query": query}
+        return {"num_found": fcount, "start": start, "query": query}, page
 
-    def _eval_line(self, line, all_query, structured_query=None):
-        if not all(word in line.lower() for word in all_query):
-            return False
-        if structured_query:
-            return _eval_structured_query(line.split('\t'), structured_query,
-                                          self.feature_column_props_map)
+    def filter_sorted_feature_query(self, inner_chsum, table, sort_by, rows, query,
+                                    predicate, start, limit):
+        # Matching rows are found first (in any order) and only first
+        # start + limit of them are selected in sort_by order. Returns result
+        # (without features) and row ids of the page
+        self.check_sort_by(self.feature_column_props_map, sort_by)
+        query_words = self.parse_query_words(query)
+        if self.debug:
+                print("    Filtering...")
+        t1 = time.time()
+        candidates = range(table.row_count) if rows is None else sorted(rows)
+        matches = [row_id for row_id in candidates
+                   if self._eval_row(table, row_id, query_words, predicate)]
+        if self.debug:
+                print(("    (time=" + str(time.time() - t1) + ")"))
+                print("    Selecting page...")
+        t1 = time.time()
+        sort_index = self.get_index(inner_chsum, "ftr_sort.bin", SortIndex)
+        page = sort_index.get_top_rows(sort_by, matches, start + limit)[max(start, 0):]
+        if self.debug:
+                print(("    (time=" + str(time.time() - t1) + ")"))
+        return {"num_found": len(matches), "start": start, "query": query}, page
+
+    def _eval_row(self, table, row_id, all_query, predicate=None):
+        if all_query:
+            line = table.get_line(row_id)
+            line2 = line[line.index('\t') + 1:].lower()
+            if not all(word in line2 for word in all_query):
+                return False
+        if predicate:
+            # Row view reads only columns used in query (first column of
+            # line is skipped the same way as above)
+            return predicate(table.get_row_view(row_id, 1))
         return True
 
-    def unpack_feature(self, line, items = None):
+    def get_feature_reader(self, inner_chsum, fields=None, fragments=False):
+        # Returns function reading FeatureData (only requested fields) of row
+        # by row id. Whole features are read as JSON fragments (built on first
+        # request) in case caller serializes results by JsonSerializer
+        if fragments and fields is None:
+            self.check_derived_index(inner_chsum, "ftr", "frag", lambda lines, index_file:
+                                     build_fragment_index((self.unpack_feature(
+                                         line.rstrip('\n')) for line in lines), index_file))
+            return self.get_index(inner_chsum, "ftr_frag.bin",
+                                  FeatureFragmentIndex).get_fragment
+        table = self.get_feature_table(inner_chsum)
+        return lambda row_id: self.unpack_feature(table.get_line(row_id), fields=fields)
+
+    def check_feature_fields(self, fields):
+        # Returns set of requested FeatureData fields or None for all fields
+        if fields is None:
+            return None
+        if not isinstance(fields, list):
+            raise ValueError("Parameter 'fields' should be list of field names")
+        for field in fields:
+            if field not in FEATURE_FIELDS:
+                raise ValueError("Unknown feature field '" + str(field) + "', " +
+                                 "please use one of " + str(list(FEATURE_FIELDS)))
+        return frozenset(fields)
+
+    def unpack_feature(self, line, items = None, fields = None):
+        # Only requested fields (all by default) are decoded
         try:
             if items is None:
                 items = line.split('\t')
-            contig_id = items[3]
-            strand = items[5]
-            gloc = {}
-            if contig_id and strand and items[4] and items[6]:
-                gloc = {"contig_id": contig_id, "start": int(items[4]),
-                        "strand": strand, "length": int(items[6])}
-            obj = json.loads(items[0])
-            location = []
-            if "l" in obj:
-                for loc in obj["l"]:
-                    if len(loc) == 4:
-                        location.append({"contig_id": loc[0], "start": loc[1],
-                                         "strand": loc[2], "length": loc[3]})
-                    else:
-                        location.append({"contig_id": contig_id, "start": loc[0],
-                                         "strand": strand, "length": loc[1]})
-            else:
-                location.append(gloc)
-            aliases = {}
-            for alias in items[7].split(','):
-                if alias:
-                    aliases[alias] = []
-            ontology_terms = {}
-            ontology_iter = iter(items[9].split(','))
-            while True:
-                try:
-                    term_id = next(ontology_iter).replace(self.unicode_comma, ",")
-                    term_name = next(ontology_iter).replace(self.unicode_comma, ",")
-                    ontology_terms[term_id] = term_name
-                except StopIteration:
-                    break
-            return {"location": location, "feature_id": items[1],
-                    "feature_type": items[2], "global_location": gloc,
-                    "aliases": aliases, "function": items[8], 
-                    "feature_idx": obj["p"], "feature_array": obj['arr'],
-                    "ontology_terms": ontology_terms}
+            if fields is None:
+                fields = FEATURE_FIELDS
+            obj = None
+            if not FEATURE_JSON_FIELDS.isdisjoint(fields):
+                obj = json.loads(items[0])
+            ret = {}
+            if "location" in fields or "global_location" in fields:
+                contig_id = items[3]
+                strand = items[5]
+                gloc = {}
+                if contig_id and strand and items[4] and items[6]:
+                    gloc = {"contig_id": contig_id, "start": int(items[4]),
+                            "strand": strand, "length": int(items[6])}
+                if "location" in fields:
+                    ret["location"] = self.unpack_location(obj, contig_id, strand, gloc)
+            if "feature_id" in fields:
+                ret["feature_id"] = items[1]
+            if "feature_type" in fields:
+                ret["feature_type"] = items[2]
+            if "global_location" in fields:
+                ret["global_location"] = gloc
+            if "aliases" in fields:
+                aliases = {}
+                for alias in items[7].split(','):
+                    if alias:
+                        aliases[alias] = []
+                ret["aliases"] = aliases
+            if "function" in fields:
+                ret["function"] = items[8]
+            if "feature_idx" in fields:
+                ret["feature_idx"] = obj["p"]
+            if "feature_array" in fields:
+                ret["feature_array"] = obj['arr']
+            if "ontology_terms" in fields:
+                ontology_terms = {}
+                ontology_iter = iter(items[9].split(','))
+                while True:
+                    try:
+                        term_id = next(ontology_iter).replace(self.unicode_comma, ",")
+                        term_name = next(ontology_iter).replace(self.unicode_comma, ",")
+                        ontology_terms[term_id] = term_name
+                    except StopIteration:
+                        break
+                ret["ontology_terms"] = ontology_terms
+            return ret
         except:
             raise ValueError("Error parsing feature from: [" + line + "]\n" +
                              "Cause: " + traceback.format_exc())
 
+    def unpack_location(self, obj, contig_id, strand, gloc):
+        location = []
+        if "l" in obj:
+            for loc in obj["l"]:
+                if len(loc) == 4:
+                    location.append({"contig_id": loc[0], "start": loc[1],
+                                     "strand": loc[2], "length": loc[3]})
+                else:
+                    location.append({"contig_id": contig_id, "start": loc[0],
+                                     "strand": strand, "length": loc[1]})
+        else:
+            location.append(gloc)
+        return location
+
     def search_region(self, token, ref, query_contig_id, query_region_start,
-                      query_region_length, page_start, page_limit, num_found):
+                      query_region_length, page_start, page_limit, num_found, cursor=None,
+                      fields=None, fragments=False):
         if query_contig_id is None:
             raise ValueError("Parameter 'query_contig_id' should be set");
         if query_region_start is None:
@@ -375,49 +837,59 @@ class GenomeSearchUtilIndexer:
                   str(query_region_length) + "], page_start=" + 
                   str(page_start) + ", page_limit=" + str(page_limit)))
         t1 = time.time()
+        fields = self.check_feature_fields(fields)
         inner_chsum = self.check_feature_cache(ref, token)
-        sort_by = [["contig_id", True], ["start", True]]
-        index_iter = self.get_feature_sorted_iterator(inner_chsum, sort_by)
-        ret = self.filter_query_region(index_iter, query_contig_id,
+        ret = self.filter_query_region(self.get_feature_table(inner_chsum),
+                                       self.get_feature_region_index(inner_chsum),
+                                       query_contig_id,
                                        query_region_start, query_region_length,
-                                       page_start, page_limit, num_found)
+                                       page_start, page_limit, num_found,
+                                       [inner_chsum, "", get_query_hash(
+                                           query_contig_id, query_region_start,
+                                           query_region_length)], cursor,
+                                       self.get_feature_reader(inner_chsum, fields, fragments))
         contig = self.get_contig(token, ref, query_contig_id)
         ret["contig_length"] = None if not contig else contig["length"]
         if self.debug:
             print(("    (overall-time=" + str(time.time() - t1) + ")"))
         return ret
 
-    def filter_query_region(self, index_iter, query_contig_id, query_region_start,
-                            query_region_length, page_start, page_limit, num_found):
+    def filter_query_region(self, table, region_index, query_contig_id, query_region_start,
+                            query_region_length, page_start, page_limit, num_found,
+                            cursor_params=None, cursor=None, read_feature=None):
+        if read_feature is None:
+            read_feature = lambda row_id: self.unpack_feature(table.get_line(row_id))
         if self.debug:
                 print("    Filtering region...")
         query = self.get_region(query_region_start, "+", query_region_length)
         t1 = time.time()
-        fcount = 0
-        features = []
-        with index_iter:
-            for line in index_iter:
-                items = line.rstrip('\n').split('\t')
-                contig_id = items[3]
-                start = items[4]
-                strand = items[5]
-                length = items[6]
-                if contig_id and strand and start and length:
-                    if contig_id == query_contig_id and self.intersect(query,
-                            self.get_region(int(start), strand, int(length))):
-                        if fcount >= page_start and fcount < page_start + page_limit:
-                            features.append(self.unpack_feature(line.rstrip('\n')))
-                        fcount += 1
-                        if num_found is not None and fcount >= page_start + page_limit:
-                            # Having shortcut when real num_found was already known
-                            fcount = num_found
-                            break
+        contig_code = table.get_column("contig_id").find_code(query_contig_id)
+        if cursor:
+            # Cursor keeps position of last returned row in results order
+            sort_key, page_start, num_found = decode_cursor(cursor, *cursor_params)
+            hits = region_index.find_positioned_rows(contig_code, query[0], query[1],
+                                                     sort_key[0] if sort_key else None)
+            hits = hits[:page_limit]
+            fcount = num_found
+        else:
+            hits = region_index.find_positioned_rows(contig_code, query[0], query[1])
+            fcount = len(hits)
+            if num_found is not None and fcount >= page_start + page_limit:
+                # Keeping num_found known by client (counting is cheap anyway)
+                fcount = num_found
+            hits = hits[max(page_start, 0):page_start + page_limit]
+        features = [read_feature(row_id) for _, row_id in hits]
+        next_cursor = None
+        if cursor_params and hits and page_start + len(hits) < fcount:
+            next_cursor = encode_cursor(cursor_params[0], cursor_params[1], cursor_params[2],
+                                        [hits[-1][0]], page_start + len(hits), fcount)
         if self.debug:
             print(("    (time=" + str(time.time() - t1) + ")"))
         return {"num_found": fcount, "page_start": page_start, 
                 "features": features, "query_contig_id": query_contig_id, 
                 "query_region_start": query_region_start, 
-                "query_region_length": query_region_length}
+                "query_region_length": query_region_length,
+                "cursor": next_cursor}
 
     def intersect(self, region1, region2):
         return max(region1[0], region2[0]) <= min(region1[1], region2[1])
@@ -428,7 +900,7 @@ class GenomeSearchUtilIndexer:
         loc_max = start if not fwd else (start + length - 1)
         return [loc_min, loc_max]
 
-    def search_contigs(self, token, ref, query, sort_by, start, limit, num_found):
+    def search_contigs(self, token, ref, query, sort_by, start, limit, num_found, cursor=None):
         if query is None:
             query = ""
         if start is None:
@@ -441,111 +913,132 @@ class GenomeSearchUtilIndexer:
                   sort_by) + "], start=" + str(start) + ", limit=" + str(limit)))
         t1 = time.time()
         inner_chsum = self.check_contig_cache(ref, token)
-        index_iter = self.get_contig_sorted_iterator(inner_chsum, sort_by)
-        ret = self.filter_contig_query(index_iter, query, start, limit, num_found)
+        table = self.get_contig_table(inner_chsum)
+        cursor_params = [inner_chsum, self.get_sorting_code(self.contig_column_props_map,
+                                                            sort_by),
+                         get_query_hash(query)]
+        count_key = get_count_key(inner_chsum, "ctg", self.parse_query_words(query))
+        if num_found is None and not cursor:
+            num_found = self.count_cache.get(count_key)
+        if cursor:
+            sort_key, start, num_found = decode_cursor(cursor, *cursor_params)
+            order = self.get_rows_after(inner_chsum, sort_by, sort_key, "ctg",
+                                        self.contig_column_props_map)
+            ret, page = self.filter_contig_query(table, order, query, 0, limit, num_found)
+            ret["start"] = start
+            ret["num_found"] = num_found
+        else:
+            order = self.get_contig_sorted_rows(inner_chsum, sort_by)
+            ret, page = self.filter_contig_query(table, order, query, start, limit, num_found)
+        if num_found is None:
+            self.count_cache.put(count_key, ret["num_found"])
+        ret["cursor"] = self.get_next_cursor(
+            self.get_index(inner_chsum, "ctg_sort.bin", SortIndex), sort_by, page,
+            ret["start"], ret["num_found"], cursor_params)
         if self.debug:
             print(("    (overall-time=" + str(time.time() - t1) + ")"))
         return ret
 
     def check_contig_cache(self, gref, token):
-        ws_client = Workspace(self.ws_url, token=token)
-        info = ws_client.get_object_info_new({"objects": [{"ref": gref}]})[0]
-        inner_chsum = info[8]
-        index_file = os.path.join(self.genome_index_dir, inner_chsum + "_ctg.tsv.gz")
-        if not os.path.isfile(index_file):
-            t1 = time.time()
+        inner_chsum = self.get_inner_chsum(gref, token)
+        self.build_tsv_once(inner_chsum, "ctg",
+                            lambda: self.build_contig_tsv(gref, token, inner_chsum))
+        self.check_table_indexes(inner_chsum, "ctg", self.contig_column_props_map)
+        return inner_chsum
 
-            genome = self.get_one_genome({"objects": [{"ref": gref, "included":
-                                                      ["/contigset_ref", "/assembly_ref"]}]}, token)
-            ctg_ref = None
-            ctg_incl = None
-            if "contigset_ref" in genome:
-                if self.debug:
-                    print("    Loading contigs from ContigSet...")
-                ctg_ref = genome["contigset_ref"]
-                ctg_incl = ["/contigs/[*]/id", "/contigs/[*]/length"]
-            elif "assembly_ref" in genome:
-                if self.debug:
-                    print("    Loading contigs from Assembly...")
-                ctg_ref = genome["assembly_ref"]
-                ctg_incl = ["/contigs/*/length"]
-            # We allow now Genome objects without contigs. Just skip errors.
-            contigs = {}
-            if ctg_ref:
-                assembly = ws_client.get_objects2({"objects": [{"included": ctg_incl,
-                        "ref": gref, "obj_ref_path": [ctg_ref]}]})["data"][0]["data"]
-                if "contigset_ref" in genome:
-                    for ctg in assembly["contigs"]:
-                        contigs[ctg["id"]] = [ctg["length"], 0]
-                else:
-                    for ctg_id in assembly["contigs"]:
-                        contigs[ctg_id] = [assembly["contigs"][ctg_id]["length"], 0]
-                if self.debug:
-                    print(("    (time=" + str(time.time() - t1) + ")"))
-            inner_chsum = self.check_feature_cache(gref, token)
-            # Reading features without sorting and grouping by contig_id
-            index_iter = self.get_feature_sorted_iterator(inner_chsum, None)
+    def build_contig_tsv(self, gref, token, inner_chsum):
+        t1 = time.time()
+        ws_client = self.client_factory.get_client(Workspace, self.ws_url, token)
+
+        genome = self.get_one_genome({"objects": [{"ref": gref, "included":
+                                                  ["/contigset_ref", "/assembly_ref"]}]}, token)
+        ctg_ref = None
+        ctg_incl = None
+        if "contigset_ref" in genome:
             if self.debug:
-                print("    Grouping features...")
-            t1 = time.time()
-            with index_iter:
-                for line in index_iter:
-                    items = line.rstrip('\n').split('\t')
-                    contig_id = items[3]
-                    if not contig_id:
-                        continue
-                    values = None
-                    if contig_id in contigs:
-                        values = contigs[contig_id]
-                    else:
-                        raise ValueError("Contig id=" + contig_id + " is not found")
-                    values[1] += 1
-            self.save_contig_tsv(contigs, inner_chsum)
+                print("    Loading contigs from ContigSet...")
+            ctg_ref = genome["contigset_ref"]
+            ctg_incl = ["/contigs/[*]/id", "/contigs/[*]/length"]
+        elif "assembly_ref" in genome:
+            if self.debug:
+                print("    Loading contigs from Assembly...")
+            ctg_ref = genome["assembly_ref"]
+            ctg_incl = ["/contigs/*/length"]
+        # We allow now Genome objects without contigs. Just skip errors.
+        contigs = {}
+        if ctg_ref:
+            assembly = ws_client.get_objects2({"objects": [{"included": ctg_incl,
+                    "ref": gref, "obj_ref_path": [ctg_ref]}]})["data"][0]["data"]
+            if "contigset_ref" in genome:
+                for ctg in assembly["contigs"]:
+                    contigs[ctg["id"]] = [ctg["length"], 0]
+            else:
+                for ctg_id in assembly["contigs"]:
+                    contigs[ctg_id] = [assembly["contigs"][ctg_id]["length"], 0]
             if self.debug:
                 print(("    (time=" + str(time.time() - t1) + ")"))
-        return inner_chsum
+        inner_chsum = self.check_feature_cache(gref, token)
+        # Reading contig column of features and grouping by contig_id
+        feature_table = self.get_feature_table(inner_chsum)
+        contig_ids = feature_table.get_column("contig_id")
+        if self.debug:
+            print("    Grouping features...")
+        t1 = time.time()
+        for row_id in range(feature_table.row_count):
+            contig_id = contig_ids.get(row_id)
+            if not contig_id:
+                continue
+            values = None
+            if contig_id in contigs:
+                values = contigs[contig_id]
+            else:
+                raise ValueError("Contig id=" + contig_id + " is not found")
+            values[1] += 1
+        self.save_contig_tsv(contigs, inner_chsum)
+        if self.debug:
+            print(("    (time=" + str(time.time() - t1) + ")"))
 
     def save_contig_tsv(self, contigs, inner_chsum):
         # contigs is a map having structure like: 
         # {<contig-id>: [<length>, <feature-count>]}
-        outfile = tempfile.NamedTemporaryFile(dir = self.genome_index_dir,
-                prefix = inner_chsum + "_ctg_", suffix = ".tsv", delete=False, mode='w')
-        with outfile:
+        def write_rows(outfile):
             for contig_id in contigs:
                 values = contigs[contig_id]
                 outfile.write("\t".join(x for x in [contig_id, str(values[0]),
                                                     str(values[1])]) + "\n")
-        subprocess.Popen(["gzip", outfile.name],
-                         stdout=subprocess.PIPE, stderr=subprocess.PIPE).wait()
-        os.rename(outfile.name + ".gz", os.path.join(self.genome_index_dir, 
-                                                     inner_chsum + "_ctg.tsv.gz"))
+        self.save_tsv(inner_chsum, "ctg", write_rows)
 
-    def get_contig_sorted_iterator(self, inner_chsum, sort_by):
-        return self.get_sorted_iterator(inner_chsum, sort_by, "ctg", 
-                                        self.contig_column_props_map)
+    def get_contig_table(self, inner_chsum):
+        return self.get_index(inner_chsum, "ctg_col.bin", ColumnarIndex)
 
-    def filter_contig_query(self, index_iter, query, start, limit, num_found):
-        query_words = str(query).lower().translate(
-                str.maketrans("\r\n\t,", "    ")).split()
+    def get_contig_sorted_rows(self, inner_chsum, sort_by):
+        return self.get_sorted_rows(inner_chsum, sort_by, "ctg",
+                                    self.contig_column_props_map)
+
+    def filter_contig_query(self, table, order, query, start, limit, num_found):
+        # Returns result and row ids of the page
+        query_words = self.parse_query_words(query)
         if self.debug:
                 print("    Filtering...")
         t1 = time.time()
         fcount = 0
         contigs = []
-        with index_iter:
-            for line in index_iter:
-                if all(word in line.lower() for word in query_words):
-                    if fcount >= start and fcount < start + limit:
-                        contigs.append(self.unpack_contig(line.rstrip('\n')))
-                    fcount += 1
-                    if num_found is not None and fcount >= start + limit:
-                        # Having shortcut when real num_found was already known
-                        fcount = num_found
-                        break
+        page = []
+        for row_id in order:
+            line = table.get_line(row_id)
+            if all(word in line.lower() for word in query_words):
+                if fcount >= start and fcount < start + limit:
+                    contigs.append(self.unpack_contig(line))
+                    page.append(row_id)
+                fcount += 1
+                if num_found is not None and fcount >= start + limit:
+                    # Having shortcut when real num_found was already known
+                    fcount = num_found
+                    break
         if self.debug:
                 print(("    (time=" + str(time.time() - t1) + ")"))
         return {"num_found": fcount, "start": start, "contigs": contigs,
-                "query": query}
+                "query": query}, page
 
     def unpack_contig(self, line, items = None):
         try:
@@ -561,17 +1054,26 @@ class GenomeSearchUtilIndexer:
                              "Cause: " + traceback.format_exc())
 
     def get_contig(self, token, ref, contig_id):
+        return self.get_contigs(token, ref, [contig_id])[0]
+
+    def get_contigs(self, token, ref, contig_ids):
+        # Returns list of contigs (None for unknown ones) in order of ids
         t1 = time.time()
         inner_chsum = self.check_contig_cache(ref, token)
-        ret = None
-        with self.get_contig_sorted_iterator(inner_chsum, None) as index_iter:
-            if self.debug:
-                print(("    Looking for contig id=" + contig_id + ", genome=" + ref))
-            for line in index_iter:
-                contig = self.unpack_contig(line.rstrip('\n'))
-                if contig["contig_id"] == contig_id:
-                    ret = contig
-                    break
+        table = self.get_contig_table(inner_chsum)
+        if self.debug:
+            print(("    Looking for contig ids=" + str(contig_ids) + ", genome=" + ref))
+        ret = [self.find_contig(table, contig_id) for contig_id in contig_ids]
         if self.debug:
             print(("    (time=" + str(time.time() - t1) + ")"))
         return ret
+
+    def find_contig(self, table, contig_id):
+        # Contig ids are unique, so binary search in sorted dictionary of
+        # contig_id column and then in rows sorted by this column gives the row
+        contig_ids = table.get_column("contig_id")
+        code = contig_ids.find_code(contig_id)
+        if code is None:
+            return None
+        rows = contig_ids.find_rows(range(code, code + 1))
+        return self.unpack_contig(table.get_line(rows[0])) if len(rows) else None
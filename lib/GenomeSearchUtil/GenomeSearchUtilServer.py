@@ -16,7 +16,8 @@ from biokbase import log
 import requests as _requests
 import random as _random
 import os
-from GenomeSearchUtil.authclient import KBaseAuth as _KBaseAuth
+from GenomeSearchUtil.JsonSerializer import get_serializer
+from GenomeSearchUtil.ResponseCompressor import ResponseCompressor
 
 DEPLOY = 'KB_DEPLOYMENT_CONFIG'
 SERVICE = 'KB_SERVICE_NAME'
@@ -63,6 +64,9 @@ class JSONObjectEncoder(json.JSONEncoder):
 
 class JSONRPCServiceCustom(JSONRPCService):
 
+    # Serializer of results (see JsonSerializer), set by Application
+    serializer = None
+
     def call(self, ctx, jsondata):
         """
         Calls jsonrpc service's method and returns its return value in a JSON
@@ -71,8 +75,14 @@ class JSONRPCServiceCustom(JSONRPCService):
         Arguments:
         jsondata -- remote method call in jsonrpc format
         """
+        if self.serializer is not None:
+            # Results may contain JSON fragments which serializer splices
+            # into response as is
+            ctx['json_fragments'] = 1
         result = self.call_py(ctx, jsondata)
         if result is not None:
+            if self.serializer is not None:
+                return self.serializer.dumps(result)
             return json.dumps(result, cls=JSONObjectEncoder)
 
         return None
@@ -332,6 +342,12 @@ class Application(object):
             call_id=True, logfile=self.userlog.get_log_file())
         self.serverlog.set_log_level(6)
         self.rpc_service = JSONRPCServiceCustom()
+        self.rpc_service.serializer = get_serializer(
+            config.get("json-serializer", "auto") if config else "auto")
+        # Responses are compressed by coding accepted by client
+        self.compressor = ResponseCompressor(
+            int(config.get("response-compression-min-size", "1024")) if config else 1024,
+            int(config.get("response-compression-level", "6")) if config else 6)
         self.method_authentication = dict()
         self.rpc_service.add(impl_GenomeSearchUtil.search,
                              name='GenomeSearchUtil.search',
@@ -345,11 +361,19 @@ class Application(object):
                              name='GenomeSearchUtil.search_contigs',
                              types=[dict])
         self.method_authentication['GenomeSearchUtil.search_contigs'] = 'optional'  # noqa
+        self.rpc_service.add(impl_GenomeSearchUtil.search_multi,
+                             name='GenomeSearchUtil.search_multi',
+                             types=[dict])
+        self.method_authentication['GenomeSearchUtil.search_multi'] = 'optional'  # noqa
+        self.rpc_service.add(impl_GenomeSearchUtil.get_features,
+                             name='GenomeSearchUtil.get_features',
+                             types=[dict])
+        self.method_authentication['GenomeSearchUtil.get_features'] = 'optional'  # noqa
         self.rpc_service.add(impl_GenomeSearchUtil.status,
                              name='GenomeSearchUtil.status',
                              types=[dict])
-        authurl = config.get(AUTH) if config else None
-        self.auth_client = _KBaseAuth(authurl)
+        # Token validations are cached by implementation (see its status)
+        self.auth_client = impl_GenomeSearchUtil.token_cache
 
     def __call__(self, environ, start_response):
         # Context object, equivalent to the perl impl CallContext
@@ -452,7 +476,12 @@ class Application(object):
         if rpc_result:
             response_body = rpc_result
         else:
-            response_body = ''
+            response_body = b''
+        if isinstance(response_body, str):
+            # Errors are still serialized to str
+            response_body = response_body.encode('utf-8')
+        response_body, encoding = self.compressor.compress(
+            response_body, environ.get('HTTP_ACCEPT_ENCODING'))
 
         response_headers = [
             ('Access-Control-Allow-Origin', '*'),
@@ -460,6 +489,11 @@ class Application(object):
                 'HTTP_ACCESS_CONTROL_REQUEST_HEADERS', 'authorization')),
             ('content-type', 'application/json'),
             ('content-length', str(len(response_body)))]
+        if self.compressor.level:
+            # Body depends on Accept-Encoding of request
+            response_headers.append(('Vary', 'Accept-Encoding'))
+        if encoding is not None:
+            response_headers.append(('Content-Encoding', encoding))
         start_response(status, response_headers)
         return [response_body]
 
@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+import threading
+from collections import OrderedDict
+
+# Memory bounded LRU cache of opened (query-ready) genome indexes shared by
+# all requests of server process. Every entry has size in bytes (size of
+# memory mapped index file plus estimated size of Python objects kept by the
+# index in heap of process), least recently used entries are evicted when
+# total size exceeds max_bytes. Entry larger than max_bytes is not cached.
+
+
+class IndexCache:
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()  # key -> (value, size)
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.evicted_bytes = 0
+
+    def get(self, key, load_func):
+        """Returns cached value for key or calls load_func() which should
+        return (value, size in bytes) and caches the value."""
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+        value, size = load_func()
+        with self.lock:
+            if key in self.entries:
+                # Loaded by other thread in the meantime
+                return self.entries[key][0]
+            if size <= self.max_bytes:
+                self.entries[key] = (value, size)
+                self.total_bytes += size
+                while self.total_bytes > self.max_bytes:
+                    _, (_, evicted_size) = self.entries.popitem(last=False)
+                    self.total_bytes -= evicted_size
+                    self.evictions += 1
+                    self.evicted_bytes += evicted_size
+        return value
+
+    def get_stats(self):
+        with self.lock:
+            return {"entries": len(self.entries), "total_bytes": self.total_bytes,
+                    "max_bytes": self.max_bytes, "hits": self.hits,
+                    "misses": self.misses, "evictions": self.evictions,
+                    "evicted_bytes": self.evicted_bytes}
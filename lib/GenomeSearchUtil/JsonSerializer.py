@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+import json
+import os
+import re
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Serializers of JSON-RPC responses writing UTF-8 bytes directly (so that
+# content length is length of the bytes). Fast serializer (orjson) is used
+# when it's installed, standard json module otherwise. Both serialize sets
+# and frozensets as lists and objects having toJSONable method as the value
+# returned by this method (the same way as JSONObjectEncoder of the server).
+# Values already serialized to JSON (JsonFragment, like features prepared at
+# index build time) are written as placeholder strings having random marker
+# first and then placeholders are replaced by bytes of fragments, so that
+# fragments are neither parsed nor encoded again.
+
+
+def json_default(obj):
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    if hasattr(obj, 'toJSONable'):
+        return obj.toJSONable()
+    raise TypeError("Object of type " + type(obj).__name__ + " is not JSON serializable")
+
+
+class JsonFragment:
+    # Value already serialized to JSON (UTF-8 bytes). It's parsed back by
+    # encoders not supporting fragments (like JSONObjectEncoder of server).
+    __slots__ = ("data",)
+
+    def __init__(self, data):
+        self.data = data
+
+    def toJSONable(self):
+        return json.loads(self.data.decode("utf-8"))
+
+
+class _FragmentCollector:
+
+    def __init__(self):
+        self.marker = "__json_fragment_" + os.urandom(8).hex() + "_"
+        self.fragments = []
+
+    def default(self, obj):
+        if isinstance(obj, JsonFragment):
+            self.fragments.append(obj.data)
+            return self.marker + str(len(self.fragments) - 1)
+        return json_default(obj)
+
+    def splice(self, data):
+        if not self.fragments:
+            return data
+        pattern = re.compile(b'"' + self.marker.encode("utf-8") + b'([0-9]+)"')
+        return pattern.sub(lambda m: self.fragments[int(m.group(1))], data)
+
+
+class StdJsonSerializer:
+    name = "json"
+
+    def dumps(self, obj):
+        collector = _FragmentCollector()
+        return collector.splice(json.dumps(obj, default=collector.default).encode("utf-8"))
+
+
+class OrjsonSerializer:
+    name = "orjson"
+
+    def __init__(self):
+        # Keys which aren't strings are converted the same way as by json
+        self.option = orjson.OPT_NON_STR_KEYS
+        self.fallback = StdJsonSerializer()
+
+    def dumps(self, obj):
+        collector = _FragmentCollector()
+        try:
+            return collector.splice(orjson.dumps(obj, default=collector.default,
+                                                 option=self.option))
+        except orjson.JSONEncodeError:
+            # Values orjson doesn't support (like integers exceeding 64 bits)
+            return self.fallback.dumps(obj)
+
+
+def get_serializer(name="auto"):
+    """Returns serializer by name: orjson, json or auto (orjson if it's
+    installed)."""
+    if name == "auto":
+        name = "json" if orjson is None else "orjson"
+    if name == "orjson":
+        if orjson is None:
+            raise ValueError("Serializer orjson requires orjson package to be installed")
+        return OrjsonSerializer()
+    if name == "json":
+        return StdJsonSerializer()
+    raise ValueError("Unknown serializer '" + str(name) + "', please use one of auto, " +
+                     "orjson, json")
@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+import json
+
+# Incremental reader of large JSON documents (like genome objects saved into
+# file by WsLargeDataIO). Objects and arrays can be walked key by key and item
+# by item while every visited value is decoded separately, so only one item
+# (plus read-ahead buffer) is kept in memory at a time. Text is read from file
+# by chunks, buffer grows only when single value doesn't fit in it.
+# Skipped values are still parsed (and validated) by C decoder, but objects
+# found in them are dropped instead of being built as dicts.
+_WHITESPACE = " \t\n\r"
+
+
+def _drop_object(pairs):
+    return None
+
+
+class JsonStreamReader:
+
+    def __init__(self, source, chunk_size=1 << 16):
+        self.source = source
+        self.chunk_size = chunk_size
+        self.decoder = json.JSONDecoder()
+        self.skip_decoder = json.JSONDecoder(object_pairs_hook=_drop_object)
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+
+    def _read_more(self):
+        chunk = self.source.read(max(self.chunk_size, len(self.buf) - self.pos))
+        if not chunk:
+            self.eof = True
+        self.buf = self.buf[self.pos:] + chunk
+        self.pos = 0
+
+    def peek(self):
+        """Skips whitespace and returns next char ("" at the end of input),
+        it allows to check type of next value."""
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if self.eof:
+                return ""
+            self._read_more()
+
+    def _expect(self, chars):
+        char = self.peek()
+        if not char or char not in chars:
+            raise ValueError("JSON parse error: expected one of '" + chars +
+                             "' but found '" + char + "' at offset " + str(self.pos))
+        self.pos += 1
+        return char
+
+    def read_value(self):
+        """Decodes and returns next value."""
+        return self._decode(self.decoder)
+
+    def _decode(self, decoder):
+        self.peek()
+        while True:
+            try:
+                value, end = decoder.raw_decode(self.buf, self.pos)
+                # Numbers could be cut by the end of buffer, so value is
+                # accepted only when something follows it
+                if end < len(self.buf) or self.eof:
+                    self.pos = end
+                    return value
+            except ValueError:
+                if self.eof:
+                    raise
+            self._read_more()
+
+    def skip_value(self):
+        """Skips next value keeping only one item of array (or value of
+        object) in memory at a time."""
+        char = self.peek()
+        if char == "[":
+            # items are parsed one by one and dropped
+            for _ in self.iter_array(decode_items=False):
+                self._decode(self.skip_decoder)
+        elif char == "{":
+            for _ in self.iter_object():
+                self._decode(self.skip_decoder)
+        else:
+            self._decode(self.skip_decoder)
+
+    def iter_object(self):
+        """Iterates over keys of next object. Value of every key should be
+        consumed (by read_value, skip_value, iter_array or iter_object) before
+        next key is requested."""
+        self._expect("{")
+        if self.peek() == "}":
+            self.pos += 1
+            return
+        while True:
+            key = self.read_value()
+            if not isinstance(key, str):
+                raise ValueError("JSON parse error: object key expected at offset " +
+                                 str(self.pos))
+            self._expect(":")
+            yield key
+            if self._expect(",}") == "}":
+                return
+
+    def iter_array(self, decode_items=True):
+        """Iterates over decoded items of next array. With decode_items=False
+        None is yielded instead of every item and item should be consumed by
+        caller (the same way as values in iter_object)."""
+        self._expect("[")
+        if self.peek() == "]":
+            self.pos += 1
+            return
+        while True:
+            yield self.read_value() if decode_items else None
+            if self._expect(",]") == "]":
+                return
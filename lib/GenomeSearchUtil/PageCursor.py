@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+import base64
+import binascii
+import hashlib
+import json
+
+# Opaque cursors of search pages. Cursor keeps checksum of indexed genome,
+# sorting code, hash of query parameters, sort key of last returned row
+# (position of row in sorted index), offset of next page and num_found. Next
+# page is then selected by seeking right after that key in sorted index
+# instead of skipping and filtering all rows before the page. Cursor is
+# encoded as URL-safe base64 of compact JSON without padding.
+CURSOR_VERSION = 1
+
+
+def get_query_hash(*params):
+    """Returns hash of query parameters (anything serializable to JSON)."""
+    text = json.dumps(params, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+def encode_cursor(inner_chsum, sort_code, query_hash, sort_key, start, num_found):
+    state = {"v": CURSOR_VERSION, "c": inner_chsum, "s": sort_code, "q": query_hash,
+             "k": list(sort_key), "o": start, "n": num_found}
+    text = json.dumps(state, separators=(",", ":"))
+    return base64.urlsafe_b64encode(text.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def _is_int(value):
+    return isinstance(value, int) and not isinstance(value, bool) and value >= 0
+
+
+def decode_cursor(cursor, inner_chsum, sort_code, query_hash):
+    """Returns (sort key, start, num_found) stored in cursor. ValueError is
+    raised if cursor can't be parsed or if it was issued for other version
+    of genome, other sorting or other query."""
+    try:
+        text = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        state = json.loads(text.decode("utf-8"))
+    except (TypeError, ValueError, binascii.Error):
+        raise ValueError("Invalid cursor: " + str(cursor))
+    if not isinstance(state, dict) or state.get("v") != CURSOR_VERSION or \
+            not isinstance(state.get("k"), list) or \
+            not all(_is_int(x) for x in state["k"] + [state.get("o"), state.get("n")]):
+        raise ValueError("Invalid cursor: " + str(cursor))
+    if state.get("c") != inner_chsum:
+        raise ValueError("Cursor was issued for other version of genome, please start "
+                         "from the first page")
+    if state.get("s") != sort_code or state.get("q") != query_hash:
+        raise ValueError("Cursor was issued for other query or sorting, please start "
+                         "from the first page")
+    return tuple(state["k"]), state["o"], state["n"]
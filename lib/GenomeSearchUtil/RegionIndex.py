@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+from array import array
+
+from GenomeSearchUtil.ArrayBundle import ArrayBundle, write_array_bundle
+
+# Interval index of feature regions. Intervals of every contig are sorted by
+# region start and kept as implicit augmented interval tree (the layout used by
+# cgranges library): node at position i has level equal to number of trailing
+# 1-bits of i and "max_ends" keeps max region end over the subtree of a node.
+# Overlap query costs O(log n + number of hits). Every interval also keeps
+# position of the row in results order so hits can be returned in this order.
+# Regions are closed intervals [min, max].
+
+
+def _index_tree(maxs, max_ends, begin, end):
+    # Port of cr_index_core from cgranges, returns level of root node
+    n = end - begin
+    if n == 0:
+        return -1
+    last_i = 0
+    last = 0
+    for i in range(0, n, 2):
+        last_i = i
+        last = max_ends[begin + i] = maxs[begin + i]
+    k = 1
+    while (1 << k) <= n:
+        x = 1 << (k - 1)
+        for i in range((x << 1) - 1, n, x << 2):
+            el = max_ends[begin + i - x]
+            er = max_ends[begin + i + x] if i + x < n else last
+            max_ends[begin + i] = max(maxs[begin + i], el, er)
+        last_i = last_i - x if (last_i >> k) & 1 else last_i + x
+        if last_i < n and max_ends[begin + last_i] > last:
+            last = max_ends[begin + last_i]
+        k += 1
+    return k - 1
+
+
+def build_region_index(intervals, contig_count, index_file):
+    """Build index from iterable of (contig code, region min, region max,
+    row id) tuples listed in results order and save it to index_file."""
+    per_contig = [[] for _ in range(contig_count)]
+    for pos, (contig_code, region_min, region_max, row_id) in enumerate(intervals):
+        per_contig[contig_code].append((region_min, region_max, pos, row_id))
+    contig_offsets = array('Q', [0])
+    contig_levels = array('i')
+    mins = array('q')
+    maxs = array('q')
+    positions = array('I')
+    row_ids = array('I')
+    for items in per_contig:
+        items.sort()
+        for region_min, region_max, pos, row_id in items:
+            mins.append(region_min)
+            maxs.append(region_max)
+            positions.append(pos)
+            row_ids.append(row_id)
+        contig_offsets.append(len(mins))
+    max_ends = array('q', maxs)
+    for contig_code in range(contig_count):
+        contig_levels.append(_index_tree(maxs, max_ends,
+                                         contig_offsets[contig_code],
+                                         contig_offsets[contig_code + 1]))
+    write_array_bundle(index_file, {"contig_offsets": contig_offsets,
+                                    "contig_levels": contig_levels, "mins": mins,
+                                    "maxs": maxs, "max_ends": max_ends,
+                                    "positions": positions, "row_ids": row_ids},
+                       {"contig_count": contig_count})
+
+
+class RegionIndex:
+
+    def __init__(self, index_file):
+        self.bundle = ArrayBundle(index_file)
+        self.contig_count = self.bundle.meta["contig_count"]
+        self.contig_offsets = self.bundle.get("contig_offsets")
+        self.contig_levels = self.bundle.get("contig_levels")
+        self.mins = self.bundle.get("mins")
+        self.maxs = self.bundle.get("maxs")
+        self.max_ends = self.bundle.get("max_ends")
+        self.positions = self.bundle.get("positions")
+        self.row_ids = self.bundle.get("row_ids")
+
+    def find_rows(self, contig_code, region_min, region_max):
+        """Returns row ids (in results order) of intervals of given contig
+        overlapping with region [region_min, region_max]."""
+        hits = self._find_hits(contig_code, region_min, region_max)
+        hits.sort(key=self.positions.__getitem__)
+        return [self.row_ids[i] for i in hits]
+
+    def find_positioned_rows(self, contig_code, region_min, region_max, after_position=None):
+        """Returns (position in results order, row id) pairs sorted by position
+        the same way as find_rows, optionally only ones after given position."""
+        positions = self.positions
+        hits = [(positions[i], self.row_ids[i])
+                for i in self._find_hits(contig_code, region_min, region_max)]
+        if after_position is not None:
+            hits = [x for x in hits if x[0] > after_position]
+        hits.sort()
+        return hits
+
+    def _find_hits(self, contig_code, region_min, region_max):
+        if contig_code is None or region_min > region_max:
+            return []
+        begin = self.contig_offsets[contig_code]
+        n = self.contig_offsets[contig_code + 1] - begin
+        mins = self.mins
+        maxs = self.maxs
+        max_ends = self.max_ends
+        hits = []
+        # Port of cr_overlap from cgranges (top-down traversal with stack)
+        root_level = self.contig_levels[contig_code]
+        stack = [(root_level, (1 << root_level) - 1, False)] if n else []
+        while stack:
+            k, x, left_done = stack.pop()
+            if k <= 3:
+                # small subtree, checking every node
+                i0 = x >> k << k
+                i1 = min(i0 + (1 << (k + 1)) - 1, n)
+                for i in range(begin + i0, begin + i1):
+                    if mins[i] > region_max:
+                        break
+                    if region_min <= maxs[i]:
+                        hits.append(i)
+            elif not left_done:
+                y = x - (1 << (k - 1))
+                stack.append((k, x, True))
+                if y >= n or max_ends[begin + y] >= region_min:
+                    stack.append((k - 1, y, False))
+            elif x < n and mins[begin + x] <= region_max:
+                if region_min <= maxs[begin + x]:
+                    hits.append(begin + x)
+                stack.append((k - 1, x + (1 << (k - 1)), False))
+        return hits
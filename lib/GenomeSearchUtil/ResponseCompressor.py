@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+import zlib
+
+# In-process compression of JSON-RPC responses negotiated by Accept-Encoding
+# header of request. Gzip is preferred to deflate (zlib format as defined by
+# HTTP) when client accepts both with the same quality. Responses smaller
+# than min_size are sent as is (compression wouldn't pay off for them), level
+# is zlib compression level (1 is fastest, 9 is smallest) where 0 disables
+# compression at all.
+ENCODINGS = ["gzip", "deflate"]
+# Window bits of zlib producing gzip and zlib (deflate) formats
+WBITS = {"gzip": 16 + zlib.MAX_WBITS, "deflate": zlib.MAX_WBITS}
+
+
+def parse_accept_encoding(header):
+    """Returns mapping from content coding (lower case) to its quality."""
+    qualities = {}
+    for item in (header or "").split(","):
+        parts = item.split(";")
+        coding = parts[0].strip().lower()
+        if not coding:
+            continue
+        quality = 1.0
+        for param in parts[1:]:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value.strip())
+                except ValueError:
+                    quality = 0.0
+        qualities[coding] = quality
+    return qualities
+
+
+class ResponseCompressor:
+
+    def __init__(self, min_size=1024, level=6):
+        if not 0 <= level <= 9:
+            raise ValueError("Compression level should be in range 0..9, not " +
+                             str(level))
+        self.min_size = min_size
+        self.level = level
+
+    def get_encoding(self, accept_encoding):
+        """Returns content coding (gzip or deflate) accepted by client or
+        None if response should be sent uncompressed."""
+        qualities = parse_accept_encoding(accept_encoding)
+        best = None
+        best_quality = 0.0
+        for encoding in ENCODINGS:
+            quality = qualities.get(encoding, qualities.get("*", 0.0))
+            if quality > best_quality:
+                best = encoding
+                best_quality = quality
+        return best
+
+    def compress(self, body, accept_encoding):
+        """Returns response body (bytes) compressed by coding accepted by
+        client and this coding (None when body is returned as is)."""
+        if self.level == 0 or len(body) < self.min_size:
+            return body, None
+        encoding = self.get_encoding(accept_encoding)
+        if encoding is None:
+            return body, None
+        compressor = zlib.compressobj(self.level, zlib.DEFLATED, WBITS[encoding])
+        return compressor.compress(body) + compressor.flush(), encoding
@@ -0,0 +1,215 @@
+# -*- coding: utf-8 -*-
+import heapq
+import re
+import string
+from array import array
+
+from GenomeSearchUtil.ArrayBundle import ArrayBundle, write_array_bundle
+
+# Precomputed row orders reproducing "sort -f -t\t -kN,N[n][r] ..." (C locale)
+# for every sortable column. For each column we keep rank of every row (rows
+# having equal sort keys share the same rank) and we keep one permutation of
+# rows ordered by whole line, which is the last resort comparison of "sort".
+# Any combination of sort columns is then a sequence of stable sorts of row
+# ids by column ranks. Note that "sort" doesn't apply global -f to keys having
+# their own options (like -k2,2r) so descending text columns are compared
+# without case folding and have separate ranks. For single column orders we
+# also keep position of every row so that top rows of a page could be selected
+# from matching rows with a bounded heap, and the order itself so that next
+# page of cursor pagination could start right after position of last row.
+_FOLD_CASE = str.maketrans(string.ascii_lowercase, string.ascii_uppercase)
+_NUMBER = re.compile(r'\s*(-?\d*(?:\.\d*)?)')
+
+
+def numeric_sort_key(value):
+    """Key of "sort -n": leading number of the string or 0 if there is none."""
+    try:
+        return float(_NUMBER.match(value).group(1))
+    except ValueError:
+        return 0.0
+
+
+def text_sort_key(value):
+    """Key of "sort -f": string with ASCII lower case folded to upper case."""
+    return value.translate(_FOLD_CASE)
+
+
+def get_sort_key_func(col_props, ascending=True):
+    if col_props["type"] == "n":
+        return numeric_sort_key
+    return text_sort_key if ascending else str
+
+
+def _get_ranks(keys):
+    ranks = array('I', bytes(4 * len(keys)))
+    rank = -1
+    prev_key = None
+    for row_id in sorted(range(len(keys)), key=keys.__getitem__):
+        key = keys[row_id]
+        if rank < 0 or key != prev_key:
+            rank += 1
+            prev_key = key
+        ranks[row_id] = rank
+    return ranks
+
+
+def _get_row_ranks(value_ranks, code_values):
+    # Ranks of rows by ranks of their distinct values
+    return array('I', (value_ranks[code] for code in code_values))
+
+
+def _get_positions(line_order, ranks, ascending):
+    # Order of rows by one column (ties by whole line) and position of every
+    # row in this order
+    order = list(line_order)
+    order.sort(key=ranks.__getitem__, reverse=not ascending)
+    positions = array('I', bytes(4 * len(order)))
+    for pos, row_id in enumerate(order):
+        positions[row_id] = pos
+    return array('I', order), positions
+
+
+def _bisect_after(order, sort_key, key_func):
+    # Index of first row in order having key greater than sort_key
+    low, high = 0, len(order)
+    while low < high:
+        mid = (low + high) // 2
+        if key_func(order[mid]) <= sort_key:
+            low = mid + 1
+        else:
+            high = mid
+    return low
+
+
+class SortIndexBuilder:
+    # Lines are added one by one (so that other indexes could be built in the
+    # same pass over TSV file), values of columns are kept as codes of
+    # distinct values (ranks are computed for distinct values only)
+
+    def __init__(self, column_props_map):
+        self.column_props_map = column_props_map
+        self.columns = [(col_name, column_props_map[col_name]["col"] - 1, {}, array('I'))
+                        for col_name in column_props_map]
+        self.lines = []
+
+    def add_line(self, line):
+        line = line.rstrip('\n')
+        self.lines.append(line)
+        items = line.split('\t')
+        for _, col_pos, codes, code_values in self.columns:
+            value = items[col_pos] if col_pos < len(items) else ""
+            code = codes.get(value)
+            if code is None:
+                code = len(codes)
+                codes[value] = code
+            code_values.append(code)
+
+    def save(self, index_file):
+        lines = self.lines
+        line_order = array('I', sorted(range(len(lines)), key=lines.__getitem__))
+        self.lines = lines = None
+        line_ranks = array('I', bytes(4 * len(line_order)))
+        for rank, row_id in enumerate(line_order):
+            line_ranks[row_id] = rank
+        arrays = {"line_order": line_order, "line_ranks": line_ranks}
+        for col_name, _, codes, code_values in self.columns:
+            col_props = self.column_props_map[col_name]
+            # Distinct values in order of codes
+            values = list(codes)
+            key_func = get_sort_key_func(col_props)
+            ranks = _get_row_ranks(_get_ranks([key_func(x) for x in values]), code_values)
+            arrays["rank_" + col_name] = ranks
+            arrays["order_" + col_name], arrays["pos_" + col_name] = \
+                _get_positions(line_order, ranks, True)
+            if col_props["type"] != "n":
+                key_func = get_sort_key_func(col_props, False)
+                ranks = _get_row_ranks(_get_ranks([key_func(x) for x in values]),
+                                       code_values)
+                arrays["rank_" + col_name + "_d"] = ranks
+            arrays["order_" + col_name + "_d"], arrays["pos_" + col_name + "_d"] = \
+                _get_positions(line_order, ranks, False)
+        write_array_bundle(index_file, arrays, {"row_count": len(line_order)})
+
+
+def build_sort_index(lines, column_props_map, index_file):
+    """Build sort index from iterable of TSV lines and save it to index_file.
+    Lines are read in one pass."""
+    builder = SortIndexBuilder(column_props_map)
+    for line in lines:
+        builder.add_line(line)
+    builder.save(index_file)
+
+
+class SortIndex:
+
+    def __init__(self, index_file):
+        self.bundle = ArrayBundle(index_file)
+        self.row_count = self.bundle.meta["row_count"]
+
+    def get_ranks(self, col_name, ascending=True):
+        name = "rank_" + col_name
+        if not ascending and name + "_d" in self.bundle:
+            name += "_d"
+        return self.bundle.get(name)
+
+    def get_positions(self, col_name, ascending=True):
+        """Returns position of every row in order by one column."""
+        return self.bundle.get("pos_" + col_name + ("" if ascending else "_d"))
+
+    def get_order(self, sort_by, rows=None):
+        """Returns list of row ids (all or only ones from rows set) ordered
+        according to sort_by which is list of [column name, ascending] pairs."""
+        if rows is None:
+            order = list(self.bundle.get("line_order"))
+        else:
+            order = sorted(rows, key=self.bundle.get("line_ranks").__getitem__)
+        for col_name, ascending in reversed(sort_by):
+            # Python sorting is stable (also in reverse mode) so ordering by
+            # less significant columns is kept for rows with equal keys
+            order.sort(key=self.get_ranks(col_name, ascending).__getitem__,
+                       reverse=not ascending)
+        return order
+
+    def get_top_rows(self, sort_by, rows, count):
+        """Returns first count row ids from list of rows in sort_by order.
+        For one sort column bounded heap is used instead of sorting all rows."""
+        if count <= 0:
+            return []
+        if len(sort_by) == 1:
+            positions = self.get_positions(sort_by[0][0], sort_by[0][1])
+            if count * 4 < len(rows):
+                return heapq.nsmallest(count, rows, key=positions.__getitem__)
+            return sorted(rows, key=positions.__getitem__)[:count]
+        return self.get_order(sort_by, rows)[:count]
+
+    def get_sort_key(self, sort_by, row_id):
+        """Returns tuple of non-negative ints comparing rows the same way as
+        their order according to sort_by (row id when sort_by is empty)."""
+        return self._get_sort_key_func(sort_by)(row_id)
+
+    def _get_sort_key_func(self, sort_by):
+        if not sort_by:
+            return lambda row_id: (row_id,)
+        if len(sort_by) == 1:
+            positions = self.get_positions(sort_by[0][0], sort_by[0][1])
+            return lambda row_id: (positions[row_id],)
+        max_rank = self.row_count - 1
+        ranks_list = [(self.get_ranks(col_name, ascending), ascending)
+                      for col_name, ascending in sort_by]
+        line_ranks = self.bundle.get("line_ranks")
+        return lambda row_id: tuple(
+            [ranks[row_id] if ascending else max_rank - ranks[row_id]
+             for ranks, ascending in ranks_list] + [line_ranks[row_id]])
+
+    def get_rows_after(self, sort_by, sort_key, rows=None):
+        """Returns row ids (all or only ones from rows set) following row
+        with given sort key (see get_sort_key) in sort_by order."""
+        if rows is None:
+            if not sort_by:
+                return range(min(sort_key[0] + 1, self.row_count), self.row_count)
+            name = "order_" + sort_by[0][0] + ("" if sort_by[0][1] else "_d")
+            if len(sort_by) == 1 and name in self.bundle:
+                return self.bundle.get_range(name, sort_key[0] + 1, self.row_count)
+        order = sorted(rows) if not sort_by else self.get_order(sort_by, rows)
+        return order[_bisect_after(order, tuple(sort_key),
+                                   self._get_sort_key_func(sort_by)):]
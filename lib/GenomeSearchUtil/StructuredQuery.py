@@ -0,0 +1,261 @@
+# -*- coding: utf-8 -*-
+import operator
+
+# Compiler of Mongo-style structured queries ({"feature_type": "CDS",
+# "$or": [...], "$not": {...}}) into predicates. Query is validated once (all
+# errors are raised before any row is checked) and converted into closures
+# taking split line (TSV line items without first column) so that per-row
+# evaluation doesn't walk query dict anymore. $and/$or are short-circuited.
+# Field value can also be an object of operators ({"length": {"$gt": 3000}}),
+# numeric fields (type "n") are compared as numbers (empty value doesn't match
+# anything except $ne/$nin), other fields are compared as strings.
+_COMPARISONS = {"$gt": operator.gt, "$gte": operator.ge, "$lt": operator.lt,
+                "$lte": operator.le}
+OPERATORS = ["$gt", "$gte", "$lt", "$lte", "$in", "$nin", "$ne", "$prefix"]
+
+
+def _to_value_set(values):
+    try:
+        return frozenset(values)
+    except TypeError:
+        # Unhashable values can't be in a line anyway, keeping them as is
+        return tuple(values)
+
+
+def _all_of(predicates):
+    if not predicates:
+        return lambda split_line: True
+    if len(predicates) == 1:
+        return predicates[0]
+    if len(predicates) == 2:
+        first, second = predicates
+        return lambda split_line: first(split_line) and second(split_line)
+    return lambda split_line: all(p(split_line) for p in predicates)
+
+
+def _any_of(predicates):
+    if not predicates:
+        return lambda split_line: False
+    if len(predicates) == 1:
+        return predicates[0]
+    return lambda split_line: any(p(split_line) for p in predicates)
+
+
+def _to_number(value):
+    if value:
+        try:
+            return int(value)
+        except ValueError:
+            try:
+                return float(value)
+            except ValueError:
+                pass
+    return None
+
+
+def _is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _check_operand(key, op, operand, numeric):
+    if op in ["$in", "$nin"]:
+        if not isinstance(operand, list):
+            raise ValueError("Value of {} for field {} should be a list: {}".format(
+                op, key, operand))
+        for item in operand:
+            _check_operand(key, "$ne", item, numeric)
+    elif op == "$prefix" and numeric:
+        raise ValueError("Operator $prefix is not supported for numeric field {}".format(key))
+    elif numeric and not _is_number(operand):
+        raise ValueError("Value of {} for numeric field {} should be a number: {}".format(
+            op, key, operand))
+    elif not numeric and not isinstance(operand, str):
+        raise ValueError("Value of {} for field {} should be a string: {}".format(
+            op, key, operand))
+
+
+def _numeric_operator_predicate(pos, op, operand):
+    if op in _COMPARISONS:
+        compare = _COMPARISONS[op]
+
+        def predicate(split_line):
+            value = _to_number(split_line[pos])
+            return value is not None and compare(value, operand)
+    elif op == "$ne":
+        def predicate(split_line):
+            value = _to_number(split_line[pos])
+            return value is None or value != operand
+    else:
+        values = frozenset(operand)
+        expected = op == "$in"
+
+        def predicate(split_line):
+            value = _to_number(split_line[pos])
+            return (value is not None and value in values) == expected
+    return predicate
+
+
+def _text_operator_predicate(pos, op, operand):
+    if op in _COMPARISONS:
+        compare = _COMPARISONS[op]
+        return lambda split_line: compare(split_line[pos], operand)
+    if op == "$ne":
+        return lambda split_line: split_line[pos] != operand
+    if op == "$prefix":
+        return lambda split_line: split_line[pos].startswith(operand)
+    values = frozenset(operand)
+    if op == "$in":
+        return lambda split_line: split_line[pos] in values
+    return lambda split_line: split_line[pos] not in values
+
+
+def _operators_predicate(key, pos, operators, numeric):
+    if not operators:
+        raise ValueError("Operator object of field {} should not be empty".format(key))
+    predicates = []
+    for op, operand in list(operators.items()):
+        if op not in OPERATORS:
+            raise ValueError("Unrecognised operator {} for field {}. Should be one of {}".format(
+                op, key, ", ".join(OPERATORS)))
+        _check_operand(key, op, operand, numeric)
+        if numeric:
+            predicates.append(_numeric_operator_predicate(pos, op, operand))
+        else:
+            predicates.append(_text_operator_predicate(pos, op, operand))
+    return _all_of(predicates)
+
+
+def _field_predicate(pos, val):
+    # if val is a list, treat the values as OR
+    if isinstance(val, list) or isinstance(val, set):
+        values = _to_value_set(val)
+        return lambda split_line: split_line[pos] in values
+    return lambda split_line: split_line[pos] == val
+
+
+def compile_structured_query(structured_query, prop_dict):
+    """Validate structured query and return predicate taking split line
+    (line without first column, i.e. field "col" is at position col - 2)."""
+    if not isinstance(structured_query, dict):
+        raise ValueError('structured_query should be a dictionary object: {}'.format(
+            structured_query))
+    predicates = []
+    for key, val in list(structured_query.items()):
+        if key == "$not":
+            inner = compile_structured_query(val, prop_dict)
+            predicates.append(lambda split_line, inner=inner: not inner(split_line))
+        elif key == "$or":
+            if not isinstance(val, list):
+                raise ValueError("Value of $or should be a list: {}". format(val))
+            predicates.append(_any_of([compile_structured_query(x, prop_dict)
+                                       for x in val]))
+        elif key == "$and":
+            if not isinstance(val, list):
+                raise ValueError("Value of $and should be a list: {}".format(val))
+            predicates.append(_all_of([compile_structured_query(x, prop_dict)
+                                       for x in val]))
+        elif key in prop_dict:
+            # have to adjust to account for the clipped line
+            pos = prop_dict[key]['col'] - 2
+            if isinstance(val, dict):
+                predicates.append(_operators_predicate(key, pos, val,
+                                                       prop_dict[key]['type'] == 'n'))
+            else:
+                predicates.append(_field_predicate(pos, val))
+        else:
+            raise ValueError("Unrecognised field in query {}. Should be one of {} or $and, $or "
+                             "or $not".format(key, ", ".join(list(prop_dict.keys()))))
+    return _all_of(predicates)
+
+
+def _intersect(rows1, rows2):
+    if rows1 is None:
+        return rows2
+    if rows2 is None:
+        return rows1
+    return rows1 & rows2
+
+
+def _union(rows_list):
+    ret = set()
+    for rows in rows_list:
+        if rows is None:
+            return None
+        ret |= rows
+    return ret
+
+
+def _find_int_rows(column, op, operand):
+    if op == "$gt":
+        return set(column.find_rows(low=operand, low_inclusive=False))
+    if op == "$gte":
+        return set(column.find_rows(low=operand))
+    if op == "$lt":
+        return set(column.find_rows(high=operand, high_inclusive=False))
+    if op == "$lte":
+        return set(column.find_rows(high=operand))
+    if op == "$in":
+        return _union(set(column.find_rows(x, True, x, True)) for x in operand)
+    return None
+
+
+def _find_text_rows(column, op, operand):
+    if op == "$gt":
+        code_range = column.find_code_range(low=operand, low_inclusive=False)
+    elif op == "$gte":
+        code_range = column.find_code_range(low=operand)
+    elif op == "$lt":
+        code_range = column.find_code_range(high=operand, high_inclusive=False)
+    elif op == "$lte":
+        code_range = column.find_code_range(high=operand)
+    elif op == "$prefix":
+        if not operand or ord(operand[-1]) == 0x10FFFF:
+            return None
+        code_range = column.find_code_range(low=operand, high=operand[:-1] +
+                                            chr(ord(operand[-1]) + 1),
+                                            high_inclusive=False)
+    elif op == "$in":
+        codes = [column.find_code(x) for x in operand]
+        return _union(set(column.find_rows(range(code, code + 1)))
+                      for code in codes if code is not None)
+    else:
+        return None
+    return set(column.find_rows(code_range))
+
+
+def _find_field_rows(table, col_name, val, numeric):
+    kind = table.column_meta[col_name]["kind"]
+    column = table.get_column(col_name)
+    if isinstance(val, dict):
+        ret = None
+        for op, operand in val.items():
+            if kind == "int":
+                ret = _intersect(ret, _find_int_rows(column, op, operand))
+            elif not numeric:
+                ret = _intersect(ret, _find_text_rows(column, op, operand))
+        return ret
+    if kind == "int":
+        return None
+    values = val if isinstance(val, list) or isinstance(val, set) else [val]
+    # values other than strings can't be equal to any column value
+    return _find_text_rows(column, "$in", [x for x in values if isinstance(x, str)])
+
+
+def find_candidate_rows(structured_query, prop_dict, table):
+    """Returns set of row ids which may match structured query (which should
+    be already validated by compile_structured_query) using sorted columns
+    of ColumnarIndex table, or None if query can't be narrowed down this way.
+    Only conditions which are joined by AND are used ($not, $ne and $nin
+    are not narrowed down)."""
+    ret = None
+    for key, val in list(structured_query.items()):
+        if key == "$and":
+            for x in val:
+                ret = _intersect(ret, find_candidate_rows(x, prop_dict, table))
+        elif key == "$or":
+            ret = _intersect(ret, _union(find_candidate_rows(x, prop_dict, table)
+                                         for x in val))
+        elif key in prop_dict:
+            ret = _intersect(ret, _find_field_rows(table, key, val,
+                                                   prop_dict[key]['type'] == 'n'))
+    return ret
@@ -0,0 +1,342 @@
+# -*- coding: utf-8 -*-
+import gzip
+import io
+import json
+import os
+import zlib
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# In-process codecs of TSV index files. Codec of every TSV file is recorded in
+# sidecar metadata file (<tsv file>.meta, JSON like {"codec": "zstd"}) which is
+# written after data file is in place, so presence of metadata file means that
+# TSV file is complete. Files built before codecs were introduced have no
+# metadata file and are gzipped (<chsum>_<type>.tsv.gz). Data compressed by
+# separate calls of compress() can be concatenated (as gzip members or zstd
+# frames), readers read them as one stream.
+#
+# New TSV files are written in block format (similar to BGZF): rows are
+# grouped into blocks of about BLOCK_SIZE characters which are compressed
+# independently, and metadata file contains offset table (first row and byte
+# offset of every block), so that any range of rows can be read by
+# decompressing only blocks holding them and blocks can be decompressed in
+# parallel. Data file of block format is still valid stream for readers
+# without block support.
+META_SUFFIX = ".meta"
+LEGACY_SUFFIX = ".gz"
+BLOCK_SIZE = 64 * 1024
+
+
+class GzipCodec:
+    name = "gzip"
+    extension = ".gz"
+
+    def __init__(self, level=6):
+        self.level = level
+
+    def compress(self, data):
+        return gzip.compress(data, compresslevel=self.level)
+
+    def open_writer(self, fileobj):
+        return gzip.GzipFile(fileobj=fileobj, mode="wb", compresslevel=self.level)
+
+    def open_reader(self, fileobj):
+        return gzip.GzipFile(fileobj=fileobj, mode="rb")
+
+    def decompress(self, data):
+        # One gzip member (zlib releases GIL unlike gzip module)
+        return zlib.decompress(data, 16 + zlib.MAX_WBITS)
+
+
+class ZstdCodec:
+    name = "zstd"
+    extension = ".zst"
+
+    def __init__(self, level=3):
+        self.level = level
+
+    def compress(self, data):
+        return zstandard.ZstdCompressor(level=self.level).compress(data)
+
+    def open_writer(self, fileobj):
+        return zstandard.ZstdCompressor(level=self.level).stream_writer(fileobj)
+
+    def open_reader(self, fileobj):
+        return zstandard.ZstdDecompressor().stream_reader(fileobj, read_across_frames=True)
+
+    def decompress(self, data):
+        return zstandard.ZstdDecompressor().decompress(data)
+
+
+class PlainCodec:
+    name = "none"
+    extension = ""
+
+    def compress(self, data):
+        return data
+
+    def open_writer(self, fileobj):
+        return _Unclosable(fileobj)
+
+    def open_reader(self, fileobj):
+        return _Unclosable(fileobj)
+
+    def decompress(self, data):
+        return data
+
+
+class _Unclosable(io.RawIOBase):
+    # Wrapper keeping file open when codec stream is closed (the same way as
+    # compressing streams don't close their fileobj)
+
+    def __init__(self, fileobj):
+        self.fileobj = fileobj
+
+    def readable(self):
+        return self.fileobj.readable()
+
+    def writable(self):
+        return self.fileobj.writable()
+
+    def readinto(self, buf):
+        return self.fileobj.readinto(buf)
+
+    def write(self, data):
+        return self.fileobj.write(data)
+
+
+def get_codec(name):
+    if name == "gzip":
+        return GzipCodec()
+    if name == "zstd":
+        if zstandard is None:
+            raise ValueError("Codec zstd requires zstandard package to be installed")
+        return ZstdCodec()
+    if name == "none":
+        return PlainCodec()
+    raise ValueError("Unknown codec '" + str(name) + "', please use one of gzip, zstd, none")
+
+
+def get_data_file(tsv_file, codec):
+    """Returns path of data file of TSV file (path without codec extension)."""
+    return tsv_file + codec.extension
+
+
+def read_meta(tsv_file):
+    """Returns metadata of TSV file (path without codec extension), metadata
+    of gzip codec for legacy files without metadata file or None if TSV file
+    doesn't exist."""
+    try:
+        with open(tsv_file + META_SUFFIX) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        pass
+    if os.path.isfile(tsv_file + LEGACY_SUFFIX):
+        return {"codec": GzipCodec.name}
+    return None
+
+
+def read_codec(tsv_file):
+    """Returns codec of TSV file (path without codec extension) according to
+    its metadata or None if TSV file doesn't exist."""
+    meta = read_meta(tsv_file)
+    return None if meta is None else get_codec(meta["codec"])
+
+
+def write_codec(tsv_file, codec, block_table=None):
+    """Writes metadata file of TSV file (data file should be already saved),
+    block_table is the one of TsvBlockWriter for files in block format."""
+    meta = {"codec": codec.name}
+    if block_table is not None:
+        meta.update(block_table)
+    temp_file = tsv_file + META_SUFFIX + "." + str(os.getpid()) + ".tmp"
+    with open(temp_file, "w") as f:
+        json.dump(meta, f)
+    os.rename(temp_file, tsv_file + META_SUFFIX)
+
+
+def open_tsv(tsv_file):
+    """Opens TSV file (path without codec extension) of any codec for
+    reading lines of text."""
+    codec = read_codec(tsv_file)
+    if codec is None:
+        raise ValueError("File not found: " + tsv_file)
+    fileobj = open(get_data_file(tsv_file, codec), "rb")
+    try:
+        stream = io.BufferedReader(codec.open_reader(fileobj))
+    except BaseException:
+        fileobj.close()
+        raise
+    return _TsvReader(io.TextIOWrapper(stream, encoding="utf-8"), fileobj)
+
+
+class _TsvReader:
+
+    def __init__(self, text, fileobj):
+        self.text = text
+        self.fileobj = fileobj
+
+    def __iter__(self):
+        return iter(self.text)
+
+    def close(self):
+        try:
+            self.text.close()
+        finally:
+            self.fileobj.close()
+
+
+def split_blocks(text, block_size=BLOCK_SIZE):
+    """Splits text of whole lines into pieces of whole lines having about
+    block_size characters."""
+    begin = 0
+    while begin < len(text):
+        end = text.find("\n", begin + block_size - 1) + 1
+        if end == 0:
+            end = len(text)
+        yield text[begin:end]
+        begin = end
+
+
+def compress_blocks(codec, text, block_size=BLOCK_SIZE):
+    """Returns list of (row count, compressed data) of blocks of text."""
+    return [(block.count("\n"), codec.compress(block.encode("utf-8")))
+            for block in split_blocks(text, block_size)]
+
+
+class TsvBlockWriter:
+    # Writes TSV file in block format into binary fileobj. Rows are written
+    # either as text (write) or as blocks already compressed by the same
+    # codec (write_block), offset table is collected along the way.
+
+    def __init__(self, fileobj, codec, block_size=BLOCK_SIZE):
+        self.fileobj = fileobj
+        self.codec = codec
+        self.block_size = block_size
+        self.buffer = []
+        self.buffer_size = 0
+        self.block_rows = []
+        self.block_offsets = []
+        self.row_count = 0
+        self.offset = 0
+
+    def write(self, text):
+        self.buffer.append(text)
+        self.buffer_size += len(text)
+        if self.buffer_size >= self.block_size:
+            self.flush_blocks(False)
+
+    def flush_blocks(self, final=True):
+        # Writes buffered text as blocks, incomplete last line is kept in
+        # buffer unless it's final flush
+        text = "".join(self.buffer)
+        end = len(text) if final else text.rfind("\n") + 1
+        self.buffer = [text[end:]] if end < len(text) else []
+        self.buffer_size = len(text) - end
+        for row_count, data in compress_blocks(self.codec, text[:end], self.block_size):
+            self._write_block(row_count, data)
+
+    def write_block(self, row_count, data):
+        self.flush_blocks()
+        self._write_block(row_count, data)
+
+    def _write_block(self, row_count, data):
+        self.block_rows.append(self.row_count)
+        self.block_offsets.append(self.offset)
+        self.fileobj.write(data)
+        self.row_count += row_count
+        self.offset += len(data)
+
+    def copy_blocks(self, infile, block_table):
+        """Appends blocks of other TSV file of the same codec (binary infile
+        and its block table) without recompressing them."""
+        rows = block_table["block_rows"] + [block_table["row_count"]]
+        offsets = block_table["block_offsets"]
+        for block_num in range(len(block_table["block_rows"])):
+            self.write_block(rows[block_num + 1] - rows[block_num],
+                             infile.read(offsets[block_num + 1] - offsets[block_num]))
+
+    def close(self):
+        self.flush_blocks()
+
+    def get_block_table(self):
+        return {"row_count": self.row_count, "block_rows": self.block_rows,
+                "block_offsets": self.block_offsets + [self.offset]}
+
+    # context management (inside "with" block)
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def has_blocks(tsv_file):
+    meta = read_meta(tsv_file)
+    return meta is not None and "block_rows" in meta
+
+
+class TsvBlockReader:
+    # Reader of rows of TSV file in block format. Blocks are read by
+    # positional reads, so they may be decompressed by many threads.
+
+    def __init__(self, tsv_file, workers=1):
+        meta = read_meta(tsv_file)
+        if meta is None:
+            raise ValueError("File not found: " + tsv_file)
+        if "block_rows" not in meta:
+            raise ValueError("TSV file is not in block format: " + tsv_file)
+        self.codec = get_codec(meta["codec"])
+        self.row_count = meta["row_count"]
+        self.block_rows = meta["block_rows"]
+        self.block_offsets = meta["block_offsets"]
+        self.block_count = len(self.block_rows)
+        # Number of threads decompressing blocks while all rows are iterated
+        self.workers = workers
+        self.fd = os.open(get_data_file(tsv_file, self.codec), os.O_RDONLY)
+
+    def read_block(self, block_num):
+        """Returns compressed data of block."""
+        offset = self.block_offsets[block_num]
+        return os.pread(self.fd, self.block_offsets[block_num + 1] - offset, offset)
+
+    def get_block_lines(self, block_num):
+        text = str(self.codec.decompress(self.read_block(block_num)), "utf-8")
+        return [line + "\n" for line in text.split("\n")[:-1]]
+
+    def iter_blocks(self):
+        # Yields lines of every block, next blocks are decompressed by
+        # thread pool (at most two per thread ahead) when workers > 1
+        if self.workers <= 1:
+            for block_num in range(self.block_count):
+                yield self.get_block_lines(block_num)
+            return
+        with ThreadPoolExecutor(self.workers) as executor:
+            pending = deque()
+            for block_num in range(self.block_count):
+                pending.append(executor.submit(self.get_block_lines, block_num))
+                if len(pending) >= 2 * self.workers:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+
+    def __iter__(self):
+        for lines in self.iter_blocks():
+            yield from lines
+
+    def close(self):
+        if self.fd is not None:
+            os.close(self.fd)
+            self.fd = None
+
+    # context management (inside "with" block)
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
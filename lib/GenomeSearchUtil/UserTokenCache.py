@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+import threading
+import time
+from collections import OrderedDict
+
+from GenomeSearchUtil.ChecksumCache import get_identity_hash
+from GenomeSearchUtil.authclient import InvalidTokenError
+
+# Cache of validated auth tokens (token -> user name) used by server before
+# dispatching every call. Tokens are kept only as SHA-256 hashes. Valid tokens
+# expire after TTL, tokens rejected by auth service (InvalidTokenError of
+# validation, raised for 401/403 responses only) are cached for shorter
+# negative TTL, other errors (like connection ones or 5xx responses of auth
+# service) are not cached. Concurrent validations of the same token are
+# coalesced into one call of auth service. Wrapped auth client shouldn't have
+# cache of its own.
+
+
+class _PendingValidation:
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.user = None
+        self.error = None
+
+
+class UserTokenCache:
+
+    def __init__(self, validate_func, ttl=300, negative_ttl=10, max_size=10000,
+                 clock=time.time):
+        # validate_func(token) returns user name or raises error
+        self.validate_func = validate_func
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.max_size = max_size
+        self.clock = clock
+        self.lock = threading.Lock()
+        # token hash -> (user name or None, error message or None, expiration time)
+        self.entries = OrderedDict()
+        self.pending = {}  # token hash -> _PendingValidation
+        self.hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    def get_user(self, token):
+        """Returns user name of token (the same way as auth client does),
+        calls validate_func in case token is not cached (or expired) and no
+        other thread validates it at the moment."""
+        key = get_identity_hash(token)
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                user, error, expiration = entry
+                if expiration > self.clock():
+                    self.entries.move_to_end(key)
+                    if error is not None:
+                        self.negative_hits += 1
+                        raise ValueError(error)
+                    self.hits += 1
+                    return user
+                del self.entries[key]
+            self.misses += 1
+            validation = self.pending.get(key)
+            leader = validation is None
+            if leader:
+                validation = _PendingValidation()
+                self.pending[key] = validation
+            else:
+                self.coalesced += 1
+        if not leader:
+            validation.done.wait()
+            if validation.error is not None:
+                raise validation.error
+            return validation.user
+        try:
+            validation.user = self.validate_func(token)
+        except BaseException as e:
+            validation.error = e
+            raise
+        finally:
+            with self.lock:
+                del self.pending[key]
+                if validation.error is None:
+                    self._store(key, (validation.user, None, self.clock() + self.ttl))
+                elif isinstance(validation.error, InvalidTokenError):
+                    self._store(key, (None, str(validation.error),
+                                      self.clock() + self.negative_ttl))
+            validation.done.set()
+        return validation.user
+
+    def _store(self, key, entry):
+        # Should be called under self.lock
+        if entry[2] <= self.clock():
+            return
+        self.entries[key] = entry
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+
+    def get_stats(self):
+        with self.lock:
+            return {"entries": len(self.entries), "max_size": self.max_size,
+                    "hits": self.hits, "negative_hits": self.negative_hits,
+                    "misses": self.misses, "coalesced": self.coalesced}
@@ -11,6 +11,10 @@ import threading as _threading
 import hashlib
 
 
+class InvalidTokenError(ValueError):
+    ''' Token was rejected by auth service (unlike other errors of it). '''
+
+
 class TokenCache(object):
     ''' A basic cache for tokens. '''
 
@@ -24,7 +28,7 @@ class TokenCache(object):
         self._halfmax = maxsize / 2  # int division to round down
 
     def get_user(self, token):
-        token = hashlib.sha256(token).hexdigest()
+        token = hashlib.sha256(token.encode('utf-8')).hexdigest()
         with self._lock:
             usertime = self._cache.get(token)
         if not usertime:
@@ -40,7 +44,7 @@ class TokenCache(object):
             raise ValueError('Must supply token')
         if not user:
             raise ValueError('Must supply user')
-        token = hashlib.sha256(token).hexdigest()
+        token = hashlib.sha256(token.encode('utf-8')).hexdigest()
         with self._lock:
             self._cache[token] = [user, _time.time()]
             if len(self._cache) > self._maxsize:
@@ -59,21 +63,26 @@ class KBaseAuth(object):
 
     _LOGIN_URL = 'https://kbase.us/services/authorization/Sessions/Login'
 
-    def __init__(self, auth_url=None):
+    # Response statuses meaning that token itself is invalid
+    _INVALID_TOKEN_STATUSES = (401, 403)
+
+    def __init__(self, auth_url=None, cache_tokens=True):
         '''
-        Constructor
+        Constructor (cache_tokens=False is for callers caching tokens
+        themselves)
         '''
         self._authurl = auth_url
         if not self._authurl:
             self._authurl = self._LOGIN_URL
-        self._cache = TokenCache()
+        self._cache = TokenCache() if cache_tokens else None
 
     def get_user(self, token):
         if not token:
             raise ValueError('Must supply token')
-        user = self._cache.get_user(token)
-        if user:
-            return user
+        if self._cache is not None:
+            user = self._cache.get_user(token)
+            if user:
+                return user
 
         d = {'token': token, 'fields': 'user_id'}
         ret = _requests.post(self._authurl, data=d)
@@ -82,10 +91,14 @@ class KBaseAuth(object):
                 err = ret.json()
             except:
                 ret.raise_for_status()
-            raise ValueError('Error connecting to auth service: {} {}\n{}'
-                             .format(ret.status_code, ret.reason,
-                                     err['error_msg']))
+            error_class = (InvalidTokenError
+                           if ret.status_code in self._INVALID_TOKEN_STATUSES
+                           else ValueError)
+            raise error_class('Error connecting to auth service: {} {}\n{}'
+                              .format(ret.status_code, ret.reason,
+                                      err['error_msg']))
 
         user = ret.json()['user_id']
-        self._cache.add_valid_token(token, user)
+        if self._cache is not None:
+            self._cache.add_valid_token(token, user)
         return user
@@ -0,0 +1,123 @@
+
+package us.kbase.genomesearchutil;
+
+import java.util.HashMap;
+import java.util.Map;
+import javax.annotation.Generated;
+import com.fasterxml.jackson.annotation.JsonAnyGetter;
+import com.fasterxml.jackson.annotation.JsonAnySetter;
+import com.fasterxml.jackson.annotation.JsonInclude;
+import com.fasterxml.jackson.annotation.JsonProperty;
+import com.fasterxml.jackson.annotation.JsonPropertyOrder;
+
+
+/**
+ * <p>Original spec-file type: GenomeFeature</p>
+ * 
+ * 
+ */
+@JsonInclude(JsonInclude.Include.NON_NULL)
+@Generated("com.googlecode.jsonschema2pojo")
+@JsonPropertyOrder({
+    "ref",
+    "feature"
+})
+public class GenomeFeature {
+
+    @JsonProperty("ref")
+    private String ref;
+    /**
+     * <p>Original spec-file type: FeatureData</p>
+     * <pre>
+     * aliases - mapping from alias name (key) to set of alias sources 
+     *     (value),
+     * global_location - this is location-related properties that are
+     *     under sorting whereas items in "location" array are not,
+     * feature_array - field recording which array a feature is located in
+     *     (features, mrnas, cdss, non_coding_features)
+     * feature_idx - field keeping the position of feature in its array in a
+     *     Genome object,
+     * ontology_terms - mapping from term ID (key) to term name (value).
+     * </pre>
+     * 
+     */
+    @JsonProperty("feature")
+    private us.kbase.genomesearchutil.FeatureData feature;
+    private Map<String, Object> additionalProperties = new HashMap<String, Object>();
+
+    @JsonProperty("ref")
+    public String getRef() {
+        return ref;
+    }
+
+    @JsonProperty("ref")
+    public void setRef(String ref) {
+        this.ref = ref;
+    }
+
+    public GenomeFeature withRef(String ref) {
+        this.ref = ref;
+        return this;
+    }
+
+    /**
+     * <p>Original spec-file type: FeatureData</p>
+     * <pre>
+     * aliases - mapping from alias name (key) to set of alias sources 
+     *     (value),
+     * global_location - this is location-related properties that are
+     *     under sorting whereas items in "location" array are not,
+     * feature_array - field recording which array a feature is located in
+     *     (features, mrnas, cdss, non_coding_features)
+     * feature_idx - field keeping the position of feature in its array in a
+     *     Genome object,
+     * ontology_terms - mapping from term ID (key) to term name (value).
+     * </pre>
+     * 
+     */
+    @JsonProperty("feature")
+    public us.kbase.genomesearchutil.FeatureData getFeature() {
+        return feature;
+    }
+
+    /**
+     * <p>Original spec-file type: FeatureData</p>
+     * <pre>
+     * aliases - mapping from alias name (key) to set of alias sources 
+     *     (value),
+     * global_location - this is location-related properties that are
+     *     under sorting whereas items in "location" array are not,
+     * feature_array - field recording which array a feature is located in
+     *     (features, mrnas, cdss, non_coding_features)
+     * feature_idx - field keeping the position of feature in its array in a
+     *     Genome object,
+     * ontology_terms - mapping from term ID (key) to term name (value).
+     * </pre>
+     * 
+     */
+    @JsonProperty("feature")
+    public void setFeature(us.kbase.genomesearchutil.FeatureData feature) {
+        this.feature = feature;
+    }
+
+    public GenomeFeature withFeature(us.kbase.genomesearchutil.FeatureData feature) {
+        this.feature = feature;
+        return this;
+    }
+
+    @JsonAnyGetter
+    public Map<String, Object> getAdditionalProperties() {
+        return this.additionalProperties;
+    }
+
+    @JsonAnySetter
+    public void setAdditionalProperties(String name, Object value) {
+        this.additionalProperties.put(name, value);
+    }
+
+    @Override
+    public String toString() {
+        return ((((((("GenomeFeature"+" [ref=")+ ref)+", feature=")+ feature)+", additionalProperties=")+ additionalProperties)+"]");
+    }
+
+}
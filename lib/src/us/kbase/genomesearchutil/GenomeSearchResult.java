@@ -0,0 +1,139 @@
+
+package us.kbase.genomesearchutil;
+
+import java.util.HashMap;
+import java.util.List;
+import java.util.Map;
+import javax.annotation.Generated;
+import com.fasterxml.jackson.annotation.JsonAnyGetter;
+import com.fasterxml.jackson.annotation.JsonAnySetter;
+import com.fasterxml.jackson.annotation.JsonInclude;
+import com.fasterxml.jackson.annotation.JsonProperty;
+import com.fasterxml.jackson.annotation.JsonPropertyOrder;
+
+
+/**
+ * <p>Original spec-file type: GenomeSearchResult</p>
+ * <pre>
+ * error - error message in case search in this genome failed (other
+ *     fields are not set then),
+ * features - page of features of this genome (not set in merge mode),
+ * cursor - opaque cursor of next page of this genome which can be
+ *     passed to search method (not set in merge mode).
+ * </pre>
+ * 
+ */
+@JsonInclude(JsonInclude.Include.NON_NULL)
+@Generated("com.googlecode.jsonschema2pojo")
+@JsonPropertyOrder({
+    "ref",
+    "error",
+    "features",
+    "num_found",
+    "cursor"
+})
+public class GenomeSearchResult {
+
+    @JsonProperty("ref")
+    private String ref;
+    @JsonProperty("error")
+    private String error;
+    @JsonProperty("features")
+    private List<FeatureData> features;
+    @JsonProperty("num_found")
+    private Long numFound;
+    @JsonProperty("cursor")
+    private String cursor;
+    private Map<String, Object> additionalProperties = new HashMap<String, Object>();
+
+    @JsonProperty("ref")
+    public String getRef() {
+        return ref;
+    }
+
+    @JsonProperty("ref")
+    public void setRef(String ref) {
+        this.ref = ref;
+    }
+
+    public GenomeSearchResult withRef(String ref) {
+        this.ref = ref;
+        return this;
+    }
+
+    @JsonProperty("error")
+    public String getError() {
+        return error;
+    }
+
+    @JsonProperty("error")
+    public void setError(String error) {
+        this.error = error;
+    }
+
+    public GenomeSearchResult withError(String error) {
+        this.error = error;
+        return this;
+    }
+
+    @JsonProperty("features")
+    public List<FeatureData> getFeatures() {
+        return features;
+    }
+
+    @JsonProperty("features")
+    public void setFeatures(List<FeatureData> features) {
+        this.features = features;
+    }
+
+    public GenomeSearchResult withFeatures(List<FeatureData> features) {
+        this.features = features;
+        return this;
+    }
+
+    @JsonProperty("num_found")
+    public Long getNumFound() {
+        return numFound;
+    }
+
+    @JsonProperty("num_found")
+    public void setNumFound(Long numFound) {
+        this.numFound = numFound;
+    }
+
+    public GenomeSearchResult withNumFound(Long numFound) {
+        this.numFound = numFound;
+        return this;
+    }
+
+    @JsonProperty("cursor")
+    public String getCursor() {
+        return cursor;
+    }
+
+    @JsonProperty("cursor")
+    public void setCursor(String cursor) {
+        this.cursor = cursor;
+    }
+
+    public GenomeSearchResult withCursor(String cursor) {
+        this.cursor = cursor;
+        return this;
+    }
+
+    @JsonAnyGetter
+    public Map<String, Object> getAdditionalProperties() {
+        return this.additionalProperties;
+    }
+
+    @JsonAnySetter
+    public void setAdditionalProperties(String name, Object value) {
+        this.additionalProperties.put(name, value);
+    }
+
+    @Override
+    public String toString() {
+        return ((((((((((((("GenomeSearchResult"+" [ref=")+ ref)+", error=")+ error)+", features=")+ features)+", numFound=")+ numFound)+", cursor=")+ cursor)+", additionalProperties=")+ additionalProperties)+"]");
+    }
+
+}
@@ -213,6 +213,40 @@ public class GenomeSearchUtilClient {
         return res.get(0);
     }
 
+    /**
+     * <p>Original spec-file function name: search_multi</p>
+     * <pre>
+     * </pre>
+     * @param   params   instance of type {@link us.kbase.genomesearchutil.SearchMultiOptions SearchMultiOptions}
+     * @return   parameter "result" of type {@link us.kbase.genomesearchutil.SearchMultiResult SearchMultiResult}
+     * @throws IOException if an IO exception occurs
+     * @throws JsonClientException if a JSON RPC exception occurs
+     */
+    public SearchMultiResult searchMulti(SearchMultiOptions params, RpcContext... jsonRpcContext) throws IOException, JsonClientException {
+        List<Object> args = new ArrayList<Object>();
+        args.add(params);
+        TypeReference<List<SearchMultiResult>> retType = new TypeReference<List<SearchMultiResult>>() {};
+        List<SearchMultiResult> res = caller.jsonrpcCall("GenomeSearchUtil.search_multi", args, retType, true, false, jsonRpcContext, this.serviceVersion);
+        return res.get(0);
+    }
+
+    /**
+     * <p>Original spec-file function name: get_features</p>
+     * <pre>
+     * </pre>
+     * @param   params   instance of type {@link us.kbase.genomesearchutil.GetFeaturesOptions GetFeaturesOptions}
+     * @return   parameter "result" of type {@link us.kbase.genomesearchutil.GetFeaturesResult GetFeaturesResult}
+     * @throws IOException if an IO exception occurs
+     * @throws JsonClientException if a JSON RPC exception occurs
+     */
+    public GetFeaturesResult getFeatures(GetFeaturesOptions params, RpcContext... jsonRpcContext) throws IOException, JsonClientException {
+        List<Object> args = new ArrayList<Object>();
+        args.add(params);
+        TypeReference<List<GetFeaturesResult>> retType = new TypeReference<List<GetFeaturesResult>>() {};
+        List<GetFeaturesResult> res = caller.jsonrpcCall("GenomeSearchUtil.get_features", args, retType, true, false, jsonRpcContext, this.serviceVersion);
+        return res.get(0);
+    }
+
     public Map<String, Object> status(RpcContext... jsonRpcContext) throws IOException, JsonClientException {
         List<Object> args = new ArrayList<Object>();
         TypeReference<List<Map<String, Object>>> retType = new TypeReference<List<Map<String, Object>>>() {};
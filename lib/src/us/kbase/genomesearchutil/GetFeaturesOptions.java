@@ -0,0 +1,103 @@
+
+package us.kbase.genomesearchutil;
+
+import java.util.HashMap;
+import java.util.List;
+import java.util.Map;
+import javax.annotation.Generated;
+import com.fasterxml.jackson.annotation.JsonAnyGetter;
+import com.fasterxml.jackson.annotation.JsonAnySetter;
+import com.fasterxml.jackson.annotation.JsonInclude;
+import com.fasterxml.jackson.annotation.JsonProperty;
+import com.fasterxml.jackson.annotation.JsonPropertyOrder;
+
+
+/**
+ * <p>Original spec-file type: GetFeaturesOptions</p>
+ * <pre>
+ * feature_ids - list of feature ids or aliases (up to 10000) looked
+ *     up in genome without scanning its features,
+ * fields - optional list of FeatureData fields which should be
+ *     returned for every feature (all fields by default), other
+ *     fields are not decoded.
+ * </pre>
+ * 
+ */
+@JsonInclude(JsonInclude.Include.NON_NULL)
+@Generated("com.googlecode.jsonschema2pojo")
+@JsonPropertyOrder({
+    "ref",
+    "feature_ids",
+    "fields"
+})
+public class GetFeaturesOptions {
+
+    @JsonProperty("ref")
+    private java.lang.String ref;
+    @JsonProperty("feature_ids")
+    private List<String> featureIds;
+    @JsonProperty("fields")
+    private List<String> fields;
+    private Map<java.lang.String, Object> additionalProperties = new HashMap<java.lang.String, Object>();
+
+    @JsonProperty("ref")
+    public java.lang.String getRef() {
+        return ref;
+    }
+
+    @JsonProperty("ref")
+    public void setRef(java.lang.String ref) {
+        this.ref = ref;
+    }
+
+    public GetFeaturesOptions withRef(java.lang.String ref) {
+        this.ref = ref;
+        return this;
+    }
+
+    @JsonProperty("feature_ids")
+    public List<String> getFeatureIds() {
+        return featureIds;
+    }
+
+    @JsonProperty("feature_ids")
+    public void setFeatureIds(List<String> featureIds) {
+        this.featureIds = featureIds;
+    }
+
+    public GetFeaturesOptions withFeatureIds(List<String> featureIds) {
+        this.featureIds = featureIds;
+        return this;
+    }
+
+    @JsonProperty("fields")
+    public List<String> getFields() {
+        return fields;
+    }
+
+    @JsonProperty("fields")
+    public void setFields(List<String> fields) {
+        this.fields = fields;
+    }
+
+    public GetFeaturesOptions withFields(List<String> fields) {
+        this.fields = fields;
+        return this;
+    }
+
+    @JsonAnyGetter
+    public Map<java.lang.String, Object> getAdditionalProperties() {
+        return this.additionalProperties;
+    }
+
+    @JsonAnySetter
+    public void setAdditionalProperties(java.lang.String name, Object value) {
+        this.additionalProperties.put(name, value);
+    }
+
+    @Override
+    public java.lang.String toString() {
+        return ((((((((("GetFeaturesOptions"+" [ref=")+ ref)+", featureIds=")+ featureIds)+", fields=")+ fields)+", additionalProperties=")+ additionalProperties)+"]");
+    }
+
+}
@@ -0,0 +1,83 @@
+
+package us.kbase.genomesearchutil;
+
+import java.util.HashMap;
+import java.util.List;
+import java.util.Map;
+import javax.annotation.Generated;
+import com.fasterxml.jackson.annotation.JsonAnyGetter;
+import com.fasterxml.jackson.annotation.JsonAnySetter;
+import com.fasterxml.jackson.annotation.JsonInclude;
+import com.fasterxml.jackson.annotation.JsonProperty;
+import com.fasterxml.jackson.annotation.JsonPropertyOrder;
+
+
+/**
+ * <p>Original spec-file type: GetFeaturesResult</p>
+ * <pre>
+ * features - mapping from requested id to features having this id
+ *     or alias (in order of features in genome),
+ * not_found - requested ids which no feature has.
+ * </pre>
+ * 
+ */
+@JsonInclude(JsonInclude.Include.NON_NULL)
+@Generated("com.googlecode.jsonschema2pojo")
+@JsonPropertyOrder({
+    "features",
+    "not_found"
+})
+public class GetFeaturesResult {
+
+    @JsonProperty("features")
+    private Map<String, List<FeatureData>> features;
+    @JsonProperty("not_found")
+    private List<String> notFound;
+    private Map<java.lang.String, Object> additionalProperties = new HashMap<java.lang.String, Object>();
+
+    @JsonProperty("features")
+    public Map<String, List<FeatureData>> getFeatures() {
+        return features;
+    }
+
+    @JsonProperty("features")
+    public void setFeatures(Map<String, List<FeatureData>> features) {
+        this.features = features;
+    }
+
+    public GetFeaturesResult withFeatures(Map<String, List<FeatureData>> features) {
+        this.features = features;
+        return this;
+    }
+
+    @JsonProperty("not_found")
+    public List<String> getNotFound() {
+        return notFound;
+    }
+
+    @JsonProperty("not_found")
+    public void setNotFound(List<String> notFound) {
+        this.notFound = notFound;
+    }
+
+    public GetFeaturesResult withNotFound(List<String> notFound) {
+        this.notFound = notFound;
+        return this;
+    }
+
+    @JsonAnyGetter
+    public Map<java.lang.String, Object> getAdditionalProperties() {
+        return this.additionalProperties;
+    }
+
+    @JsonAnySetter
+    public void setAdditionalProperties(java.lang.String name, Object value) {
+        this.additionalProperties.put(name, value);
+    }
+
+    @Override
+    public java.lang.String toString() {
+        return ((((((("GetFeaturesResult"+" [features=")+ features)+", notFound=")+ notFound)+", additionalProperties=")+ additionalProperties)+"]");
+    }
+
+}
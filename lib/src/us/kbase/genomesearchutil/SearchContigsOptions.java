@@ -21,6 +21,11 @@ import us.kbase.common.service.Tuple2;
  *     value because it was already done before; please don't
  *     set this value with 0 or any guessed number if you didn't 
  *     get right value previously.
+ * cursor - optional opaque cursor returned with previous page;
+ *     when set, next page is returned starting right after the
+ *     last item of previous page (start and num_found are taken from
+ *     cursor). Cursor can be used only with the same query and
+ *     sorting as ones of previous page.
  * </pre>
  * 
  */
@@ -32,7 +37,8 @@ import us.kbase.common.service.Tuple2;
     "sort_by",
     "start",
     "limit",
-    "num_found"
+    "num_found",
+    "cursor"
 })
 public class SearchContigsOptions {
 
@@ -48,6 +54,8 @@ public class SearchContigsOptions {
     private java.lang.Long limit;
     @JsonProperty("num_found")
     private java.lang.Long numFound;
+    @JsonProperty("cursor")
+    private java.lang.String cursor;
     private Map<java.lang.String, Object> additionalProperties = new HashMap<java.lang.String, Object>();
 
     @JsonProperty("ref")
@@ -140,6 +148,21 @@ public class SearchContigsOptions {
         return this;
     }
 
+    @JsonProperty("cursor")
+    public java.lang.String getCursor() {
+        return cursor;
+    }
+
+    @JsonProperty("cursor")
+    public void setCursor(java.lang.String cursor) {
+        this.cursor = cursor;
+    }
+
+    public SearchContigsOptions withCursor(java.lang.String cursor) {
+        this.cursor = cursor;
+        return this;
+    }
+
     @JsonAnyGetter
     public Map<java.lang.String, Object> getAdditionalProperties() {
         return this.additionalProperties;
@@ -152,7 +175,7 @@ public class SearchContigsOptions {
 
     @Override
     public java.lang.String toString() {
-        return ((((((((((((((("SearchContigsOptions"+" [ref=")+ ref)+", query=")+ query)+", sortBy=")+ sortBy)+", start=")+ start)+", limit=")+ limit)+", numFound=")+ numFound)+", additionalProperties=")+ additionalProperties)+"]");
+        return ((((((((((((((((("SearchContigsOptions"+" [ref=")+ ref)+", query=")+ query)+", sortBy=")+ sortBy)+", start=")+ start)+", limit=")+ limit)+", numFound=")+ numFound)+", cursor=")+ cursor)+", additionalProperties=")+ additionalProperties)+"]");
     }
 
 }
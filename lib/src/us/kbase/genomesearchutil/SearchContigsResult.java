@@ -17,6 +17,7 @@ import com.fasterxml.jackson.annotation.JsonPropertyOrder;
  * <pre>
  * num_found - number of all items found in query search (with 
  *     only part of it returned in "features" list).
+ * cursor - opaque cursor of next page (null for the last page).
  * </pre>
  * 
  */
@@ -26,7 +27,8 @@ import com.fasterxml.jackson.annotation.JsonPropertyOrder;
     "query",
     "start",
     "contigs",
-    "num_found"
+    "num_found",
+    "cursor"
 })
 public class SearchContigsResult {
 
@@ -38,6 +40,8 @@ public class SearchContigsResult {
     private List<ContigData> contigs;
     @JsonProperty("num_found")
     private Long numFound;
+    @JsonProperty("cursor")
+    private String cursor;
     private Map<String, Object> additionalProperties = new HashMap<String, Object>();
 
     @JsonProperty("query")
@@ -100,6 +104,21 @@ public class SearchContigsResult {
         return this;
     }
 
+    @JsonProperty("cursor")
+    public String getCursor() {
+        return cursor;
+    }
+
+    @JsonProperty("cursor")
+    public void setCursor(String cursor) {
+        this.cursor = cursor;
+    }
+
+    public SearchContigsResult withCursor(String cursor) {
+        this.cursor = cursor;
+        return this;
+    }
+
     @JsonAnyGetter
     public Map<String, Object> getAdditionalProperties() {
         return this.additionalProperties;
@@ -112,7 +131,7 @@ public class SearchContigsResult {
 
     @Override
     public String toString() {
-        return ((((((((((("SearchContigsResult"+" [query=")+ query)+", start=")+ start)+", contigs=")+ contigs)+", numFound=")+ numFound)+", additionalProperties=")+ additionalProperties)+"]");
+        return ((((((((((((("SearchContigsResult"+" [query=")+ query)+", start=")+ start)+", contigs=")+ contigs)+", numFound=")+ numFound)+", cursor=")+ cursor)+", additionalProperties=")+ additionalProperties)+"]");
     }
 
 }
@@ -0,0 +1,199 @@
+
+package us.kbase.genomesearchutil;
+
+import java.util.HashMap;
+import java.util.List;
+import java.util.Map;
+import javax.annotation.Generated;
+import com.fasterxml.jackson.annotation.JsonAnyGetter;
+import com.fasterxml.jackson.annotation.JsonAnySetter;
+import com.fasterxml.jackson.annotation.JsonInclude;
+import com.fasterxml.jackson.annotation.JsonProperty;
+import com.fasterxml.jackson.annotation.JsonPropertyOrder;
+import us.kbase.common.service.Tuple2;
+import us.kbase.common.service.UObject;
+
+
+/**
+ * <p>Original spec-file type: SearchMultiOptions</p>
+ * <pre>
+ * refs - list of genome refs (up to 1000) searched with the same
+ *     query, structured_query and sorting as in search method,
+ * merge - optional flag which when set informs that one page of
+ *     features of all genomes merged in sort_by order should be
+ *     returned (items equal by sort keys are kept in order of refs)
+ *     instead of separate page for every genome,
+ * fields - optional list of FeatureData fields which should be
+ *     returned for every feature (all fields by default), other
+ *     fields are not decoded.
+ * </pre>
+ * 
+ */
+@JsonInclude(JsonInclude.Include.NON_NULL)
+@Generated("com.googlecode.jsonschema2pojo")
+@JsonPropertyOrder({
+    "refs",
+    "query",
+    "structured_query",
+    "sort_by",
+    "start",
+    "limit",
+    "merge",
+    "fields"
+})
+public class SearchMultiOptions {
+
+    @JsonProperty("refs")
+    private List<String> refs;
+    @JsonProperty("query")
+    private java.lang.String query;
+    @JsonProperty("structured_query")
+    private UObject structuredQuery;
+    @JsonProperty("sort_by")
+    private List<Tuple2 <String, Long>> sortBy;
+    @JsonProperty("start")
+    private java.lang.Long start;
+    @JsonProperty("limit")
+    private java.lang.Long limit;
+    @JsonProperty("merge")
+    private java.lang.Long merge;
+    @JsonProperty("fields")
+    private List<String> fields;
+    private Map<java.lang.String, Object> additionalProperties = new HashMap<java.lang.String, Object>();
+
+    @JsonProperty("refs")
+    public List<String> getRefs() {
+        return refs;
+    }
+
+    @JsonProperty("refs")
+    public void setRefs(List<String> refs) {
+        this.refs = refs;
+    }
+
+    public SearchMultiOptions withRefs(List<String> refs) {
+        this.refs = refs;
+        return this;
+    }
+
+    @JsonProperty("query")
+    public java.lang.String getQuery() {
+        return query;
+    }
+
+    @JsonProperty("query")
+    public void setQuery(java.lang.String query) {
+        this.query = query;
+    }
+
+    public SearchMultiOptions withQuery(java.lang.String query) {
+        this.query = query;
+        return this;
+    }
+
+    @JsonProperty("structured_query")
+    public UObject getStructuredQuery() {
+        return structuredQuery;
+    }
+
+    @JsonProperty("structured_query")
+    public void setStructuredQuery(UObject structuredQuery) {
+        this.structuredQuery = structuredQuery;
+    }
+
+    public SearchMultiOptions withStructuredQuery(UObject structuredQuery) {
+        this.structuredQuery = structuredQuery;
+        return this;
+    }
+
+    @JsonProperty("sort_by")
+    public List<Tuple2 <String, Long>> getSortBy() {
+        return sortBy;
+    }
+
+    @JsonProperty("sort_by")
+    public void setSortBy(List<Tuple2 <String, Long>> sortBy) {
+        this.sortBy = sortBy;
+    }
+
+    public SearchMultiOptions withSortBy(List<Tuple2 <String, Long>> sortBy) {
+        this.sortBy = sortBy;
+        return this;
+    }
+
+    @JsonProperty("start")
+    public java.lang.Long getStart() {
+        return start;
+    }
+
+    @JsonProperty("start")
+    public void setStart(java.lang.Long start) {
+        this.start = start;
+    }
+
+    public SearchMultiOptions withStart(java.lang.Long start) {
+        this.start = start;
+        return this;
+    }
+
+    @JsonProperty("limit")
+    public java.lang.Long getLimit() {
+        return limit;
+    }
+
+    @JsonProperty("limit")
+    public void setLimit(java.lang.Long limit) {
+        this.limit = limit;
+    }
+
+    public SearchMultiOptions withLimit(java.lang.Long limit) {
+        this.limit = limit;
+        return this;
+    }
+
+    @JsonProperty("merge")
+    public java.lang.Long getMerge() {
+        return merge;
+    }
+
+    @JsonProperty("merge")
+    public void setMerge(java.lang.Long merge) {
+        this.merge = merge;
+    }
+
+    public SearchMultiOptions withMerge(java.lang.Long merge) {
+        this.merge = merge;
+        return this;
+    }
+
+    @JsonProperty("fields")
+    public List<String> getFields() {
+        return fields;
+    }
+
+    @JsonProperty("fields")
+    public void setFields(List<String> fields) {
+        this.fields = fields;
+    }
+
+    public SearchMultiOptions withFields(List<String> fields) {
+        this.fields = fields;
+        return this;
+    }
+
+    @JsonAnyGetter
+    public Map<java.lang.String, Object> getAdditionalProperties() {
+        return this.additionalProperties;
+    }
+
+    @JsonAnySetter
+    public void setAdditionalProperties(java.lang.String name, Object value) {
+        this.additionalProperties.put(name, value);
+    }
+
+    @Override
+    public java.lang.String toString() {
+        return ((((((((((((((((((("SearchMultiOptions"+" [refs=")+ refs)+", query=")+ query)+", structuredQuery=")+ structuredQuery)+", sortBy=")+ sortBy)+", start=")+ start)+", limit=")+ limit)+", merge=")+ merge)+", fields=")+ fields)+", additionalProperties=")+ additionalProperties)+"]");
+    }
+
+}
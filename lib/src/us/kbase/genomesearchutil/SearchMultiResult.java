@@ -0,0 +1,139 @@
+
+package us.kbase.genomesearchutil;
+
+import java.util.HashMap;
+import java.util.List;
+import java.util.Map;
+import javax.annotation.Generated;
+import com.fasterxml.jackson.annotation.JsonAnyGetter;
+import com.fasterxml.jackson.annotation.JsonAnySetter;
+import com.fasterxml.jackson.annotation.JsonInclude;
+import com.fasterxml.jackson.annotation.JsonProperty;
+import com.fasterxml.jackson.annotation.JsonPropertyOrder;
+
+
+/**
+ * <p>Original spec-file type: SearchMultiResult</p>
+ * <pre>
+ * results - results for every genome in order of refs,
+ * features - merged page of features of all genomes (only in merge
+ *     mode),
+ * num_found - number of all items found in all genomes (only in
+ *     merge mode).
+ * </pre>
+ * 
+ */
+@JsonInclude(JsonInclude.Include.NON_NULL)
+@Generated("com.googlecode.jsonschema2pojo")
+@JsonPropertyOrder({
+    "query",
+    "start",
+    "results",
+    "features",
+    "num_found"
+})
+public class SearchMultiResult {
+
+    @JsonProperty("query")
+    private String query;
+    @JsonProperty("start")
+    private Long start;
+    @JsonProperty("results")
+    private List<GenomeSearchResult> results;
+    @JsonProperty("features")
+    private List<GenomeFeature> features;
+    @JsonProperty("num_found")
+    private Long numFound;
+    private Map<String, Object> additionalProperties = new HashMap<String, Object>();
+
+    @JsonProperty("query")
+    public String getQuery() {
+        return query;
+    }
+
+    @JsonProperty("query")
+    public void setQuery(String query) {
+        this.query = query;
+    }
+
+    public SearchMultiResult withQuery(String query) {
+        this.query = query;
+        return this;
+    }
+
+    @JsonProperty("start")
+    public Long getStart() {
+        return start;
+    }
+
+    @JsonProperty("start")
+    public void setStart(Long start) {
+        this.start = start;
+    }
+
+    public SearchMultiResult withStart(Long start) {
+        this.start = start;
+        return this;
+    }
+
+    @JsonProperty("results")
+    public List<GenomeSearchResult> getResults() {
+        return results;
+    }
+
+    @JsonProperty("results")
+    public void setResults(List<GenomeSearchResult> results) {
+        this.results = results;
+    }
+
+    public SearchMultiResult withResults(List<GenomeSearchResult> results) {
+        this.results = results;
+        return this;
+    }
+
+    @JsonProperty("features")
+    public List<GenomeFeature> getFeatures() {
+        return features;
+    }
+
+    @JsonProperty("features")
+    public void setFeatures(List<GenomeFeature> features) {
+        this.features = features;
+    }
+
+    public SearchMultiResult withFeatures(List<GenomeFeature> features) {
+        this.features = features;
+        return this;
+    }
+
+    @JsonProperty("num_found")
+    public Long getNumFound() {
+        return numFound;
+    }
+
+    @JsonProperty("num_found")
+    public void setNumFound(Long numFound) {
+        this.numFound = numFound;
+    }
+
+    public SearchMultiResult withNumFound(Long numFound) {
+        this.numFound = numFound;
+        return this;
+    }
+
+    @JsonAnyGetter
+    public Map<String, Object> getAdditionalProperties() {
+        return this.additionalProperties;
+    }
+
+    @JsonAnySetter
+    public void setAdditionalProperties(String name, Object value) {
+        this.additionalProperties.put(name, value);
+    }
+
+    @Override
+    public String toString() {
+        return ((((((((((((("SearchMultiResult"+" [query=")+ query)+", start=")+ start)+", results=")+ results)+", features=")+ features)+", numFound=")+ numFound)+", additionalProperties=")+ additionalProperties)+"]");
+    }
+
+}
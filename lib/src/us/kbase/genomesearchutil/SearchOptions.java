@@ -18,12 +18,23 @@ import us.kbase.common.service.UObject;
  * <p>Original spec-file type: SearchOptions</p>
  * <pre>
  * structured_query - Optional query in object form that uses MongoDB style key-value
- *     matching and $and, $not, and $or keywords.
+ *     matching and $and, $not, and $or keywords. Field value can also be
+ *     an object of operators $gt, $gte, $lt, $lte, $in, $nin, $ne and
+ *     $prefix, e.g. {"length": {"$gt": 3000}}; numeric fields (start,
+ *     length) are compared as numbers.
  * num_found - optional field which when set informs that there
  *     is no need to perform full scan in order to count this
  *     value because it was already done before; please don't
  *     set this value with 0 or any guessed number if you didn't 
  *     get right value previously.
+ * cursor - optional opaque cursor returned with previous page;
+ *     when set, next page is returned starting right after the
+ *     last item of previous page (start and num_found are taken from
+ *     cursor). Cursor can be used only with the same query and
+ *     sorting as ones of previous page.
+ * fields - optional list of FeatureData fields which should be
+ *     returned for every feature (all fields by default), other
+ *     fields are not decoded.
  * </pre>
  * 
  */
@@ -36,7 +47,9 @@ import us.kbase.common.service.UObject;
     "sort_by",
     "start",
     "limit",
-    "num_found"
+    "num_found",
+    "cursor",
+    "fields"
 })
 public class SearchOptions {
 
@@ -54,6 +67,10 @@ public class SearchOptions {
     private java.lang.Long limit;
     @JsonProperty("num_found")
     private java.lang.Long numFound;
+    @JsonProperty("cursor")
+    private java.lang.String cursor;
+    @JsonProperty("fields")
+    private List<String> fields;
     private Map<java.lang.String, Object> additionalProperties = new HashMap<java.lang.String, Object>();
 
     @JsonProperty("ref")
@@ -161,6 +178,36 @@ public class SearchOptions {
         return this;
     }
 
+    @JsonProperty("cursor")
+    public java.lang.String getCursor() {
+        return cursor;
+    }
+
+    @JsonProperty("cursor")
+    public void setCursor(java.lang.String cursor) {
+        this.cursor = cursor;
+    }
+
+    public SearchOptions withCursor(java.lang.String cursor) {
+        this.cursor = cursor;
+        return this;
+    }
+
+    @JsonProperty("fields")
+    public List<String> getFields() {
+        return fields;
+    }
+
+    @JsonProperty("fields")
+    public void setFields(List<String> fields) {
+        this.fields = fields;
+    }
+
+    public SearchOptions withFields(List<String> fields) {
+        this.fields = fields;
+        return this;
+    }
+
     @JsonAnyGetter
     public Map<java.lang.String, Object> getAdditionalProperties() {
         return this.additionalProperties;
@@ -173,7 +220,7 @@ public class SearchOptions {
 
     @Override
     public java.lang.String toString() {
-        return ((((((((((((((((("SearchOptions"+" [ref=")+ ref)+", query=")+ query)+", structuredQuery=")+ structuredQuery)+", sortBy=")+ sortBy)+", start=")+ start)+", limit=")+ limit)+", numFound=")+ numFound)+", additionalProperties=")+ additionalProperties)+"]");
+        return ((((((((((((((((((((("SearchOptions"+" [ref=")+ ref)+", query=")+ query)+", structuredQuery=")+ structuredQuery)+", sortBy=")+ sortBy)+", start=")+ start)+", limit=")+ limit)+", numFound=")+ numFound)+", cursor=")+ cursor)+", fields=")+ fields)+", additionalProperties=")+ additionalProperties)+"]");
     }
 
 }
@@ -2,6 +2,7 @@
 package us.kbase.genomesearchutil;
 
 import java.util.HashMap;
+import java.util.List;
 import java.util.Map;
 import javax.annotation.Generated;
 import com.fasterxml.jackson.annotation.JsonAnyGetter;
@@ -19,6 +20,14 @@ import com.fasterxml.jackson.annotation.JsonPropertyOrder;
  *     value because it was already done before; please don't
  *     set this value with 0 or any guessed number if you didn't 
  *     get right value previously.
+ * cursor - optional opaque cursor returned with previous page;
+ *     when set, next page is returned starting right after the
+ *     last item of previous page (page_start and num_found are taken from
+ *     cursor). Cursor can be used only with the same query and
+ *     sorting as ones of previous page.
+ * fields - optional list of FeatureData fields which should be
+ *     returned for every feature (all fields by default), other
+ *     fields are not decoded.
  * </pre>
  * 
  */
@@ -31,14 +40,16 @@ import com.fasterxml.jackson.annotation.JsonPropertyOrder;
     "query_region_length",
     "page_start",
     "page_limit",
-    "num_found"
+    "num_found",
+    "cursor",
+    "fields"
 })
 public class SearchRegionOptions {
 
     @JsonProperty("ref")
-    private String ref;
+    private java.lang.String ref;
     @JsonProperty("query_contig_id")
-    private String queryContigId;
+    private java.lang.String queryContigId;
     @JsonProperty("query_region_start")
     private Long queryRegionStart;
     @JsonProperty("query_region_length")
@@ -49,34 +60,38 @@ public class SearchRegionOptions {
     private Long pageLimit;
     @JsonProperty("num_found")
     private Long numFound;
-    private Map<String, Object> additionalProperties = new HashMap<String, Object>();
+    @JsonProperty("cursor")
+    private java.lang.String cursor;
+    @JsonProperty("fields")
+    private List<String> fields;
+    private Map<java.lang.String, Object> additionalProperties = new HashMap<java.lang.String, Object>();
 
     @JsonProperty("ref")
-    public String getRef() {
+    public java.lang.String getRef() {
         return ref;
     }
 
     @JsonProperty("ref")
-    public void setRef(String ref) {
+    public void setRef(java.lang.String ref) {
         this.ref = ref;
     }
 
-    public SearchRegionOptions withRef(String ref) {
+    public SearchRegionOptions withRef(java.lang.String ref) {
         this.ref = ref;
         return this;
     }
 
     @JsonProperty("query_contig_id")
-    public String getQueryContigId() {
+    public java.lang.String getQueryContigId() {
         return queryContigId;
     }
 
     @JsonProperty("query_contig_id")
-    public void setQueryContigId(String queryContigId) {
+    public void setQueryContigId(java.lang.String queryContigId) {
         this.queryContigId = queryContigId;
     }
 
-    public SearchRegionOptions withQueryContigId(String queryContigId) {
+    public SearchRegionOptions withQueryContigId(java.lang.String queryContigId) {
         this.queryContigId = queryContigId;
         return this;
     }
@@ -156,19 +171,49 @@ public class SearchRegionOptions {
         return this;
     }
 
+    @JsonProperty("cursor")
+    public java.lang.String getCursor() {
+        return cursor;
+    }
+
+    @JsonProperty("cursor")
+    public void setCursor(java.lang.String cursor) {
+        this.cursor = cursor;
+    }
+
+    public SearchRegionOptions withCursor(java.lang.String cursor) {
+        this.cursor = cursor;
+        return this;
+    }
+
+    @JsonProperty("fields")
+    public List<String> getFields() {
+        return fields;
+    }
+
+    @JsonProperty("fields")
+    public void setFields(List<String> fields) {
+        this.fields = fields;
+    }
+
+    public SearchRegionOptions withFields(List<String> fields) {
+        this.fields = fields;
+        return this;
+    }
+
     @JsonAnyGetter
-    public Map<String, Object> getAdditionalProperties() {
+    public Map<java.lang.String, Object> getAdditionalProperties() {
         return this.additionalProperties;
     }
 
     @JsonAnySetter
-    public void setAdditionalProperties(String name, Object value) {
+    public void setAdditionalProperties(java.lang.String name, Object value) {
         this.additionalProperties.put(name, value);
     }
 
     @Override
-    public String toString() {
-        return ((((((((((((((((("SearchRegionOptions"+" [ref=")+ ref)+", queryContigId=")+ queryContigId)+", queryRegionStart=")+ queryRegionStart)+", queryRegionLength=")+ queryRegionLength)+", pageStart=")+ pageStart)+", pageLimit=")+ pageLimit)+", numFound=")+ numFound)+", additionalProperties=")+ additionalProperties)+"]");
+    public java.lang.String toString() {
+        return ((((((((((((((((((((("SearchRegionOptions"+" [ref=")+ ref)+", queryContigId=")+ queryContigId)+", queryRegionStart=")+ queryRegionStart)+", queryRegionLength=")+ queryRegionLength)+", pageStart=")+ pageStart)+", pageLimit=")+ pageLimit)+", numFound=")+ numFound)+", cursor=")+ cursor)+", fields=")+ fields)+", additionalProperties=")+ additionalProperties)+"]");
     }
 
 }
@@ -17,6 +17,7 @@ import com.fasterxml.jackson.annotation.JsonPropertyOrder;
  * <pre>
  * num_found - number of all items found in query search (with 
  *     only part of it returned in "features" list).
+ * cursor - opaque cursor of next page (null for the last page).
  * </pre>
  * 
  */
@@ -28,7 +29,8 @@ import com.fasterxml.jackson.annotation.JsonPropertyOrder;
     "query_region_length",
     "page_start",
     "features",
-    "num_found"
+    "num_found",
+    "cursor"
 })
 public class SearchRegionResult {
 
@@ -44,6 +46,8 @@ public class SearchRegionResult {
     private List<FeatureData> features;
     @JsonProperty("num_found")
     private Long numFound;
+    @JsonProperty("cursor")
+    private String cursor;
     private Map<String, Object> additionalProperties = new HashMap<String, Object>();
 
     @JsonProperty("query_contig_id")
@@ -136,6 +140,21 @@ public class SearchRegionResult {
         return this;
     }
 
+    @JsonProperty("cursor")
+    public String getCursor() {
+        return cursor;
+    }
+
+    @JsonProperty("cursor")
+    public void setCursor(String cursor) {
+        this.cursor = cursor;
+    }
+
+    public SearchRegionResult withCursor(String cursor) {
+        this.cursor = cursor;
+        return this;
+    }
+
     @JsonAnyGetter
     public Map<String, Object> getAdditionalProperties() {
         return this.additionalProperties;
@@ -148,7 +167,7 @@ public class SearchRegionResult {
 
     @Override
     public String toString() {
-        return ((((((((((((((("SearchRegionResult"+" [queryContigId=")+ queryContigId)+", queryRegionStart=")+ queryRegionStart)+", queryRegionLength=")+ queryRegionLength)+", pageStart=")+ pageStart)+", features=")+ features)+", numFound=")+ numFound)+", additionalProperties=")+ additionalProperties)+"]");
+        return ((((((((((((((((("SearchRegionResult"+" [queryContigId=")+ queryContigId)+", queryRegionStart=")+ queryRegionStart)+", queryRegionLength=")+ queryRegionLength)+", pageStart=")+ pageStart)+", features=")+ features)+", numFound=")+ numFound)+", cursor=")+ cursor)+", additionalProperties=")+ additionalProperties)+"]");
     }
 
 }
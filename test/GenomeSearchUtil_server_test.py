@@ -21,6 +21,7 @@ from biokbase.workspace.client import Workspace as workspaceService
 from GenomeAnnotationAPI.GenomeAnnotationAPIClient import GenomeAnnotationAPI
 from GenomeSearchUtil.GenomeSearchUtilImpl import GenomeSearchUtil
 from GenomeSearchUtil.GenomeSearchUtilServer import MethodContext
+from GenomeSearchUtil.JsonSerializer import JsonFragment, get_serializer
 from GenomeSearchUtil.authclient import KBaseAuth as _KBaseAuth
 
 
@@ -219,6 +220,86 @@ class GenomeSearchUtilTest(unittest.TestCase):
         self.assertTrue("num_found" in ret)
         self.assertEqual(ret["num_found"], 1)
 
+    def test_search_multi(self):
+        refs = [self.banno_ref, self.rhodo_ref, "0/0/0"]
+        ret = self.getImpl().search_multi(self.getContext(),
+                                          {"refs": refs,
+                                           "query": "",
+                                           "sort_by": [["feature_id", True]],
+                                           "limit": 5})[0]
+        self.assertEqual([x["ref"] for x in ret["results"]], refs)
+        self.assertEqual(ret["results"][0]["num_found"], 5017)
+        self.assertEqual(ret["results"][1]["num_found"], 4158)
+        self.assertEqual(len(ret["results"][1]["features"]), 5)
+        self.assertTrue("error" in ret["results"][2])
+        ret = self.getImpl().search_multi(self.getContext(),
+                                          {"refs": refs,
+                                           "query": "",
+                                           "sort_by": [["length", False]],
+                                           "limit": 5,
+                                           "merge": 1})[0]
+        self.assertEqual(ret["num_found"], 5017 + 4158)
+        self.assertEqual(len(ret["features"]), 5)
+        lengths = [x["feature"]["global_location"]["length"] for x in ret["features"]]
+        self.assertEqual(lengths, sorted(lengths, reverse=True))
+
+    def test_search_fields(self):
+        ret = self.getImpl().search(self.getContext(),
+                                    {"ref": self.rhodo_ref,
+                                     "query": "dehydrogenase",
+                                     "limit": 10,
+                                     "fields": ["feature_id", "function"]})[0]
+        self.assertEqual(len(ret["features"]), 10)
+        for feature in ret["features"]:
+            self.assertEqual(sorted(feature.keys()), ["feature_id", "function"])
+        ret = self.getImpl().search_region(self.getContext(),
+                                           {"ref": self.rhodo_ref,
+                                            "query_contig_id": "NODE_48_length_21448_cov_4.91263_ID_95",
+                                            "query_region_start": 0,
+                                            "query_region_length": 10000,
+                                            "page_limit": 5,
+                                            "fields": ["global_location"]})[0]
+        self.assertEqual(len(ret["features"]), 5)
+        for feature in ret["features"]:
+            self.assertEqual(list(feature.keys()), ["global_location"])
+        with self.assertRaisesRegex(ValueError, "Unknown feature field"):
+            self.getImpl().search(self.getContext(),
+                                  {"ref": self.rhodo_ref, "fields": ["name"]})
+
+    def test_search_fragments(self):
+        # Server serializer splices features prepared at index build time
+        params = {"ref": self.rhodo_ref, "query": "dehydrogenase", "limit": 10}
+        ret = self.getImpl().search(self.getContext(), params)[0]
+        ctx = self.getContext()
+        ctx["json_fragments"] = 1
+        fragment_ret = self.getImpl().search(ctx, params)[0]
+        self.assertEqual(len(fragment_ret["features"]), 10)
+        for feature in fragment_ret["features"]:
+            self.assertIsInstance(feature, JsonFragment)
+        self.assertEqual(json.loads(get_serializer().dumps(fragment_ret).decode("utf-8")),
+                         json.loads(json.dumps(ret)))
+        fields_params = dict(params, fields=["feature_id"])
+        self.assertEqual(self.getImpl().search(ctx, fields_params)[0]["features"],
+                         self.getImpl().search(self.getContext(),
+                                               fields_params)[0]["features"])
+
+    def test_get_features(self):
+        ret = self.getImpl().get_features(self.getContext(),
+                                          {"ref": self.rhodo_ref,
+                                           "feature_ids": ["kb|g.220339.CDS.2",
+                                                           "unknown_id",
+                                                           "kb|g.220339.CDS.2"]})[0]
+        self.assertEqual(list(ret["features"].keys()), ["kb|g.220339.CDS.2"])
+        features = ret["features"]["kb|g.220339.CDS.2"]
+        self.assertEqual(len(features), 1)
+        self.assertEqual(features[0]["feature_id"], "kb|g.220339.CDS.2")
+        self.assertEqual(ret["not_found"], ["unknown_id"])
+        search_ret = self.getImpl().search(self.getContext(),
+                                           {"ref": self.rhodo_ref,
+                                            "structured_query": {
+                                                "feature_id": "kb|g.220339.CDS.2"}})[0]
+        self.assertEqual(features, search_ret["features"])
+
     def test_rhodobacter_genome_regions(self):
         ret = self.getImpl().search_region(self.getContext(),
                                            {"ref": self.rhodo_ref,
@@ -0,0 +1,110 @@
+import json
+import multiprocessing
+import os
+import shutil
+import socket
+import tempfile
+import threading
+import time
+import unittest
+
+from GenomeSearchUtil.BuildCoordinator import BuildCoordinator
+
+
+def _build_in_process(lock_dir, target):
+    # Appends pid to counter file and creates target file after a delay
+    def build_func():
+        with open(target + ".builds", "a") as f:
+            f.write(str(os.getpid()) + "\n")
+        time.sleep(0.3)
+        with open(target, "w") as f:
+            f.write("done")
+    BuildCoordinator(lock_dir, poll_interval=0.01).build(
+        "test_ftr", lambda: os.path.isfile(target), build_func)
+
+
+class BuildCoordinatorTest(unittest.TestCase):
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.target = os.path.join(self.test_dir, "test_ftr.tsv.gz")
+        self.coordinator = BuildCoordinator(self.test_dir, stale_timeout=60,
+                                            poll_interval=0.01)
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def is_built(self):
+        return os.path.isfile(self.target)
+
+    def write_target(self):
+        with open(self.target, "w") as f:
+            f.write("done")
+
+    def test_threads(self):
+        builds = []
+
+        def build_func():
+            builds.append(threading.get_ident())
+            time.sleep(0.2)
+            self.write_target()
+        threads = [threading.Thread(target=self.coordinator.build,
+                                    args=("test_ftr", self.is_built, build_func))
+                   for _ in range(5)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(len(builds), 1)
+        self.assertEqual(os.listdir(self.test_dir), ["test_ftr.tsv.gz"])
+        self.assertEqual(self.coordinator.key_locks, {})
+
+    def test_processes(self):
+        ctx = multiprocessing.get_context("fork")
+        procs = [ctx.Process(target=_build_in_process, args=(self.test_dir, self.target))
+                 for _ in range(4)]
+        for p in procs:
+            p.start()
+        for p in procs:
+            p.join()
+        with open(self.target + ".builds") as f:
+            self.assertEqual(len(f.readlines()), 1)
+        self.assertFalse(os.path.exists(os.path.join(self.test_dir, "test_ftr.lock")))
+
+    def test_failed_build(self):
+        def build_func():
+            raise ValueError("WS error")
+        with self.assertRaisesRegex(ValueError, "WS error"):
+            self.coordinator.build("test_ftr", self.is_built, build_func)
+        self.assertTrue(self.coordinator.build("test_ftr", self.is_built, self.write_target))
+        self.assertFalse(self.coordinator.build("test_ftr", self.is_built, self.write_target))
+
+    def write_lock(self, info, age=0):
+        lock_file = os.path.join(self.test_dir, "test_ftr.lock")
+        with open(lock_file, "w") as f:
+            f.write(info if isinstance(info, str) else json.dumps(info))
+        mtime = time.time() - age
+        os.utime(lock_file, (mtime, mtime))
+
+    def test_stale_lock_of_dead_process(self):
+        proc = multiprocessing.get_context("fork").Process(target=lambda: None)
+        proc.start()
+        proc.join()
+        self.write_lock({"pid": proc.pid, "host": socket.gethostname(), "time": time.time()})
+        self.assertTrue(self.coordinator.build("test_ftr", self.is_built, self.write_target))
+        self.assertEqual(os.listdir(self.test_dir), ["test_ftr.tsv.gz"])
+
+    def test_stale_lock_by_age(self):
+        self.write_lock({"pid": os.getpid(), "host": "other-host", "time": 0}, age=61)
+        self.assertTrue(self.coordinator.build("test_ftr", self.is_built, self.write_target))
+        self.write_lock("", age=61)
+        os.remove(self.target)
+        self.assertTrue(self.coordinator.build("test_ftr", self.is_built, self.write_target))
+
+    def test_waiting_for_live_lock(self):
+        self.write_lock({"pid": os.getpid(), "host": socket.gethostname(), "time": 0})
+        # Other builder finishes while we are waiting
+        timer = threading.Timer(0.1, self.write_target)
+        timer.start()
+        self.assertFalse(self.coordinator.build("test_ftr", self.is_built, self.write_target))
+        timer.join()
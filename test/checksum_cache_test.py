@@ -0,0 +1,86 @@
+import threading
+import time
+import unittest
+
+from GenomeSearchUtil.ChecksumCache import ChecksumCache
+
+
+class ChecksumCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.now = 1000.0
+        self.calls = []
+        self.cache = ChecksumCache(60, max_size=3, clock=lambda: self.now)
+
+    def load(self, ref, token):
+        self.calls.append((ref, token))
+        return "chsum_" + ref + "_" + str(len(self.calls))
+
+    def test_ttl(self):
+        self.assertEqual(self.cache.get("1/2", "tok1", self.load), "chsum_1/2_1")
+        self.now += 59
+        self.assertEqual(self.cache.get("1/2", "tok1", self.load), "chsum_1/2_1")
+        self.now += 2
+        self.assertEqual(self.cache.get("1/2", "tok1", self.load), "chsum_1/2_2")
+        self.assertEqual(self.cache.hits, 1)
+        self.assertEqual(self.cache.misses, 2)
+
+    def test_immutable_and_identity(self):
+        self.cache.get("1/2/3", "tok1", self.load)
+        self.now += 3599
+        self.assertEqual(self.cache.get("1/2/3", "tok1", self.load), "chsum_1/2/3_1")
+        # Other user has to pass WS access check
+        self.assertEqual(self.cache.get("1/2/3", "tok2", self.load), "chsum_1/2/3_2")
+        self.assertEqual(self.cache.get("ws/2/3", "tok1", self.load), "chsum_ws/2/3_3")
+        self.now += 61
+        self.assertEqual(self.cache.get("ws/2/3", "tok1", self.load), "chsum_ws/2/3_4")
+        # Access to immutable object is checked again after immutable TTL
+        self.assertEqual(self.cache.get("1/2/3", "tok1", self.load), "chsum_1/2/3_5")
+
+    def test_max_size(self):
+        for ref in ["1/1/1", "1/2/1", "1/3/1", "1/4/1"]:
+            self.cache.get(ref, "tok", self.load)
+        self.assertEqual(len(self.cache.entries), 3)
+        self.cache.get("1/1/1", "tok", self.load)
+        self.assertEqual(len(self.calls), 5)
+
+    def test_errors_not_cached(self):
+        def fail(ref, token):
+            raise ValueError("No access")
+        with self.assertRaises(ValueError):
+            self.cache.get("1/2/3", "tok", fail)
+        self.assertEqual(self.cache.get("1/2/3", "tok", self.load), "chsum_1/2/3_1")
+
+    def test_coalescing(self):
+        started = threading.Event()
+
+        def slow_load(ref, token):
+            started.set()
+            time.sleep(0.2)
+            return self.load(ref, token)
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(
+            self.cache.get("1/2/3", "tok", slow_load))) for _ in range(5)]
+        threads[0].start()
+        started.wait()
+        for t in threads[1:]:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(results, ["chsum_1/2/3_1"] * 5)
+        self.assertEqual(len(self.calls), 1)
+
+    def test_get_many(self):
+        batches = []
+
+        def load_many(refs, token):
+            batches.append(refs)
+            return [None if ref == "1/9/1" else self.load(ref, token) for ref in refs]
+        self.cache.get("1/1/1", "tok", self.load)
+        self.assertEqual(self.cache.get_many(["1/2/1", "1/1/1", "1/9/1", "1/2/1"], "tok",
+                                             load_many),
+                         ["chsum_1/2/1_2", "chsum_1/1/1_1", None, "chsum_1/2/1_2"])
+        # only cached refs were skipped, unresolved ones are not cached
+        self.assertEqual(batches, [["1/2/1", "1/9/1"]])
+        self.cache.get_many(["1/2/1", "1/9/1"], "tok", load_many)
+        self.assertEqual(batches, [["1/2/1", "1/9/1"], ["1/9/1"]])
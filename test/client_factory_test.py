@@ -0,0 +1,107 @@
+import json
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+
+from GenomeSearchUtil.ClientFactory import ClientFactory
+from Workspace.baseclient import BaseClient, ServerError
+from Workspace.WorkspaceClient import Workspace
+from WsLargeDataIO import baseclient as ws_large_data_baseclient
+from WsLargeDataIO.WsLargeDataIOClient import WsLargeDataIO
+
+
+class _RpcHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        request = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        self.server.tokens.append(self.headers.get("Authorization"))
+        if request["method"] == "Workspace.ver":
+            code, body = 200, {"result": [str(self.server.connections)]}
+        else:
+            code, body = 500, {"error": {"name": "JSONRPCError", "code": -32601,
+                                         "message": "Unknown method", "data": ""}}
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+class _RpcServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+    def get_request(self):
+        self.connections += 1
+        return HTTPServer.get_request(self)
+
+
+class ClientFactoryTest(unittest.TestCase):
+
+    def setUp(self):
+        self.server = _RpcServer(("127.0.0.1", 0), _RpcHandler)
+        self.server.connections = 0
+        self.server.tokens = []
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.url = "http://127.0.0.1:" + str(self.server.server_address[1])
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_connection_reuse(self):
+        factory = ClientFactory()
+        client = factory.get_client(Workspace, self.url, "token1")
+        self.assertIs(factory.get_client(Workspace, self.url, "token1"), client)
+        self.assertIsNot(factory.get_client(Workspace, self.url, "token2"), client)
+        for _ in range(5):
+            self.assertEqual(client.ver(), "1")
+        self.assertEqual(factory.get_client(Workspace, self.url, "token2").ver(), "1")
+        self.assertEqual(self.server.connections, 1)
+        self.assertEqual(self.server.tokens, ["token1"] * 5 + ["token2"])
+
+    def test_threads(self):
+        factory = ClientFactory()
+        client = factory.get_client(Workspace, self.url, "token")
+        results = []
+
+        def call():
+            for _ in range(3):
+                results.append(client.ver())
+        threads = [threading.Thread(target=call) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(results), 12)
+        self.assertLessEqual(self.server.connections, 4)
+
+    def test_server_error(self):
+        client = ClientFactory().get_client(Workspace, self.url, "token")
+        with self.assertRaisesRegex(ServerError, "Unknown method"):
+            client.get_object_info_new({"objects": []})
+
+    def test_own_base_client(self):
+        # Base client of generated client module is kept with its options
+        factory = ClientFactory()
+        client = factory.get_client(Workspace, self.url, "token", timeout=60)
+        self.assertIsInstance(client._client, BaseClient)
+        self.assertEqual(client._client.timeout, 60)
+        self.assertIsNot(factory.get_client(Workspace, self.url, "token"), client)
+        large_data = factory.get_client(WsLargeDataIO, self.url)
+        self.assertIsInstance(large_data._client, ws_large_data_baseclient.BaseClient)
+        self.assertIs(type(large_data._client).run_job,
+                      ws_large_data_baseclient.BaseClient.run_job)
+        self.assertNotIn("token", [item for key in factory.clients for item in key])
+
+    def test_max_clients(self):
+        factory = ClientFactory(max_clients=2)
+        client = factory.get_client(Workspace, self.url, "token1")
+        factory.get_client(Workspace, self.url, "token2")
+        factory.get_client(Workspace, self.url, "token3")
+        self.assertIsNot(factory.get_client(Workspace, self.url, "token1"), client)
@@ -0,0 +1,95 @@
+import os
+import shutil
+import tempfile
+import tracemalloc
+import unittest
+
+from GenomeSearchUtil.ColumnarIndex import ColumnarIndex, build_columnar_index
+
+
+class ColumnarIndexTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.lines = [
+            '{"p": 0, "arr": "cdss"}\tb0001_CDS_1\tCDS\tNC_000913.3\t190\t+\t66\tb0001\tthr operon leader peptide\t\n',
+            '{"p": 0, "arr": "features"}\tb0002\tgene\tNC_000913.3\t337\t+\t2463\tthrA\tBifunctional aspartokinase/homoserine dehydrogenase 1\t\n',
+            '{"p": 1, "arr": "features"}\tb0003\tgene\t\t\t\t\t\tÄÖ function\t\n',
+        ]
+        cls.props_map = {
+            "feature_id": {"col": 2, "type": ""},
+            "feature_type": {"col": 3, "type": ""},
+            "contig_id": {"col": 4, "type": ""},
+            "start": {"col": 5, "type": "n"},
+            "strand": {"col": 6, "type": ""},
+            "length": {"col": 7, "type": "n"},
+            "function": {"col": 9, "type": ""}
+        }
+        cls.test_dir = tempfile.mkdtemp()
+        cls.index_file = os.path.join(cls.test_dir, "test_ftr_col.bin")
+        build_columnar_index(cls.lines, cls.props_map, cls.index_file)
+        cls.index = ColumnarIndex(cls.index_file)
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.test_dir)
+
+    def test_heap_size(self):
+        # Estimate covers dictionaries decoded completely
+        lines = ["{}\tf" + str(i) + "\tgene\tc" + str(i % 100) + "\t" + str(i) +
+                 "\t+\t1\t\tfunction " + str(i % 1000) + "\t" for i in range(5000)]
+        index_file = os.path.join(self.test_dir, "heap_ftr_col.bin")
+        build_columnar_index(lines, self.props_map, index_file)
+        tracemalloc.start()
+        try:
+            index = ColumnarIndex(index_file)
+            for row_id in range(index.row_count):
+                for col_pos in range(1, 9):
+                    index.get_value(row_id, col_pos)
+            allocated = tracemalloc.get_traced_memory()[0]
+        finally:
+            tracemalloc.stop()
+        self.assertGreater(index.get_heap_size(), allocated / 2)
+        self.assertLess(index.get_heap_size(), allocated * 2)
+
+    def test_numeric_column_with_text(self):
+        # Numeric column becomes text one at first non-integer value
+        index_file = os.path.join(self.test_dir, "text_ftr_col.bin")
+        values = ["5", "", "-3", "12", "007", "4"]
+        build_columnar_index(("x\t" + value + "\n" for value in values),
+                             {"n": {"col": 2, "type": "n"}}, index_file)
+        index = ColumnarIndex(index_file)
+        self.assertEqual(index.column_meta["n"]["kind"], "dict")
+        self.assertEqual([index.get_value(row_id, 1) for row_id in range(6)], values)
+        self.assertEqual(list(index.get_column("n").sorted_rows), [1, 2, 4, 3, 5, 0])
+
+    def test_lines(self):
+        self.assertEqual(self.index.row_count, 3)
+        for row_id, line in enumerate(self.lines):
+            self.assertEqual(self.index.get_line(row_id), line.rstrip('\n'))
+
+    def test_values(self):
+        for row_id, line in enumerate(self.lines):
+            items = line.rstrip('\n').split('\t')
+            for col_pos, value in enumerate(items):
+                self.assertEqual(self.index.get_value(row_id, col_pos), value)
+            view = self.index.get_row_view(row_id, 1)
+            self.assertEqual(view[0], items[1])
+            self.assertEqual(view[5], items[6])
+
+    def test_columns(self):
+        self.assertEqual(self.index.get_column("start").get(2), "")
+        self.assertEqual(list(self.index.get_column("length").values)[:2], [66, 2463])
+        feature_types = self.index.get_column("feature_type")
+        self.assertEqual(feature_types.find_code("gene"), feature_types.codes[1])
+        self.assertIsNone(feature_types.find_code("mRNA"))
+
+    def test_find_rows(self):
+        lengths = self.index.get_column("length")
+        self.assertEqual(list(lengths.find_rows(low=66)), [0, 1])
+        self.assertEqual(list(lengths.find_rows(low=66, low_inclusive=False)), [1])
+        self.assertEqual(list(lengths.find_rows(high=2463, high_inclusive=False)), [0])
+        self.assertEqual(list(lengths.find_rows(low=100, high=50)), [])
+        contig_ids = self.index.get_column("contig_id")
+        code_range = contig_ids.find_code_range(low="NC_", high="NC_\uffff")
+        self.assertEqual(sorted(contig_ids.find_rows(code_range)), [0, 1])
+        self.assertEqual(list(contig_ids.find_rows(contig_ids.find_code_range(high=""))), [2])
@@ -0,0 +1,33 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from GenomeSearchUtil.ColumnarIndex import ColumnarIndex, build_columnar_index
+from GenomeSearchUtil.GenomeSearchUtilIndexer import GenomeSearchUtilIndexer
+
+
+class ContigLookupTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.test_dir = tempfile.mkdtemp()
+        cls.indexer = GenomeSearchUtilIndexer({"workspace-url": "http://localhost",
+                                               "genome-index-dir": cls.test_dir})
+        cls.contigs = {"ctg_" + str(i * 7 % 1000): [i * 10, i % 5] for i in range(1000)}
+        lines = [contig_id + "\t" + str(values[0]) + "\t" + str(values[1]) + "\n"
+                 for contig_id, values in cls.contigs.items()]
+        index_file = os.path.join(cls.test_dir, "test_ctg_col.bin")
+        build_columnar_index(lines, cls.indexer.contig_column_props_map, index_file)
+        cls.table = ColumnarIndex(index_file)
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.test_dir)
+
+    def test_find_contig(self):
+        for contig_id, values in self.contigs.items():
+            self.assertEqual(self.indexer.find_contig(self.table, contig_id),
+                             {"contig_id": contig_id, "length": values[0],
+                              "feature_count": values[1]})
+        self.assertIsNone(self.indexer.find_contig(self.table, "ctg_1000"))
+        self.assertIsNone(self.indexer.find_contig(self.table, ""))
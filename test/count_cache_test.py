@@ -0,0 +1,29 @@
+import unittest
+
+from GenomeSearchUtil.CountCache import CountCache, get_count_key
+
+
+class CountCacheTest(unittest.TestCase):
+
+    def test_key_normalization(self):
+        self.assertEqual(get_count_key("c1", "ftr", ["kinase", "protein", "kinase"]),
+                         get_count_key("c1", "ftr", ["protein", "kinase"], {}))
+        self.assertEqual(get_count_key("c1", "ftr", [], {"a": "1", "b": {"$gt": 2}}),
+                         get_count_key("c1", "ftr", [], {"b": {"$gt": 2}, "a": "1"}))
+        self.assertNotEqual(get_count_key("c1", "ftr", ["kinase"]),
+                            get_count_key("c2", "ftr", ["kinase"]))
+        self.assertNotEqual(get_count_key("c1", "ftr", ["kinase"]),
+                            get_count_key("c1", "ctg", ["kinase"]))
+
+    def test_lru_and_stats(self):
+        cache = CountCache(2)
+        self.assertIsNone(cache.get("a"))
+        cache.put("a", 10)
+        cache.put("b", 0)
+        self.assertEqual(cache.get("a"), 10)
+        # "b" is least recently used now
+        cache.put("c", 5)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("c"), 5)
+        self.assertEqual(cache.get_stats(), {"entries": 2, "max_size": 2,
+                                             "hits": 2, "misses": 2})
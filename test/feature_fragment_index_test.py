@@ -0,0 +1,44 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from GenomeSearchUtil.FeatureFragmentIndex import FeatureFragmentIndex, build_fragment_index
+
+
+class FeatureFragmentIndexTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.features = [
+            {"feature_id": "b0001", "aliases": {"thrL": []}, "function": "",
+             "location": [{"contig_id": "NC_000913.3", "start": 190, "strand": "+",
+                           "length": 66}], "feature_idx": 0},
+            {"feature_id": "генÄ", "aliases": {}, "function": "β-lactamase\t\"x\"",
+             "location": [], "feature_idx": 1},
+            {},
+        ]
+        cls.features += [{"feature_id": "f" + str(i), "feature_idx": i}
+                         for i in range(3, 1000)]
+        cls.test_dir = tempfile.mkdtemp()
+        cls.index_file = os.path.join(cls.test_dir, "test_ftr_frag.bin")
+        build_fragment_index(iter(cls.features), cls.index_file)
+        cls.index = FeatureFragmentIndex(cls.index_file)
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.test_dir)
+
+    def test_fragments(self):
+        self.assertEqual(self.index.row_count, len(self.features))
+        for row_id, feature in enumerate(self.features):
+            fragment = self.index.get_fragment(row_id)
+            self.assertIsInstance(fragment.data, bytes)
+            self.assertEqual(json.loads(fragment.data.decode("utf-8")), feature)
+            self.assertEqual(fragment.toJSONable(), feature)
+        self.assertEqual(self.index.get_fragment(2).data, b"{}")
+
+    def test_empty(self):
+        index_file = os.path.join(self.test_dir, "empty_ftr_frag.bin")
+        build_fragment_index([], index_file)
+        self.assertEqual(FeatureFragmentIndex(index_file).row_count, 0)
@@ -0,0 +1,46 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from GenomeSearchUtil.FeatureIdIndex import FeatureIdIndex, build_id_index
+
+
+class FeatureIdIndexTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.lines = [
+            '{"p": 0}\tb0001\tgene\tNC_000913.3\t190\t+\t66\tthrL,b0001\t\t\n',
+            '{"p": 1}\tb0002\tgene\tNC_000913.3\t337\t+\t2463\tthrA,ECK0002\t\t\n',
+            '{"p": 0}\tb0001_CDS_1\tCDS\tNC_000913.3\t190\t+\t66\tthrL\t\t\n',
+            '{"p": 2}\t\tgene\tNC_000913.3\t10\t+\t5\t\t\t\n',
+            '{"p": 3}\tгенÄ\tgene\tNC_000913.3\t10\t+\t5\t\t\t\n',
+        ]
+        # Many more keys to have collisions in hash table
+        cls.lines += ['{"p": ' + str(i) + '}\tf' + str(i) + '\tgene\tc\t1\t+\t1\ta' +
+                      str(i % 100) + '\t\t\n' for i in range(4, 3000)]
+        cls.test_dir = tempfile.mkdtemp()
+        cls.index_file = os.path.join(cls.test_dir, "test_ftr_ids.bin")
+        build_id_index(cls.lines, cls.index_file)
+        cls.index = FeatureIdIndex(cls.index_file)
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.test_dir)
+
+    def test_ids_and_aliases(self):
+        self.assertEqual(list(self.index.get_rows("b0001")), [0])
+        self.assertEqual(list(self.index.get_rows("thrL")), [0, 2])
+        self.assertEqual(list(self.index.get_rows("ECK0002")), [1])
+        self.assertEqual(list(self.index.get_rows("генÄ")), [4])
+        self.assertEqual(self.index.row_count, len(self.lines))
+
+    def test_missing_keys(self):
+        for key in ["", "b000", "b0001 ", "THRL", "f3000", "a100"]:
+            self.assertEqual(len(self.index.get_rows(key)), 0)
+
+    def test_all_keys(self):
+        for i in range(4, 3000):
+            self.assertEqual(list(self.index.get_rows("f" + str(i))), [i + 1])
+        self.assertEqual(list(self.index.get_rows("a7")),
+                         [i + 1 for i in range(4, 3000) if i % 100 == 7])
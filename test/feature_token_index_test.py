@@ -0,0 +1,61 @@
+import os
+import shutil
+import tempfile
+import tracemalloc
+import unittest
+
+from GenomeSearchUtil.FeatureTokenIndex import FeatureTokenIndex, build_token_index
+
+
+class FeatureTokenIndexTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.rows = [
+            'b0001_CDS_1\tCDS\tNC_000913.3\t190\t+\t66\tb0001,thrL\tthr operon leader peptide\tGO:0009088,threonine biosynthetic process\n',
+            'b0002\tgene\tNC_000913.3\t337\t+\t2463\tthrA,ECK0002\tBifunctional aspartokinase/homoserine dehydrogenase 1\t\n',
+            'kb|g.220339.CDS.2\tCDS\tNODE_48\t15\t-\t300\t\tHypothetical protein\t\n',
+        ]
+        cls.test_dir = tempfile.mkdtemp()
+        cls.index_file = os.path.join(cls.test_dir, "test_ftr_tok.bin")
+        build_token_index(cls.rows, cls.index_file)
+        cls.index = FeatureTokenIndex(cls.index_file)
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.test_dir)
+
+    def brute_force(self, words):
+        return set(i for i, row in enumerate(self.rows)
+                   if all(word in row.lower() for word in words))
+
+    def test_heap_size(self):
+        # Estimate is close to memory really allocated by opened index
+        rows = ["f" + str(i) + "\tgene\tc\t1\t+\t1\t\tfunction " + hex(i * 7919)
+                for i in range(5000)]
+        index_file = os.path.join(self.test_dir, "heap_ftr_tok.bin")
+        build_token_index(rows, index_file)
+        tracemalloc.start()
+        try:
+            index = FeatureTokenIndex(index_file)
+            allocated = tracemalloc.get_traced_memory()[0]
+        finally:
+            tracemalloc.stop()
+        self.assertGreater(index.get_heap_size(), allocated / 2)
+        self.assertLess(index.get_heap_size(), allocated * 2)
+
+    def test_candidates_cover_substring_matches(self):
+        for words in [["thr"], ["dehydrogenase"], ["cds"], ["nc_000913", "operon"],
+                      ["go:0009088"], ["kb|g.2203"], ["ase/hom"], ["hypothetical", "protein"],
+                      ["0002"], ["missing"]]:
+            candidates = self.index.get_candidates(words)
+            self.assertTrue(self.brute_force(words).issubset(candidates), words)
+
+    def test_candidates_are_narrowed(self):
+        self.assertEqual(self.index.get_candidates(["dehydrogenase"]), {1})
+        self.assertEqual(self.index.get_candidates(["cds", "node"]), {2})
+        self.assertEqual(self.index.get_candidates(["missing"]), set())
+
+    def test_short_words(self):
+        self.assertIsNone(self.index.get_candidates([]))
+        self.assertIsNone(self.index.get_candidates(["a", "b0"]))
+        self.assertEqual(self.index.get_candidates(["a", "leader"]), {0})
@@ -0,0 +1,152 @@
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from concurrent.futures.process import BrokenProcessPool
+from unittest import mock
+
+import GenomeSearchUtil.FeatureTsv as feature_tsv_module
+from GenomeSearchUtil.ColumnarIndex import build_columnar_index
+from GenomeSearchUtil.CombinedLineIterator import CombinedLineIterator
+import GenomeSearchUtil.GenomeSearchUtilIndexer as indexer_module
+from GenomeSearchUtil.GenomeSearchUtilIndexer import GenomeSearchUtilIndexer
+from GenomeSearchUtil.SortIndex import build_sort_index
+
+
+class _DyingFeature:
+    # Kills worker process unpickling it
+
+    def __reduce__(self):
+        return (os._exit, (1,))
+
+
+class FeatureTsvTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.test_dir = tempfile.mkdtemp()
+        cls.indexer = GenomeSearchUtilIndexer({"workspace-url": "http://localhost",
+                                               "genome-index-dir": cls.test_dir})
+        # Arrays are listed in other order than rows in TSV file
+        cls.genome = {
+            "cdss": [{"id": "b0001_CDS_1", "location": [["NC_1", 190, "+", 66]],
+                      "functions": ["thr operon\tleader peptide"],
+                      "ontology_terms": {"GO": {"GO:0009088": [1]}}}],
+            "features": [{"id": "b0001", "type": "gene", "aliases": [["gene", "thrL"]],
+                          "location": [["NC_1", 190, "+", 66]]},
+                         {"id": "b0002", "location": [["NC_1", 500, "-", 10],
+                                                      ["NC_1", 450, "-", 20],
+                                                      ["NC_2", 1, "+", 5]]}],
+            "ontologies_present": {"GO": {"GO:0009088": "threonine, biosynthetic process"}},
+            "non_coding_features": [{"id": "rna1", "function": "tRNA"}],
+            "mrnas": []
+        }
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.test_dir)
+
+    def read_tsv(self, inner_chsum):
+        with CombinedLineIterator(os.path.join(self.test_dir, inner_chsum + "_ftr.tsv")) as f:
+            return list(f)
+
+    def test_json_file_streaming(self):
+        self.indexer.save_feature_tsv(json.loads(json.dumps(self.genome)), "dict")
+        json_file = os.path.join(self.test_dir, "genome.json")
+        with open(json_file, "w") as f:
+            json.dump(self.genome, f)
+        self.indexer.save_feature_tsv_from_json_file(json_file, "file")
+        lines = self.read_tsv("dict")
+        self.assertEqual(self.read_tsv("file"), lines)
+        self.assertEqual([line.split("\t")[1] for line in lines],
+                         ["b0001", "b0002", "b0001_CDS_1", "rna1"])
+        self.assertEqual(lines[1].split("\t")[4:7], ["500", "-", "70"])
+        self.assertEqual(lines[2].split("\t")[8:],
+                         ["thr operon leader peptide",
+                          "GO:0009088,threonine， biosynthetic process\n"])
+        self.assertEqual(sorted(os.listdir(self.test_dir)),
+                         ["dict_ftr.tsv.gz", "dict_ftr.tsv.meta", "file_ftr.tsv.gz",
+                          "file_ftr.tsv.meta", "genome.json"])
+
+    def test_unpack_fields(self):
+        self.indexer.save_feature_tsv(json.loads(json.dumps(self.genome)), "fields")
+        for line in self.read_tsv("fields"):
+            feature = self.indexer.unpack_feature(line)
+            self.assertEqual(list(feature.keys()), list(indexer_module.FEATURE_FIELDS))
+            for fields in [["feature_id", "function"], ["location"], ["global_location"],
+                           ["feature_array", "aliases", "ontology_terms"], []]:
+                self.assertEqual(self.indexer.unpack_feature(
+                    line, fields=self.indexer.check_feature_fields(fields)),
+                    {key: feature[key] for key in fields})
+        self.assertIsNone(self.indexer.check_feature_fields(None))
+        with self.assertRaisesRegex(ValueError, "Unknown feature field 'contig'"):
+            self.indexer.check_feature_fields(["feature_id", "contig"])
+        with self.assertRaisesRegex(ValueError, "should be list"):
+            self.indexer.check_feature_fields("feature_id")
+
+    def test_parallel_build(self):
+        indexer = GenomeSearchUtilIndexer({"workspace-url": "http://localhost",
+                                           "genome-index-dir": self.test_dir,
+                                           "index-build-workers": "2"})
+        genome = json.loads(json.dumps(self.genome))
+        genome["features"] *= 3
+        self.indexer.save_feature_tsv(genome, "serial")
+        json_file = os.path.join(self.test_dir, "genome2.json")
+        with open(json_file, "w") as f:
+            json.dump(genome, f)
+        with mock.patch.object(indexer_module, "PARALLEL_BUILD_MIN_FEATURES", 1), \
+                mock.patch.object(feature_tsv_module, "CHUNK_SIZE", 2):
+            indexer.save_feature_tsv(genome, "parallel")
+            indexer.save_feature_tsv_from_json_file(json_file, "parallel_file")
+        lines = self.read_tsv("serial")
+        self.assertEqual(len(lines), 8)
+        self.assertEqual(self.read_tsv("parallel"), lines)
+        self.assertEqual(self.read_tsv("parallel_file"), lines)
+        for name in ["serial", "parallel", "parallel_file"]:
+            os.remove(os.path.join(self.test_dir, name + "_ftr.tsv.gz"))
+            os.remove(os.path.join(self.test_dir, name + "_ftr.tsv.meta"))
+        os.remove(json_file)
+
+    def test_table_indexes(self):
+        # Columnar and sort indexes are built in one pass over TSV file
+        props_map = self.indexer.feature_column_props_map
+        self.indexer.save_feature_tsv(json.loads(json.dumps(self.genome)), "table")
+        lines = self.read_tsv("table")
+        expected = {}
+        for kind, build_func in [("col", build_columnar_index), ("sort", build_sort_index)]:
+            index_file = os.path.join(self.test_dir, "expected_" + kind + ".bin")
+            build_func(lines, props_map, index_file)
+            with open(index_file, "rb") as f:
+                expected[kind] = f.read()
+            os.remove(index_file)
+        for missing in [["col", "sort"], ["sort"]]:
+            for kind in missing:
+                index_file = self.indexer.get_index_file("table", "ftr_" + kind + ".bin")
+                if os.path.exists(index_file):
+                    os.remove(index_file)
+            with mock.patch.object(indexer_module, "CombinedLineIterator",
+                                   wraps=CombinedLineIterator) as line_iter:
+                self.indexer.check_table_indexes("table", "ftr", props_map)
+                self.indexer.check_table_indexes("table", "ftr", props_map)
+            self.assertEqual(line_iter.call_count, 1)
+            for kind in ["col", "sort"]:
+                with open(self.indexer.get_index_file("table", "ftr_" + kind + ".bin"),
+                          "rb") as f:
+                    self.assertEqual(f.read(), expected[kind])
+        for name in ["ftr.tsv.gz", "ftr.tsv.meta", "ftr_col.bin", "ftr_sort.bin"]:
+            os.remove(os.path.join(self.test_dir, "table_" + name))
+
+    def test_broken_pool(self):
+        # Build fails (instead of waiting forever) when worker dies
+        with feature_tsv_module.FeatureTsvPool(2, self.indexer.codec) as pool:
+            with self.assertRaises(BrokenProcessPool):
+                pool.write_features(mock.Mock(), "features", "gene",
+                                    [{"id": "f1"}, _DyingFeature()], chunk_size=1)
+
+    def test_python_executable(self):
+        with mock.patch.object(sys, "executable", "/usr/local/bin/uwsgi"):
+            executable = feature_tsv_module.get_python_executable()
+        self.assertTrue(os.path.basename(executable).startswith("python"))
+        self.assertTrue(os.path.samefile(os.path.dirname(executable),
+                                         os.path.join(sys.exec_prefix, "bin")))
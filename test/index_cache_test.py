@@ -0,0 +1,37 @@
+import unittest
+
+from GenomeSearchUtil.IndexCache import IndexCache
+
+
+class IndexCacheTest(unittest.TestCase):
+
+    def test_lru_eviction(self):
+        cache = IndexCache(100)
+        loads = []
+
+        def loader(key, size):
+            def load():
+                loads.append(key)
+                return "value_" + key, size
+            return load
+        self.assertEqual(cache.get("a", loader("a", 40)), "value_a")
+        cache.get("b", loader("b", 40))
+        cache.get("a", loader("a", 40))
+        # "b" is least recently used now
+        cache.get("c", loader("c", 40))
+        self.assertEqual(list(cache.entries.keys()), ["a", "c"])
+        cache.get("a", loader("a", 40))
+        cache.get("b", loader("b", 40))
+        self.assertEqual(loads, ["a", "b", "c", "b"])
+        stats = cache.get_stats()
+        self.assertEqual(stats["entries"], 2)
+        self.assertEqual(stats["total_bytes"], 80)
+        self.assertEqual(stats["hits"], 2)
+        self.assertEqual(stats["misses"], 4)
+        self.assertEqual(stats["evictions"], 2)
+        self.assertEqual(stats["evicted_bytes"], 80)
+
+    def test_too_large(self):
+        cache = IndexCache(100)
+        self.assertEqual(cache.get("big", lambda: ("big", 101)), "big")
+        self.assertEqual(cache.get_stats()["entries"], 0)
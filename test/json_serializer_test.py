@@ -0,0 +1,106 @@
+import json
+import time
+import unittest
+
+from GenomeSearchUtil.JsonSerializer import JsonFragment, get_serializer, orjson
+
+
+class _JSONObjectEncoder(json.JSONEncoder):
+    # The same as encoder of the server
+
+    def default(self, obj):
+        if isinstance(obj, set):
+            return list(obj)
+        if isinstance(obj, frozenset):
+            return list(obj)
+        if hasattr(obj, 'toJSONable'):
+            return obj.toJSONable()
+        return json.JSONEncoder.default(self, obj)
+
+
+class _Jsonable:
+
+    def toJSONable(self):
+        return {"custom": [1, 2]}
+
+
+def make_page(size):
+    features = []
+    for i in range(size):
+        features.append({
+            "location": [{"contig_id": "NC_000913.3", "start": i * 100, "strand": "+",
+                          "length": 300}],
+            "feature_id": "b" + str(i), "feature_type": "CDS",
+            "global_location": {"contig_id": "NC_000913.3", "start": i * 100,
+                                "strand": "+", "length": 300},
+            "aliases": {"thr" + str(i): [], "ECK" + str(i): []},
+            "function": "Äpfel-protein, β-lactamase " + str(i),
+            "feature_idx": i, "feature_array": "cdss",
+            "ontology_terms": {"GO:" + str(j).zfill(7): "term ✓ name " + str(j)
+                               for j in range(10)}})
+    return {"query": "", "start": 0, "features": features, "num_found": 5000,
+            "cursor": None}
+
+
+class JsonSerializerTest(unittest.TestCase):
+
+    def check_serializer(self, name):
+        serializer = get_serializer(name)
+        self.assertEqual(serializer.name, name)
+        obj = [make_page(3), {"set": {1}, "frozenset": frozenset(["a"]),
+                              "obj": _Jsonable(), 5: "int key", "big": 1 << 70}]
+        data = serializer.dumps(obj)
+        self.assertIsInstance(data, bytes)
+        self.assertEqual(json.loads(data.decode("utf-8")),
+                         json.loads(json.dumps(obj, cls=_JSONObjectEncoder)))
+        with self.assertRaises(TypeError):
+            serializer.dumps({"x": object()})
+        # Fragments are spliced as is (and parsed back by encoder of server)
+        page = make_page(3)
+        page["features"] = [JsonFragment(json.dumps(feature, ensure_ascii=False).encode(
+            "utf-8")) for feature in page["features"]]
+        obj = [page, {"refs": [JsonFragment(b'"__json_fragment_"'), "__json_fragment_0"],
+                      "big": 1 << 70}]
+        data = serializer.dumps(obj)
+        self.assertEqual(json.loads(data.decode("utf-8")),
+                         json.loads(json.dumps(obj, cls=_JSONObjectEncoder)))
+        self.assertEqual(json.loads(data.decode("utf-8"))[0], make_page(3))
+
+    def test_json(self):
+        self.check_serializer("json")
+
+    @unittest.skipIf(orjson is None, "orjson package is not installed")
+    def test_orjson(self):
+        self.check_serializer("orjson")
+
+    def test_unknown(self):
+        with self.assertRaisesRegex(ValueError, "Unknown serializer"):
+            get_serializer("pickle")
+
+    def test_benchmark(self):
+        # Fast serializer (when available) against encoder of the server,
+        # times are only reported (they depend on load of the machine)
+        page = [make_page(1000)]
+        expected = json.loads(json.dumps(page, cls=_JSONObjectEncoder))
+
+        def best_time(func):
+            times = []
+            for _ in range(3):
+                t1 = time.perf_counter()
+                data = func(page)
+                times.append(time.perf_counter() - t1)
+            if isinstance(data, bytes):
+                data = data.decode("utf-8")
+            self.assertEqual(json.loads(data), expected)
+            return min(times)
+        serializer = get_serializer()
+        current_time = best_time(lambda obj: json.dumps(obj, cls=_JSONObjectEncoder))
+        new_time = best_time(serializer.dumps)
+        print("\n    Page of 1000 features: current encoder " + str(current_time) +
+              " s, " + serializer.name + " serializer " + str(new_time) + " s")
+        # Page of features serialized at index build time
+        page[0]["features"] = [JsonFragment(json.dumps(feature).encode("utf-8"))
+                               for feature in page[0]["features"]]
+        fragment_time = best_time(serializer.dumps)
+        print("    Page of 1000 feature fragments: " + serializer.name + " serializer " +
+              str(fragment_time) + " s")
@@ -0,0 +1,55 @@
+import io
+import json
+import unittest
+
+from GenomeSearchUtil.JsonStreamReader import JsonStreamReader
+
+
+class JsonStreamReaderTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.doc = {"id": "genome", "num": 12345, "neg": -1.5e10, "flags": [True, False, None],
+                   "features": [{"id": "b0001", "location": [["NC_1", 190, "+", 66]],
+                                 "function": "leader \"peptide\"\tÄÖ"},
+                                {"id": "b0002", "aliases": ["thrA", ["x", "y"]]}, 7, "str", []],
+                   "empty": {}, "ontologies_present": {"GO": {"GO:1": "name, with comma"}},
+                   "cdss": []}
+
+    def readers(self, text):
+        for chunk_size in [1, 2, 3, 7, 64, 1 << 16]:
+            yield JsonStreamReader(io.StringIO(text), chunk_size)
+
+    def test_read_value(self):
+        for text in [json.dumps(self.doc), json.dumps(self.doc, indent=2), "  12345  ", "0"]:
+            for reader in self.readers(text):
+                self.assertEqual(reader.read_value(), json.loads(text))
+
+    def test_streaming(self):
+        text = json.dumps(self.doc, indent=1)
+        for reader in self.readers(text):
+            ret = {}
+            for key in reader.iter_object():
+                if reader.peek() == "[":
+                    ret[key] = list(reader.iter_array())
+                else:
+                    ret[key] = reader.read_value()
+            self.assertEqual(ret, self.doc)
+            self.assertEqual(reader.peek(), "")
+
+    def test_skip_value(self):
+        text = json.dumps(self.doc)
+        for reader in self.readers(text):
+            keys = []
+            for key in reader.iter_object():
+                keys.append(key)
+                if key == "ontologies_present":
+                    self.assertEqual(reader.read_value(), self.doc[key])
+                else:
+                    reader.skip_value()
+            self.assertEqual(keys, list(self.doc.keys()))
+
+    def test_errors(self):
+        for text in ['{"a": [1, 2}', '{"a" 1}', '[1, 2', '{1: 2}']:
+            reader = JsonStreamReader(io.StringIO(text), 2)
+            with self.assertRaises(ValueError):
+                reader.skip_value()
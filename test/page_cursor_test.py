@@ -0,0 +1,29 @@
+import unittest
+
+from GenomeSearchUtil.PageCursor import decode_cursor, encode_cursor, get_query_hash
+
+
+class PageCursorTest(unittest.TestCase):
+
+    def test_round_trip(self):
+        query_hash = get_query_hash("kinase", {"feature_type": "CDS"})
+        cursor = encode_cursor("chsum1", "5a2d", query_hash, (10, 3), 50, 1234)
+        self.assertNotIn("=", cursor)
+        self.assertEqual(decode_cursor(cursor, "chsum1", "5a2d", query_hash),
+                         ((10, 3), 50, 1234))
+
+    def test_mismatch(self):
+        query_hash = get_query_hash("kinase")
+        cursor = encode_cursor("chsum1", "5a", query_hash, [7], 20, 100)
+        with self.assertRaisesRegex(ValueError, "other version of genome"):
+            decode_cursor(cursor, "chsum2", "5a", query_hash)
+        with self.assertRaisesRegex(ValueError, "other query or sorting"):
+            decode_cursor(cursor, "chsum1", "5d", query_hash)
+        with self.assertRaisesRegex(ValueError, "other query or sorting"):
+            decode_cursor(cursor, "chsum1", "5a", get_query_hash("kinases"))
+
+    def test_invalid(self):
+        for cursor in ["", "abc", "!!!", encode_cursor("c", "", "q", [-1], 0, 5)[:-3],
+                       encode_cursor("c", "", "q", [-1], 0, 5)]:
+            with self.assertRaisesRegex(ValueError, "Invalid cursor"):
+                decode_cursor(cursor, "c", "", "q")
@@ -0,0 +1,63 @@
+import os
+import random
+import shutil
+import tempfile
+import unittest
+
+from GenomeSearchUtil.RegionIndex import RegionIndex, build_region_index
+
+
+class RegionIndexTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.test_dir = tempfile.mkdtemp()
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.test_dir)
+
+    def build_index(self, intervals, contig_count):
+        index_file = os.path.join(self.test_dir, "test_ftr_reg.bin")
+        build_region_index(intervals, contig_count, index_file)
+        return RegionIndex(index_file)
+
+    def brute_force(self, intervals, contig_code, region_min, region_max):
+        return [row_id for code, fmin, fmax, row_id in intervals
+                if code == contig_code and max(fmin, region_min) <= min(fmax, region_max)]
+
+    def test_random(self):
+        rnd = random.Random(1)
+        for count in [0, 1, 2, 7, 8, 9, 100, 1000]:
+            contig_count = 3
+            intervals = []
+            for row_id in range(count):
+                fmin = rnd.randint(1, 10000)
+                fmax = fmin + rnd.choice([0, 10, 100, 3000])
+                intervals.append((rnd.randrange(contig_count), fmin, fmax, row_id))
+            rnd.shuffle(intervals)
+            index = self.build_index(intervals, contig_count)
+            for _ in range(100):
+                contig_code = rnd.randrange(contig_count)
+                region_min = rnd.randint(-100, 10100)
+                region_max = region_min + rnd.choice([0, 1, 50, 5000])
+                self.assertEqual(index.find_rows(contig_code, region_min, region_max),
+                                 self.brute_force(intervals, contig_code,
+                                                  region_min, region_max))
+
+    def test_edge_cases(self):
+        intervals = [(0, 10, 20, 5), (0, 15, 15, 3), (1, 1, 100, 4)]
+        index = self.build_index(intervals, 3)
+        self.assertEqual(index.find_rows(0, 20, 20), [5])
+        self.assertEqual(index.find_rows(0, 1, 15), [5, 3])
+        self.assertEqual(index.find_rows(0, 21, 30), [])
+        self.assertEqual(index.find_rows(2, 1, 100), [])
+        self.assertEqual(index.find_rows(None, 1, 100), [])
+        self.assertEqual(index.find_rows(1, 50, 40), [])
+
+    def test_positioned_rows(self):
+        intervals = [(0, 10, 20, 5), (0, 15, 15, 3), (0, 30, 40, 1)]
+        index = self.build_index(intervals, 1)
+        hits = index.find_positioned_rows(0, 1, 100)
+        self.assertEqual([row_id for _, row_id in hits], index.find_rows(0, 1, 100))
+        self.assertEqual(index.find_positioned_rows(0, 1, 100, hits[0][0]), hits[1:])
+        self.assertEqual(index.find_positioned_rows(0, 1, 100, hits[-1][0]), [])
@@ -0,0 +1,61 @@
+import gzip
+import json
+import time
+import unittest
+import zlib
+
+from GenomeSearchUtil.ResponseCompressor import ResponseCompressor, parse_accept_encoding
+
+
+def make_body(size):
+    features = [{"feature_id": "b" + str(i), "feature_type": "CDS",
+                 "aliases": {"thr" + str(i): [], "ECK" + str(i): []},
+                 "function": "β-lactamase " + str(i),
+                 "ontology_terms": {"GO:" + str(j).zfill(7): "term name " + str(j)
+                                    for j in range(10)}} for i in range(size)]
+    return json.dumps({"version": "1.1", "result": [{"features": features}]}).encode("utf-8")
+
+
+class ResponseCompressorTest(unittest.TestCase):
+
+    def test_parse_accept_encoding(self):
+        self.assertEqual(parse_accept_encoding(None), {})
+        self.assertEqual(parse_accept_encoding("gzip, Deflate;q=0.5, br;q=x, ;"),
+                         {"gzip": 1.0, "deflate": 0.5, "br": 0.0})
+
+    def test_negotiation(self):
+        compressor = ResponseCompressor()
+        self.assertEqual(compressor.get_encoding("gzip, deflate"), "gzip")
+        self.assertEqual(compressor.get_encoding("deflate, gzip;q=0.8"), "deflate")
+        self.assertEqual(compressor.get_encoding("deflate"), "deflate")
+        self.assertEqual(compressor.get_encoding("*"), "gzip")
+        self.assertEqual(compressor.get_encoding("*, gzip;q=0"), "deflate")
+        self.assertIsNone(compressor.get_encoding("gzip;q=0, identity"))
+        self.assertIsNone(compressor.get_encoding("br"))
+        self.assertIsNone(compressor.get_encoding(None))
+
+    def test_compress(self):
+        compressor = ResponseCompressor(min_size=1024, level=6)
+        body = make_body(100)
+        data, encoding = compressor.compress(body, "gzip, deflate")
+        self.assertEqual(encoding, "gzip")
+        self.assertEqual(gzip.decompress(data), body)
+        data, encoding = compressor.compress(body, "deflate")
+        self.assertEqual(encoding, "deflate")
+        self.assertEqual(zlib.decompress(data), body)
+        self.assertEqual(compressor.compress(body, None), (body, None))
+        # Small responses and disabled compression
+        small = b'{"version": "1.1", "result": [{}]}'
+        self.assertEqual(compressor.compress(small, "gzip"), (small, None))
+        self.assertEqual(ResponseCompressor(level=0).compress(body, "gzip"), (body, None))
+        with self.assertRaisesRegex(ValueError, "Compression level"):
+            ResponseCompressor(level=10)
+
+    def test_benchmark(self):
+        body = make_body(1000)
+        compressor = ResponseCompressor()
+        t1 = time.perf_counter()
+        data, _ = compressor.compress(body, "gzip")
+        print("\n    Response of " + str(len(body)) + " bytes compressed to " +
+              str(len(data)) + " bytes in " + str(time.perf_counter() - t1) + " s")
+        self.assertLess(len(data) * 5, len(body))
@@ -0,0 +1,90 @@
+import os
+import shutil
+import subprocess
+import tempfile
+import unittest
+
+from GenomeSearchUtil.SortIndex import SortIndex, build_sort_index
+
+
+class SortIndexTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.lines = [
+            'ctg_b\t300\t4\n',
+            'Ctg_a\t1000\t0\n',
+            'ctg_A\t1000\t2\n',
+            'CTG_C\t20\t4\n',
+            'ctg_c\t\t4\n',
+            'ctg_10\t5\t1\n',
+        ]
+        cls.props_map = {
+            "contig_id": {"col": 1, "type": ""},
+            "length": {"col": 2, "type": "n"},
+            "feature_count": {"col": 3, "type": "n"}
+        }
+        cls.test_dir = tempfile.mkdtemp()
+        cls.index_file = os.path.join(cls.test_dir, "test_ctg_sort.bin")
+        build_sort_index(cls.lines, cls.props_map, cls.index_file)
+        cls.index = SortIndex(cls.index_file)
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.test_dir)
+
+    def unix_sort(self, sort_by):
+        cmd = ["sort", "-f", "-t\t"]
+        for col_name, ascending in sort_by:
+            col_props = self.props_map[col_name]
+            col_pos = str(col_props["col"])
+            cmd.append("-k" + col_pos + "," + col_pos + col_props["type"] +
+                       ("" if ascending else "r"))
+        env = dict(os.environ, LC_ALL="C")
+        return subprocess.run(cmd, input="".join(self.lines), env=env,
+                              stdout=subprocess.PIPE, universal_newlines=True,
+                              check=True).stdout.splitlines(True)
+
+    def test_same_order_as_unix_sort(self):
+        for sort_by in [[["contig_id", True]], [["contig_id", False]],
+                        [["length", True]], [["length", False]],
+                        [["feature_count", False], ["contig_id", True]],
+                        [["feature_count", True], ["length", False]],
+                        [["length", True], ["contig_id", False]]]:
+            order = self.index.get_order(sort_by)
+            self.assertEqual([self.lines[row_id] for row_id in order],
+                             self.unix_sort(sort_by), sort_by)
+
+    def test_ties_and_case_folding(self):
+        order = self.index.get_order([["contig_id", True]])
+        # case is folded for ascending keys, ties are resolved by whole line
+        self.assertEqual(order, [5, 1, 2, 0, 3, 4])
+
+    def test_order_of_subset(self):
+        for sort_by in [[["contig_id", True]], [["length", False], ["contig_id", False]]]:
+            order = self.index.get_order(sort_by)
+            rows = {0, 2, 5}
+            self.assertEqual(self.index.get_order(sort_by, rows),
+                             [row_id for row_id in order if row_id in rows])
+
+    def test_top_rows(self):
+        rows = [0, 1, 2, 3, 4, 5]
+        for sort_by in [[["contig_id", True]], [["contig_id", False]], [["length", False]],
+                        [["length", True], ["contig_id", False]]]:
+            order = self.index.get_order(sort_by)
+            for count in [0, 1, 2, 6, 10]:
+                self.assertEqual(self.index.get_top_rows(sort_by, rows, count),
+                                 order[:count], sort_by)
+
+    def test_rows_after(self):
+        for sort_by in [None, [["contig_id", True]], [["contig_id", False]],
+                        [["length", False], ["contig_id", False]]]:
+            order = self.index.get_order(sort_by) if sort_by else list(range(6))
+            for rows in [None, {0, 2, 5}]:
+                expected = [row_id for row_id in order if rows is None or row_id in rows]
+                for pos, row_id in enumerate(expected):
+                    sort_key = self.index.get_sort_key(sort_by, row_id)
+                    self.assertEqual(list(self.index.get_rows_after(sort_by, sort_key, rows)),
+                                     expected[pos + 1:], sort_by)
+            # key of row which is not in the subset still points to its position
+            sort_key = self.index.get_sort_key(sort_by, order[0])
+            self.assertEqual(list(self.index.get_rows_after(sort_by, sort_key, {order[0]})), [])
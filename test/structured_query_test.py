@@ -1,6 +1,7 @@
 import unittest
 
 from GenomeSearchUtil.GenomeSearchUtilIndexer import _eval_structured_query
+from GenomeSearchUtil.StructuredQuery import compile_structured_query
 
 
 class StructuredQueryTest(unittest.TestCase):
@@ -93,3 +94,62 @@ class StructuredQueryTest(unittest.TestCase):
                                                {"$and": [{"$not": {"feature_id": "meh"}},
                                                          {"feature_type": "CDS"}]},
                                                self.props_map))
+
+    def test_compiled_query(self):
+        # Errors are raised before any line is checked, even in branches
+        # which would be short-circuited
+        with self.assertRaisesRegex(ValueError, "Unrecognised field"):
+            compile_structured_query({"$or": [{"feature_type": "CDS"}, {"foo": "bar"}]},
+                                     self.props_map)
+        with self.assertRaisesRegex(ValueError, "should be a dictionary"):
+            compile_structured_query({"$not": "meh"}, self.props_map)
+        predicate = compile_structured_query({"feature_type": ["gene", "CDS"],
+                                              "$not": {"strand": "-"}}, self.props_map)
+        self.assertTrue(predicate(self.sline1))
+        self.assertTrue(predicate(self.sline2))
+        predicate = compile_structured_query({"$or": []}, self.props_map)
+        self.assertFalse(predicate(self.sline1))
+        self.assertTrue(compile_structured_query({}, self.props_map)(self.sline1))
+
+    def test_operators(self):
+        self.assertTrue(_eval_structured_query(self.sline1, {"length": {"$gt": 65, "$lte": 66}},
+                                               self.props_map))
+        self.assertFalse(_eval_structured_query(self.sline1, {"length": {"$gte": 67}},
+                                                self.props_map))
+        # numeric fields are compared as numbers, not as strings
+        self.assertTrue(_eval_structured_query(self.sline2, {"start": {"$gt": 40}},
+                                               self.props_map))
+        self.assertTrue(_eval_structured_query(self.sline1, {"start": {"$in": [1, 190]}},
+                                               self.props_map))
+        self.assertTrue(_eval_structured_query(self.sline1, {"start": {"$nin": [1, 2]},
+                                                             "length": {"$ne": 1}},
+                                               self.props_map))
+        self.assertTrue(_eval_structured_query(self.sline1, {"feature_id": {"$prefix": "b0001_"}},
+                                               self.props_map))
+        self.assertTrue(_eval_structured_query(self.sline2, {"feature_id": {"$gte": "b0002",
+                                                                            "$lt": "b0003"}},
+                                               self.props_map))
+        self.assertFalse(_eval_structured_query(self.sline2, {"feature_type": {"$nin": ["gene"]}},
+                                                self.props_map))
+        self.assertTrue(_eval_structured_query(self.sline2, {"start": {"$ne": 190}},
+                                               self.props_map))
+        empty_start = list(self.sline1)
+        empty_start[3] = ""
+        self.assertFalse(_eval_structured_query(empty_start, {"start": {"$lt": 1000}},
+                                                self.props_map))
+        self.assertTrue(_eval_structured_query(empty_start, {"start": {"$ne": 1000}},
+                                               self.props_map))
+
+    def test_invalid_operators(self):
+        with self.assertRaisesRegex(ValueError, "Unrecognised operator"):
+            compile_structured_query({"length": {"$regex": "1"}}, self.props_map)
+        with self.assertRaisesRegex(ValueError, "should be a number"):
+            compile_structured_query({"length": {"$gt": "100"}}, self.props_map)
+        with self.assertRaisesRegex(ValueError, "should be a string"):
+            compile_structured_query({"feature_id": {"$gt": 1}}, self.props_map)
+        with self.assertRaisesRegex(ValueError, "should be a list"):
+            compile_structured_query({"feature_id": {"$in": "b0001"}}, self.props_map)
+        with self.assertRaisesRegex(ValueError, "not supported for numeric"):
+            compile_structured_query({"start": {"$prefix": "1"}}, self.props_map)
+        with self.assertRaisesRegex(ValueError, "should not be empty"):
+            compile_structured_query({"start": {}}, self.props_map)
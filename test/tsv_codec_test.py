@@ -0,0 +1,122 @@
+import gzip
+import os
+import shutil
+import tempfile
+import unittest
+
+from GenomeSearchUtil.CombinedLineIterator import CombinedLineIterator
+from GenomeSearchUtil.TsvCodec import (TsvBlockReader, TsvBlockWriter, get_codec,
+                                       get_data_file, open_tsv, read_codec, write_codec,
+                                       zstandard)
+
+
+class TsvCodecTest(unittest.TestCase):
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.lines = ["a\t1\n", "b\tÄ\n", "c\t3\n"]
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def check_codec(self, name):
+        codec = get_codec(name)
+        tsv_file = os.path.join(self.test_dir, name + "_ftr.tsv")
+        # separately compressed chunks are read as one stream
+        with open(get_data_file(tsv_file, codec), "wb") as f:
+            f.write(codec.compress("".join(self.lines[:2]).encode("utf-8")))
+            f.write(codec.compress(self.lines[2].encode("utf-8")))
+        write_codec(tsv_file, codec)
+        self.assertEqual(read_codec(tsv_file).name, name)
+        with CombinedLineIterator(tsv_file) as lines:
+            self.assertEqual(list(lines), self.lines)
+
+    def test_gzip(self):
+        self.check_codec("gzip")
+
+    def test_none(self):
+        self.check_codec("none")
+
+    @unittest.skipIf(zstandard is None, "zstandard package is not installed")
+    def test_zstd(self):
+        self.check_codec("zstd")
+
+    def test_legacy_gzip_file(self):
+        tsv_file = os.path.join(self.test_dir, "old_ctg.tsv")
+        with gzip.open(tsv_file + ".gz", "wt") as f:
+            f.writelines(self.lines)
+        self.assertEqual(read_codec(tsv_file).name, "gzip")
+        for source in [tsv_file, tsv_file + ".gz"]:
+            with CombinedLineIterator(source) as lines:
+                self.assertEqual(list(lines), self.lines)
+
+    def test_missing_file(self):
+        self.assertIsNone(read_codec(os.path.join(self.test_dir, "missing_ftr.tsv")))
+        with self.assertRaisesRegex(ValueError, "File not found"):
+            CombinedLineIterator(os.path.join(self.test_dir, "missing_ftr.tsv"))
+
+    def test_unknown_codec(self):
+        with self.assertRaisesRegex(ValueError, "Unknown codec"):
+            get_codec("lzma")
+
+    def write_block_file(self, codec, name, lines, block_size):
+        tsv_file = os.path.join(self.test_dir, name)
+        with open(get_data_file(tsv_file, codec), "wb") as f, \
+                TsvBlockWriter(f, codec, block_size) as writer:
+            for line in lines:
+                writer.write(line)
+        write_codec(tsv_file, codec, writer.get_block_table())
+        return tsv_file, writer.get_block_table()
+
+    def check_block_format(self, name):
+        codec = get_codec(name)
+        lines = ["row" + str(i) + "\t" + "x" * (i % 7) + "\n" for i in range(100)]
+        tsv_file, block_table = self.write_block_file(codec, name + "_ftr.tsv", lines, 50)
+        self.assertEqual(block_table["row_count"], 100)
+        self.assertGreater(len(block_table["block_rows"]), 10)
+        with TsvBlockReader(tsv_file) as reader:
+            blocks = list(reader.iter_blocks())
+            self.assertEqual([len(block) for block in blocks],
+                             [b - a for a, b in zip(block_table["block_rows"],
+                                                    block_table["block_rows"][1:] + [100])])
+            self.assertEqual(sum(blocks, []), lines)
+        for workers in [1, 3]:
+            with CombinedLineIterator(tsv_file, workers) as rows:
+                self.assertEqual(list(rows), lines)
+        # block file is valid stream for readers without block support
+        stream = open_tsv(tsv_file)
+        try:
+            self.assertEqual(list(stream), lines)
+        finally:
+            stream.close()
+        # blocks are copied without recompression, mixed with text lines
+        copy_file = os.path.join(self.test_dir, name + "_copy.tsv")
+        with open(get_data_file(copy_file, codec), "wb") as f, \
+                TsvBlockWriter(f, codec, 50) as writer:
+            writer.write("first\t")
+            writer.write("row\n")
+            with open(get_data_file(tsv_file, codec), "rb") as infile:
+                writer.copy_blocks(infile, block_table)
+            writer.write("last\trow\n")
+        write_codec(copy_file, codec, writer.get_block_table())
+        with TsvBlockReader(copy_file) as reader:
+            self.assertEqual(list(reader), ["first\trow\n"] + lines + ["last\trow\n"])
+
+    def test_block_format_gzip(self):
+        self.check_block_format("gzip")
+
+    def test_block_format_none(self):
+        self.check_block_format("none")
+
+    @unittest.skipIf(zstandard is None, "zstandard package is not installed")
+    def test_block_format_zstd(self):
+        self.check_block_format("zstd")
+
+    def test_not_block_format(self):
+        codec = get_codec("gzip")
+        tsv_file = os.path.join(self.test_dir, "stream_ftr.tsv")
+        with open(get_data_file(tsv_file, codec), "wb") as f:
+            f.write(codec.compress("".join(self.lines).encode("utf-8")))
+        write_codec(tsv_file, codec)
+        with self.assertRaisesRegex(ValueError, "not in block format"):
+            TsvBlockReader(tsv_file)
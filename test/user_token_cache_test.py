@@ -0,0 +1,112 @@
+import threading
+import time
+import unittest
+from unittest import mock
+
+from GenomeSearchUtil.UserTokenCache import UserTokenCache
+import GenomeSearchUtil.authclient as authclient
+from GenomeSearchUtil.authclient import InvalidTokenError, KBaseAuth
+
+
+class UserTokenCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.now = 1000.0
+        self.calls = []
+        self.cache = UserTokenCache(self.validate, ttl=300, negative_ttl=10, max_size=3,
+                                    clock=lambda: self.now)
+
+    def validate(self, token):
+        self.calls.append(token)
+        if token.startswith("bad"):
+            raise InvalidTokenError("Error connecting to auth service: 401 Unauthorized")
+        if token.startswith("outage"):
+            raise ValueError("Error connecting to auth service: 503 Service Unavailable")
+        if token.startswith("down"):
+            raise IOError("Connection refused")
+        return "user_" + token
+
+    def test_ttl(self):
+        self.assertEqual(self.cache.get_user("tok1"), "user_tok1")
+        self.now += 299
+        self.assertEqual(self.cache.get_user("tok1"), "user_tok1")
+        self.now += 2
+        self.assertEqual(self.cache.get_user("tok1"), "user_tok1")
+        self.assertEqual(self.calls, ["tok1", "tok1"])
+        self.assertEqual(self.cache.get_stats(),
+                         {"entries": 1, "max_size": 3, "hits": 1, "negative_hits": 0,
+                          "misses": 2, "coalesced": 0})
+
+    def test_tokens_are_hashed(self):
+        self.cache.get_user("secret_token")
+        for key, entry in self.cache.entries.items():
+            self.assertNotIn("secret_token", key)
+            self.assertEqual(len(key), 64)
+            self.assertEqual(entry[0], "user_secret_token")
+
+    def test_negative_cache(self):
+        for _ in range(3):
+            with self.assertRaisesRegex(ValueError, "401 Unauthorized"):
+                self.cache.get_user("bad1")
+        self.assertEqual(self.calls, ["bad1"])
+        self.assertEqual(self.cache.negative_hits, 2)
+        self.now += 11
+        with self.assertRaises(ValueError):
+            self.cache.get_user("bad1")
+        self.assertEqual(self.calls, ["bad1", "bad1"])
+
+    def test_connection_errors_not_cached(self):
+        for _ in range(2):
+            with self.assertRaises(IOError):
+                self.cache.get_user("down1")
+            with self.assertRaisesRegex(ValueError, "503"):
+                self.cache.get_user("outage1")
+        self.assertEqual(self.calls, ["down1", "outage1", "down1", "outage1"])
+        self.assertEqual(len(self.cache.entries), 0)
+
+    def test_max_size(self):
+        for token in ["tok1", "tok2", "tok3", "tok4"]:
+            self.cache.get_user(token)
+        self.assertEqual(len(self.cache.entries), 3)
+        self.cache.get_user("tok1")
+        self.assertEqual(len(self.calls), 5)
+
+    def test_coalescing(self):
+        started = threading.Event()
+
+        def slow_validate(token):
+            started.set()
+            time.sleep(0.2)
+            return self.validate(token)
+        self.cache.validate_func = slow_validate
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(
+            self.cache.get_user("tok"))) for _ in range(5)]
+        threads[0].start()
+        started.wait()
+        for t in threads[1:]:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(results, ["user_tok"] * 5)
+        self.assertEqual(self.calls, ["tok"])
+        self.assertEqual(self.cache.coalesced, 4)
+
+    def test_auth_client_errors(self):
+        def post(url, data):
+            status = int(data["token"])
+            response = mock.Mock(ok=status == 200, status_code=status, reason="Reason")
+            response.json.return_value = ({"user_id": "user1"} if status == 200
+                                          else {"error_msg": "Error"})
+            return response
+        auth = KBaseAuth("http://localhost/auth", cache_tokens=False)
+        with mock.patch.object(authclient._requests, "post", side_effect=post) as post_mock:
+            self.assertEqual(auth.get_user("200"), "user1")
+            self.assertEqual(auth.get_user("200"), "user1")
+            self.assertEqual(post_mock.call_count, 2)
+            with self.assertRaises(InvalidTokenError):
+                auth.get_user("401")
+            for status in ["500", "503"]:
+                with self.assertRaisesRegex(ValueError, status) as error:
+                    auth.get_user(status)
+                self.assertNotIsInstance(error.exception, InvalidTokenError)